@@ -0,0 +1,181 @@
+import threading
+import time
+import zlib
+import numpy as np
+from config import Config
+
+
+class RingCounter:
+    """Bucketed sliding-window counters for many rows at once
+
+    Counts live in a (rows x slots) ring indexed by absolute time bucket.
+    Running totals for the short and the baseline window are kept per row,
+    so recording and reading a row are O(1); the only vectorized work is
+    retiring one column per elapsed bucket.
+    """
+
+    def __init__(self, rows, slots, short_slots, bucket_seconds):
+        self.slots = slots
+        self.short_slots = short_slots
+        self.bucket_seconds = bucket_seconds
+        self.counts = np.zeros((rows, slots), dtype=np.int32)
+        self.short_totals = np.zeros(rows, dtype=np.int64)
+        self.long_totals = np.zeros(rows, dtype=np.int64)
+        self.head = None
+
+    def grow(self, rows):
+        """Add rows (new exact keys) without disturbing existing counts"""
+        extra = rows - len(self.counts)
+        if extra <= 0:
+            return
+        self.counts = np.vstack([self.counts, np.zeros((extra, self.slots), dtype=np.int32)])
+        self.short_totals = np.concatenate([self.short_totals, np.zeros(extra, dtype=np.int64)])
+        self.long_totals = np.concatenate([self.long_totals, np.zeros(extra, dtype=np.int64)])
+
+    def add(self, rows, timestamp, amount=1):
+        bucket = int(timestamp // self.bucket_seconds)
+        self.advance(bucket)
+
+        age = self.head - bucket
+        if age >= self.slots:
+            return  # Older than the baseline window
+        self.counts[rows, bucket % self.slots] += amount
+        self.long_totals[rows] += amount
+        if age < self.short_slots:
+            self.short_totals[rows] += amount
+
+    def advance(self, bucket):
+        """Move the window forward to the given absolute bucket"""
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+
+        if bucket - self.head >= self.slots:
+            self.counts[:] = 0
+            self.short_totals[:] = 0
+            self.long_totals[:] = 0
+            self.head = bucket
+            return
+
+        for current in range(self.head + 1, bucket + 1):
+            # The bucket leaving the short window is still inside the baseline
+            self.short_totals -= self.counts[:, (current - self.short_slots) % self.slots]
+            expired = current % self.slots
+            self.long_totals -= self.counts[:, expired]
+            self.counts[:, expired] = 0
+        self.head = bucket
+
+
+class StreamingAlertEngine:
+    """Threshold and spike alerts over per-district x category request streams
+
+    Known keys get exact ring counters up to ``max_exact_keys``; beyond that,
+    keys share a windowed count-min sketch so memory stays fixed no matter
+    how many distinct keys arrive.
+    """
+
+    SKETCH_DEPTH = 4
+    SKETCH_WIDTH = 1024
+
+    def __init__(self, window_minutes=None, baseline_hours=None, bucket_seconds=None,
+                 threshold=None, spike_ratio=None, min_spike_count=None, max_exact_keys=None):
+        self.bucket_seconds = bucket_seconds or Config.ALERT_BUCKET_SECONDS
+        self.window_seconds = (window_minutes or Config.ALERT_WINDOW_MINUTES) * 60
+        self.baseline_seconds = (baseline_hours or Config.ALERT_BASELINE_HOURS) * 3600
+        self.threshold = threshold or Config.ALERT_THRESHOLD
+        self.spike_ratio = spike_ratio or Config.ALERT_SPIKE_RATIO
+        self.min_spike_count = min_spike_count or Config.ALERT_MIN_SPIKE_COUNT
+        self.max_exact_keys = max_exact_keys or Config.ALERT_MAX_EXACT_KEYS
+
+        slots = self.baseline_seconds // self.bucket_seconds
+        short_slots = max(1, self.window_seconds // self.bucket_seconds)
+        self.exact = RingCounter(64, slots, short_slots, self.bucket_seconds)
+        self.sketch = RingCounter(self.SKETCH_DEPTH * self.SKETCH_WIDTH, slots, short_slots, self.bucket_seconds)
+
+        self._keys = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def record(self, district, category, timestamp=None):
+        """Count one incoming request and update alerts for its key"""
+        now = time.time() if timestamp is None else timestamp
+        key = (district, category)
+
+        with self._lock:
+            short_count, long_count = self._count(key, now)
+            self._evaluate(key, short_count, long_count, now)
+
+    def current_alerts(self, now=None):
+        """Active alerts, most severe first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            bucket = int(now // self.bucket_seconds)
+            self.exact.advance(bucket)
+            self.sketch.advance(bucket)
+            for key in list(self._active):
+                self._evaluate(key, *self._totals(key), self._active[key]['fired_at'])
+            alerts = list(self._active.values())
+
+        return sorted(alerts, key=lambda alert: (alert['type'] != 'High Priority', -alert['count']))
+
+    def _count(self, key, now):
+        row = self._keys.get(key)
+        if row is None and len(self._keys) < self.max_exact_keys:
+            row = self._keys[key] = len(self._keys)
+            if row >= len(self.exact.counts):
+                self.exact.grow(min(self.max_exact_keys, 2 * len(self.exact.counts)))
+
+        if row is not None:
+            self.exact.add(row, now)
+        else:
+            self.sketch.add(self._sketch_rows(key), now)
+        return self._totals(key)
+
+    def _totals(self, key):
+        row = self._keys.get(key)
+        if row is not None:
+            return int(self.exact.short_totals[row]), int(self.exact.long_totals[row])
+        rows = self._sketch_rows(key)
+        return int(self.sketch.short_totals[rows].min()), int(self.sketch.long_totals[rows].min())
+
+    def _sketch_rows(self, key):
+        encoded = f"{key[0]}|{key[1]}".encode()
+        return [
+            depth * self.SKETCH_WIDTH + zlib.crc32(encoded, depth) % self.SKETCH_WIDTH
+            for depth in range(self.SKETCH_DEPTH)
+        ]
+
+    def _evaluate(self, key, short_count, long_count, now):
+        district, category = key
+        window_minutes = self.window_seconds // 60
+
+        # Rate in the short window versus the rest of the baseline window
+        baseline_seconds = self.baseline_seconds - self.window_seconds
+        baseline_rate = (long_count - short_count) / baseline_seconds
+        expected = baseline_rate * self.window_seconds
+
+        if short_count >= self.threshold:
+            alert = {
+                'type': 'High Priority',
+                'message': f"{short_count} {category} requests in {district} in the last {window_minutes} min",
+            }
+        elif short_count >= self.min_spike_count and short_count > self.spike_ratio * max(expected, 1.0):
+            alert = {
+                'type': 'Spike',
+                'message': f"{category.title()} requests in {district} at {short_count / max(expected, 1.0):.1f}x "
+                           f"the usual rate ({short_count} in {window_minutes} min)",
+            }
+        else:
+            self._active.pop(key, None)
+            return
+
+        previous = self._active.get(key)
+        alert.update({
+            'district': district,
+            'category': category,
+            'count': short_count,
+            'fired_at': previous['fired_at'] if previous and previous['type'] == alert['type'] else now
+        })
+        self._active[key] = alert
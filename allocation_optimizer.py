@@ -0,0 +1,112 @@
+import numpy as np
+from config import Config
+
+# Bisection steps on the budget multiplier; 60 halvings of a log range is exact to float precision
+ITERATIONS = 60
+
+
+def allocate_budget(demand, budget, cost_per_request=None, weights=None, min_level=0.0, service_caps=None):
+    """Split a budget over a (districts x services) demand forecast
+
+    Each cell's value is ``weight * demand * (1 - exp(-x / need))``, where
+    ``need = demand * cost`` is the spend that fully funds the forecast:
+    early rupees serve the most requests, later ones less. The optimum gives
+    every funded cell the same marginal value (the multiplier), which has a
+    closed form per cell, so the whole grid is solved by bisecting on one
+    multiplier (plus one per capped service) with vectorized updates.
+
+    ``min_level`` is the minimum share of each cell's need that must be
+    funded; ``service_caps`` optionally limits total spend per service.
+    When the minimums exceed the budget or a service's cap, ``feasible`` is
+    False, ``over_cap`` lists the services whose minimums exceed their cap,
+    and the minimums are funded pro rata.
+    Returns a dict of (districts x services) arrays and solve details.
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    cost = np.broadcast_to(np.asarray(
+        Config.ALLOCATION_COST_PER_REQUEST if cost_per_request is None else cost_per_request, dtype=np.float64
+    ), demand.shape)
+    weights = np.broadcast_to(np.asarray(1.0 if weights is None else weights, dtype=np.float64), demand.shape)
+
+    need = demand * cost
+    lo = min_level * need
+    hi = need
+    ratio = np.where(need > 0, weights / cost, 0.0)
+
+    caps = None if service_caps is None else np.broadcast_to(
+        np.asarray(service_caps, dtype=np.float64), demand.shape[1:])
+    minimum = lo.sum(axis=0)
+    over_cap = np.flatnonzero(minimum > caps) if caps is not None else np.array([], dtype=np.int64)
+    feasible = lo.sum() <= budget and not len(over_cap)
+    if not feasible:
+        # Not even the minimum service levels fit: fund them pro rata within each cap, then the budget
+        scale = np.ones(demand.shape[1])
+        if caps is not None:
+            scale = np.minimum(1.0, np.divide(caps, minimum, out=np.ones_like(scale), where=minimum > 0))
+        allocation = lo * scale
+        if allocation.sum() > budget:
+            allocation *= budget / allocation.sum()
+        return _result(allocation, need, None, feasible, over_cap)
+
+    service_floor = np.zeros(demand.shape[1])
+    if caps is not None:
+        service_floor = _service_multipliers(caps, need, ratio, lo, hi)
+
+    if _spend(service_floor, need, ratio, lo, hi).sum() <= budget:
+        multiplier = 0.0  # The total budget does not bind
+    else:
+        low, high = _multiplier_range(ratio)
+        for _ in range(ITERATIONS):
+            multiplier = np.sqrt(low * high)
+            spent = _spend(np.maximum(multiplier, service_floor), need, ratio, lo, hi).sum()
+            if spent > budget:
+                low = multiplier
+            else:
+                high = multiplier
+        multiplier = high
+
+    allocation = _spend(np.maximum(multiplier, service_floor), need, ratio, lo, hi)
+    return _result(allocation, need, multiplier, feasible, over_cap)
+
+
+def _spend(multiplier, need, ratio, lo, hi):
+    """Per-cell spend where marginal value equals the (per-service) multiplier"""
+    # Zero-need cells have ratio 0, so an unbinding multiplier of 0 gives 0/0 (NaN) there; they spend nothing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spend = need * np.log(np.maximum(np.nan_to_num(ratio / multiplier, nan=0.0, posinf=np.inf), 1.0))
+    return np.clip(spend, lo, hi)
+
+
+def _multiplier_range(ratio):
+    positive = ratio[ratio > 0]
+    if not len(positive):
+        return 1e-12, 1.0
+    # At ratio.max() nothing is funded above the minimum; far below it everything is
+    return positive.min() * 1e-9, positive.max()
+
+
+def _service_multipliers(caps, need, ratio, lo, hi):
+    """Smallest multiplier per service that keeps its spend within its cap, all services at once"""
+    low_bound, high_bound = _multiplier_range(ratio)
+    low = np.full(len(caps), low_bound)
+    high = np.full(len(caps), high_bound)
+
+    for _ in range(ITERATIONS):
+        multiplier = np.sqrt(low * high)
+        over = _spend(multiplier, need, ratio, lo, hi).sum(axis=0) > caps
+        low = np.where(over, multiplier, low)
+        high = np.where(over, high, multiplier)
+
+    # Services whose full need fits under the cap are not constrained
+    return np.where(hi.sum(axis=0) > caps, high, 0.0)
+
+
+def _result(allocation, need, multiplier, feasible, over_cap):
+    return {
+        'allocation': allocation,
+        'coverage': np.divide(allocation, need, out=np.zeros_like(allocation), where=need > 0),
+        'spent': float(allocation.sum()),
+        'multiplier': multiplier,
+        'feasible': feasible,
+        'over_cap': over_cap
+    }
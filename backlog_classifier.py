@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Local reclassification of the request backlog
+
+Trains hashed TF-IDF linear models on the labeled routing history and
+streams the whole backlog through them in large batches, so a taxonomy
+change costs minutes on one node instead of one LLM call per request.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from config import Config
+from search_index import tokenize
+
+TARGETS = ('service_category', 'department')
+
+
+def terms(text):
+    """Folded unigrams and bigrams, so romanized and Devanagari Marathi share features"""
+    tokens = tokenize(text)
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class BacklogClassifier:
+    """Hashed TF-IDF features and one linear model per routing field
+
+    After training, the IDF weights are folded into the stacked model
+    coefficients, so scoring a batch is one sparse product of raw term
+    counts with a (features x classes) matrix, plus the row norms from a
+    second product; no TF-IDF matrix is ever built.
+    """
+
+    def __init__(self, n_features=None, targets=TARGETS):
+        self.targets = list(targets)
+        self.vectorizer = HashingVectorizer(
+            analyzer=terms, n_features=n_features or Config.CLASSIFIER_HASH_FEATURES,
+            alternate_sign=False, norm=None, dtype=np.float32
+        )
+        self.classes = {}
+        self.weights = None     # (features x all classes), IDF folded in
+        self.intercepts = None
+        self.idf_squared = None
+        self.trained_at = None
+
+    def fit(self, descriptions, labels):
+        """Train on descriptions and their labels ({target: sequence}); returns training accuracy per target"""
+        counts = self._counts(descriptions)
+        tfidf = TfidfTransformer(sublinear_tf=True)
+        X = tfidf.fit_transform(counts)
+
+        weights, intercepts, accuracy = [], [], {}
+        for target in self.targets:
+            y = np.asarray(labels[target])
+            model = SGDClassifier(loss='log_loss', alpha=Config.CLASSIFIER_ALPHA, max_iter=20, tol=None,
+                                  random_state=42)
+            model.fit(X, y)
+            coef, intercept = model.coef_, model.intercept_
+            if len(model.classes_) == 2:
+                # Binary models keep one coefficient row; score both classes symmetrically
+                coef, intercept = np.vstack([-coef, coef]) / 2, np.array([-intercept[0], intercept[0]]) / 2
+            self.classes[target] = model.classes_
+            weights.append(coef)
+            intercepts.append(intercept)
+            accuracy[target] = float(model.score(X, y))
+
+        idf = tfidf.idf_.astype(np.float32)
+        self.weights = np.ascontiguousarray((np.vstack(weights).T * idf[:, None]).astype(np.float32))
+        self.intercepts = np.concatenate(intercepts).astype(np.float32)
+        self.idf_squared = idf ** 2
+        self.trained_at = datetime.now().isoformat()
+        return accuracy
+
+    def predict(self, descriptions):
+        """Label and confidence (0-1) per target for a batch, as a DataFrame"""
+        counts = self._counts(descriptions)
+        # Same transform as training: sublinear tf, IDF, L2 row norm
+        counts.data = 1 + np.log(counts.data)
+        norms = np.sqrt(counts.power(2) @ self.idf_squared)
+        norms[norms == 0] = 1.0
+        scores = (counts @ self.weights) / norms[:, None] + self.intercepts
+
+        result = {}
+        column = 0
+        for target in self.targets:
+            classes = self.classes[target]
+            block = scores[:, column:column + len(classes)]
+            column += len(classes)
+            best = block.argmax(axis=1)
+            # One-vs-rest log-loss margins, normalized across classes
+            probabilities = 1 / (1 + np.exp(-block))
+            result[target] = classes[best]
+            result[f"{target}_confidence"] = (probabilities[np.arange(len(best)), best]
+                                              / probabilities.sum(axis=1)).round(3)
+        return pd.DataFrame(result)
+
+    def _counts(self, descriptions):
+        return sparse.csr_matrix(self.vectorizer.transform(descriptions))
+
+    def save(self, path=None):
+        joblib.dump(self, path or Config.CLASSIFIER_MODEL_PATH)
+
+    @staticmethod
+    def load(path=None):
+        return joblib.load(path or Config.CLASSIFIER_MODEL_PATH)
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _classify_batch(batch):
+    predictions = _worker_model.predict(batch['description'].fillna('').astype(str))
+    predictions.insert(0, 'request_id', batch['request_id'].to_numpy())
+    return predictions
+
+
+def reclassify(model, batches, sink, workers=None):
+    """Classify DataFrame batches (request_id, description) and hand each result to ``sink``
+
+    Batches are classified on a process pool with at most two per worker
+    in flight, so memory stays bounded by the batch size however large the
+    backlog; results reach ``sink`` in input order. The model is shipped to
+    each worker once. Returns a summary dict.
+    """
+    workers = workers or Config.CLASSIFIER_WORKERS
+    started = time.perf_counter()
+    summary = {'rows': 0, 'batches': 0, 'low_confidence': 0}
+
+    def deliver(predictions):
+        predictions['classified_at'] = pd.Timestamp.now()
+        sink(predictions)
+        summary['rows'] += len(predictions)
+        summary['batches'] += 1
+        confidence = predictions[[f"{target}_confidence" for target in model.targets]].min(axis=1)
+        summary['low_confidence'] += int((confidence < Config.CLASSIFIER_REVIEW_CONFIDENCE).sum())
+
+    if workers <= 1:
+        _init_worker(model)
+        for batch in batches:
+            deliver(_classify_batch(batch))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model,)) as pool:
+            in_flight = []
+            for batch in batches:
+                in_flight.append(pool.submit(_classify_batch, batch))
+                if len(in_flight) >= 2 * workers:
+                    deliver(in_flight.pop(0).result())
+            for future in in_flight:
+                deliver(future.result())
+
+    summary['seconds'] = time.perf_counter() - started
+    summary['rows_per_minute'] = summary['rows'] / summary['seconds'] * 60 if summary['seconds'] else 0.0
+    return summary
+
+
+if __name__ == "__main__":
+    from data_pipeline import DataPipeline
+
+    parser = argparse.ArgumentParser(description="Train the backlog classifier or reclassify the backlog")
+    parser.add_argument('command', choices=['train', 'reclassify'])
+    parser.add_argument('--workers', type=int, default=Config.CLASSIFIER_WORKERS)
+    args = parser.parse_args()
+
+    pipeline = DataPipeline()
+    if args.command == 'train':
+        history = pd.concat(pipeline.iter_batches(Config.ROUTING_HISTORY_TABLE, ['description', *TARGETS]))
+        classifier = BacklogClassifier()
+        accuracy = classifier.fit(history['description'].fillna('').astype(str),
+                                  {target: history[target].astype(str) for target in TARGETS})
+        classifier.save()
+        print(f"✅ Trained on {len(history):,} routed requests: "
+              + ", ".join(f"{target} {score:.1%}" for target, score in accuracy.items()))
+    else:
+        classifier = BacklogClassifier.load()
+        summary = reclassify(
+            classifier,
+            pipeline.iter_batches(Config.ROUTING_HISTORY_TABLE, ['request_id', 'description'],
+                                  Config.CLASSIFIER_BATCH_ROWS),
+            lambda frame: pipeline.append_frame(Config.RECLASSIFICATION_TABLE, frame),
+            args.workers
+        )
+        print(f"✅ Reclassified {summary['rows']:,} requests in {summary['seconds']:.0f}s "
+              f"({summary['rows_per_minute']:,.0f}/min); {summary['low_confidence']:,} below "
+              f"{Config.CLASSIFIER_REVIEW_CONFIDENCE:.0%} confidence for LLM review")
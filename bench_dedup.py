@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure LLM call reduction from near-duplicate collapsing on a synthetic burst
+"""
+
+import random
+import time
+from dedup_index import ComplaintDeduplicator, classify_with_dedup
+
+WAVE_TEMPLATES = {
+    'Pune': [
+        "Water shortage in {area}, no water supply since {when}",
+        "No water supply in {area} since {when}, water shortage please help",
+        "Water shortage reported in {area} - no water since {when}",
+    ],
+    'Mumbai': [
+        "Garbage not collected in {area} for {when}, bad smell",
+        "Garbage not collected in {area} since {when} and bad smell everywhere",
+    ],
+}
+AREAS = {'Pune': ['Kothrud', 'Hadapsar', 'Baner'], 'Mumbai': ['Andheri', 'Dadar']}
+WHENS = ['yesterday', 'two days', 'morning', 'last night']
+OTHER = [
+    "Pothole near station road causing accidents",
+    "Street light not working outside school",
+    "Need ambulance at primary health centre",
+    "Ration card application pending for three months",
+    "Tree fallen on road after storm",
+]
+
+
+def synthetic_burst(size=600, wave_share=0.8, seed=7):
+    rng = random.Random(seed)
+    requests = []
+    for i in range(size):
+        if rng.random() < wave_share:
+            district = rng.choice(list(WAVE_TEMPLATES))
+            text = rng.choice(WAVE_TEMPLATES[district]).format(
+                area=rng.choice(AREAS[district]), when=rng.choice(WHENS)
+            )
+        else:
+            district = rng.choice(['Nagpur', 'Nashik', 'Aurangabad'])
+            text = f"{rng.choice(OTHER)} (ref {rng.randint(1000, 9999)})"
+        requests.append({'id': f"REQ_{i:05d}", 'description': text, 'district': district,
+                         'timestamp': 1_700_000_000 + i})
+    return requests
+
+
+if __name__ == "__main__":
+    burst = synthetic_burst()
+    deduplicator = ComplaintDeduplicator()
+
+    started = time.perf_counter()
+    results, calls = classify_with_dedup(burst, lambda text: ({'category': 'stub'}, True), deduplicator)
+    elapsed = time.perf_counter() - started
+
+    print(f"🧹 Near-duplicate collapsing on a {len(burst)}-request burst")
+    print("=" * 50)
+    print(f"LLM calls without dedup: {len(burst)}")
+    print(f"LLM calls with dedup:    {calls}")
+    print(f"Reduction:               {1 - calls / len(burst):.0%}")
+    print(f"Index + cluster time:    {elapsed / len(burst) * 1e6:.0f} µs per request")
+    print("=" * 50)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Peak memory of streamed exports against building the whole extract first
+
+Exports synthetic citizen requests as an admin (PII anonymized, every
+field kept) at growing sizes; the streamed peak should stay flat.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from config import Config
+from data_export import FORMATS, export_batches
+from security_framework import SecurityFramework
+from working_dashboard import simulated_requests
+
+
+def measure(step):
+    tracemalloc.start()
+    started = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def full_frame_export(rows, path, fmt):
+    """Baseline: materialize the extract, anonymize it, write it in one go"""
+    frame = SecurityFramework().anonymize_frame(pd.concat(simulated_requests(rows, Config.EXPORT_BATCH_ROWS)))
+    if fmt == 'parquet':
+        frame.to_parquet(path, compression=Config.EXPORT_PARQUET_COMPRESSION, index=False)
+    else:
+        frame.to_csv(path, index=False, compression='gzip')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streamed vs in-memory export peak memory")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 400_000, 1_000_000])
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_export" + FORMATS[args.format]['suffix'])
+    print(f"📤 {args.format.upper()} export of citizen requests, batches of {Config.EXPORT_BATCH_ROWS:,} rows")
+    print("=" * 72)
+    for rows in args.sizes:
+        elapsed, peak = measure(lambda: full_frame_export(rows, path, args.format))
+        print(f"{rows:>10,} rows  {'full DataFrame':<16} {elapsed:>6.2f}s  peak {peak:>7.1f} MB")
+        elapsed, peak = measure(lambda: export_batches(simulated_requests(rows, Config.EXPORT_BATCH_ROWS),
+                                                       path, args.format, 'admin'))
+        print(f"{rows:>10,} rows  {'streamed':<16} {elapsed:>6.2f}s  peak {peak:>7.1f} MB  "
+              f"({os.path.getsize(path) / 1e6:.1f} MB file)")
+    os.remove(path)
+    print("=" * 72)
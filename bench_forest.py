@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare sklearn RandomForestRegressor.predict with the flattened forest engine
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from bench_memory import synthetic_query_result
+from data_pipeline import compact_frame
+from feature_store import FEATURES, build_demand_features
+from forest_inference import FlatForest
+
+BATCH_SIZES = (1, 100, 1_000, 10_000, 100_000)
+TRAIN_ROWS = 50_000
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    frame = compact_frame(synthetic_query_result().sample(TRAIN_ROWS, random_state=0))
+    X = build_demand_features(frame, {})
+    model = RandomForestRegressor(n_estimators=100, random_state=42).fit(X, frame['request_count'])
+    forest = FlatForest.from_sklearn(model)
+
+    rng = np.random.default_rng(7)
+    pool = X.to_numpy(dtype=np.float32)
+
+    print(f"🌲 Forest inference ({forest.n_trees} trees, depth ≤ {forest.depth}, {len(forest.value):,} nodes)")
+    print("=" * 64)
+    print(f"{'batch':>8} {'sklearn':>12} {'flat':>12} {'speedup':>9} {'max |diff|':>12}")
+
+    for batch_size in BATCH_SIZES:
+        batch = pool[rng.integers(0, len(pool), batch_size)]
+        frame_batch = pd.DataFrame(batch, columns=FEATURES)
+        repeats = 3 if batch_size > 1000 else 20
+
+        expected = model.predict(frame_batch)
+        actual = forest.predict(batch)
+        assert np.allclose(expected, actual, rtol=1e-9, atol=1e-9), "flat forest diverged from sklearn"
+
+        sklearn_time = best_of(lambda: model.predict(frame_batch), repeats)
+        flat_time = best_of(lambda: forest.predict(batch), repeats)
+        print(f"{batch_size:>8,} {sklearn_time * 1000:>10.2f}ms {flat_time * 1000:>10.2f}ms "
+              f"{sklearn_time / flat_time:>8.1f}x {np.abs(expected - actual).max():>12.2e}")
+
+    print("=" * 64)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Peak memory and time of the joined health + infrastructure training data
+
+Compares a direct pandas join of both tables on (district, date) with the
+month-partitioned JoinedTrainingBuilder, on synthetic two-year tables.
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from data_pipeline import compact_frame
+from joined_training import JoinedTrainingBuilder, month_starts
+
+DISTRICTS = [f"District_{i:02d}" for i in range(36)]
+HEALTH_SERVICES = ['Primary Care', 'Maternity', 'Emergency', 'Vaccination', 'Diagnostics', 'Pharmacy']
+INFRA_TYPES = ['Roads', 'Water Supply', 'Drainage', 'Street Lights', 'Bridges', 'Power', 'Sanitation', 'Buildings']
+DAYS = 730
+
+
+class SyntheticPipeline:
+    """Serves month slices of synthetic tables like DataPipeline.get_month_data
+
+    ``query_latency_ms`` stands in for the warehouse round trip per query.
+    """
+
+    def __init__(self, query_latency_ms=0):
+        self.query_latency_ms = query_latency_ms
+        rng = np.random.default_rng(42)
+        dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=DAYS, freq='D')
+        self.tables = {
+            'health_services': self._table(rng, dates, 'service_type', HEALTH_SERVICES, {
+                'request_count': lambda n: rng.poisson(120, n),
+                'resolution_time': lambda n: rng.gamma(2.0, 2.2, n),
+                'priority_score': lambda n: rng.uniform(10, 100, n)
+            }),
+            'infrastructure_services': self._table(rng, dates, 'infrastructure_type', INFRA_TYPES, {
+                'maintenance_requests': lambda n: rng.poisson(40, n),
+                'budget_allocated': lambda n: rng.uniform(1e5, 5e6, n),
+                'completion_rate': lambda n: rng.uniform(0.4, 1.0, n)
+            })
+        }
+
+    @staticmethod
+    def _table(rng, dates, type_column, types, measures):
+        index = pd.MultiIndex.from_product([dates, DISTRICTS, types], names=['date', 'district', type_column])
+        frame = index.to_frame(index=False)
+        for name, draw in measures.items():
+            frame[name] = draw(len(frame))
+        frame['month'] = frame['date'].dt.month
+        frame['day_of_week'] = frame['date'].dt.dayofweek + 1
+        frame['district'] = frame['district'].astype(object)
+        frame[type_column] = frame[type_column].astype(object)
+        return frame
+
+    def get_month_data(self, table, month_start):
+        time.sleep(self.query_latency_ms / 1000)
+        frame = self.tables[table]
+        start = pd.Timestamp(month_start)
+        rows = (frame['date'] >= start) & (frame['date'] < start + pd.offsets.MonthBegin(1))
+        return compact_frame(frame[rows].reset_index(drop=True))
+
+
+def measure(step):
+    """Wall time of one run, then peak traced memory of a second (tracing is slow)"""
+    started = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def direct_join(pipeline):
+    """Baseline: every health row paired with every infrastructure row of its district-day"""
+    return pipeline.tables['health_services'].merge(
+        pipeline.tables['infrastructure_services'], on=['district', 'date'], suffixes=('', '_infra')
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Joined training data: direct join vs partitioned hash join")
+    parser.add_argument("--query-latency-ms", type=float, default=200, help="Simulated warehouse latency per query")
+    args = parser.parse_args()
+
+    pipeline = SyntheticPipeline(args.query_latency_ms)
+    months = month_starts(DAYS)
+    health_rows = len(pipeline.tables['health_services'])
+    infra_rows = len(pipeline.tables['infrastructure_services'])
+
+    print(f"🔗 Joined training data: {health_rows:,} health + {infra_rows:,} infrastructure rows, {len(months)} months")
+    print("=" * 78)
+
+    # The direct join reads each table once, so it pays the query latency twice
+    joined, elapsed, peak = measure(lambda: direct_join(pipeline))
+    elapsed += 2 * args.query_latency_ms / 1000
+    print(f"{'Direct (district, date) join':<34} {len(joined):>10,} rows  {elapsed:>6.2f}s  peak {peak:>7.1f} MB")
+    del joined
+
+    for workers in (1, 4):
+        builder = JoinedTrainingBuilder(pipeline, workers=workers)
+        (X, y), elapsed, peak = measure(lambda: builder.build(months))
+        print(f"{f'Partitioned hash join, {workers} worker(s)':<34} {len(X):>10,} rows  {elapsed:>6.2f}s  "
+              f"peak {peak:>7.1f} MB  (matrix {X.nbytes / 1e6:.1f} MB)")
+    print("=" * 78)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Exercise the LLM client against a local fault-injecting Gemini stub
+
+Scenario 1 overloads a stub with a small quota, once unthrottled and once
+through LLMClient. Scenario 2 takes the stub down for a while and checks
+that the circuit breaker fails fast to the keyword classifier and recovers.
+"""
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from llm_client import LLMClient, LLMUnavailable, TokenBucket
+from query_analysis import keyword_analysis
+
+QUERIES = [
+    "Water supply pipe leaking near station road",
+    "Need a doctor at the primary health centre",
+    "Large pothole on the main street causing traffic",
+    "Ration card application pending for three months",
+]
+
+
+class StubAPIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FaultInjectingModel:
+    """Stands in for genai.GenerativeModel with a quota, latency and faults
+
+    Calls beyond ``quota_per_second`` get a 429, a ``error_rate`` share get
+    a 503, and every call fails with 503 while ``down`` is set.
+    """
+
+    def __init__(self, quota_per_second=20, latency_ms=(20, 60), error_rate=0.0, seed=1):
+        self.quota = TokenBucket(quota_per_second, quota_per_second)
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.down = False
+        self.calls = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+            latency = self._rng.uniform(*self.latency_ms) / 1000
+            failed = self.down or self._rng.random() < self.error_rate
+
+        if not self.quota.acquire(timeout=0):
+            with self._lock:
+                self.throttled += 1
+            raise StubAPIError(429, "Resource has been exhausted (e.g. check quota).")
+        time.sleep(latency)
+        if failed:
+            raise StubAPIError(503, "The service is currently unavailable.")
+
+        query = prompt.split("Query:")[-1].split("\n")[0].strip()
+        return SimpleNamespace(text=json.dumps(keyword_analysis(query)))
+
+
+def run_burst(call, requests, workers):
+    outcomes = {'ok': 0, 'fallback': 0, 'error': 0}
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        started = time.perf_counter()
+        outcome = call(QUERIES[i % len(QUERIES)])
+        with lock:
+            outcomes[outcome] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(one, range(requests)))
+    return outcomes, sorted(latencies), time.perf_counter() - started
+
+
+def unthrottled(model):
+    def call(query):
+        try:
+            model.generate_content(f"Query: {query}\n")
+            return 'ok'
+        except StubAPIError:
+            return 'error'
+    return call
+
+
+def through_client(client):
+    def call(query):
+        _, _, fallback = client.analyze(query)
+        return 'fallback' if fallback else 'ok'
+    return call
+
+
+def report(name, model, outcomes, latencies, elapsed):
+    p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000
+    print(f"{name:<14} ok {outcomes['ok']:>4}  fallback {outcomes['fallback']:>4}  error {outcomes['error']:>4}  "
+          f"upstream calls {model.calls:>4}  429s {model.throttled:>4}  p95 {p95:>6.0f} ms  {elapsed:>5.1f}s")
+
+
+if __name__ == "__main__":
+    requests, workers = 400, 32
+
+    print("🧪 LLM client against a fault-injecting stub")
+    print("=" * 108)
+    print(f"Scenario 1: {requests} requests from {workers} threads against a 20 req/s quota")
+
+    model = FaultInjectingModel(error_rate=0.02)
+    report("unthrottled", model, *run_burst(unthrottled(model), requests, workers))
+
+    model = FaultInjectingModel(error_rate=0.02)
+    # Configured above the real quota on purpose, so 429s drive the AIMD limit
+    client = LLMClient(model, rate=40, burst=10, max_concurrency=16, retry_base_seconds=0.05,
+                       retry_max_seconds=1.0, wait_timeout=30)
+    report("LLMClient", model, *run_burst(through_client(client), requests, workers))
+    print(f"{'':<14} final concurrency limit {client.limiter.limit:.1f}")
+
+    print("-" * 108)
+    print("Scenario 2: outage, then recovery")
+    model = FaultInjectingModel(quota_per_second=200)
+    client = LLMClient(model, rate=100, burst=20, retry_base_seconds=0.01, retry_max_seconds=0.05,
+                       failure_threshold=5, reset_seconds=0.5)
+    model.down = True
+    report("during outage", model, *run_burst(through_client(client), 200, 8))
+    print(f"{'':<14} breaker {client.breaker.state}; upstream calls stopped after the breaker opened")
+
+    started = time.perf_counter()
+    try:
+        client.generate("Query: water leak\n", feature="probe")
+    except LLMUnavailable:
+        pass
+    print(f"{'':<14} fail-fast call took {(time.perf_counter() - started) * 1e6:.0f} µs")
+
+    model.down = False
+    time.sleep(0.6)
+    # The first caller after the reset period probes; the rest fail fast until it succeeds
+    through_client(client)(QUERIES[0])
+    calls_before = model.calls
+    report("after recovery", model, *run_burst(through_client(client), 100, 8))
+    print(f"{'':<14} breaker {client.breaker.state}; {model.calls - calls_before} upstream calls")
+    print("=" * 108)
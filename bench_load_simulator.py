@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Wall time of the staffing what-if simulation by number of worker processes
+"""
+
+import argparse
+import numpy as np
+from load_simulator import baseline_staff, simulate_load
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte-Carlo load simulation throughput")
+    parser.add_argument("--replications", type=int, default=2000)
+    parser.add_argument("--service", default="Health")
+    args = parser.parse_args()
+
+    # Same shape as the dashboard's 30-day forecast for a large district
+    day = np.arange(30)
+    daily_demand = 225 + day * 2 + day % 7 * 10
+    staff = baseline_staff(daily_demand)
+
+    print(f"🎲 Load simulation: {args.replications:,} replications of 30 days, "
+          f"{daily_demand.sum():,} forecast {args.service} requests")
+    print("=" * 72)
+    for workers in (1, 2, 4):
+        for label, level in (("current", staff), ("+15%", int(round(staff * 1.15)))):
+            result = simulate_load(daily_demand, level, args.service, replications=args.replications,
+                                   workers=workers)
+            print(f"{workers} worker(s), {label:>7} staff ({level:>3})  {result['elapsed']:>6.2f}s  "
+                  f"mean {np.median(result['mean_days']):.2f} d  p90 {np.median(result['p90_days']):.2f} d  "
+                  f"open {result['open_share'].mean():.1%}")
+    print("=" * 72)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Compare memory of the training frame before and after compact dtypes
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from data_pipeline import compact_frame
+
+DISTRICTS = [f"District_{i:02d}" for i in range(36)]
+SERVICES = ['Health', 'Infrastructure', 'Safety', 'Education', 'Water Supply', 'Sanitation', 'Power', 'Other']
+DAYS = 730  # Two years, as in get_training_data
+
+
+def synthetic_query_result():
+    """Frame shaped like the BigQuery result: object strings, int64, float64"""
+    rng = np.random.default_rng(42)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=DAYS, freq='D')
+    index = pd.MultiIndex.from_product([dates, DISTRICTS, SERVICES], names=['date', 'district', 'service_type'])
+    frame = index.to_frame(index=False)
+    rows = len(frame)
+    return pd.DataFrame({
+        'district': frame['district'].astype(object),
+        'service_type': frame['service_type'].astype(object),
+        'request_count': rng.poisson(120, rows).astype('int64'),
+        'resolution_time': rng.gamma(2.0, 2.2, rows),
+        'priority_score': rng.uniform(10, 100, rows),
+        'month': frame['date'].dt.month.astype('int64'),
+        'day_of_week': (frame['date'].dt.dayofweek + 1).astype('int64')
+    })
+
+
+def megabytes(frame):
+    return frame.memory_usage(deep=True).sum() / 1e6
+
+
+def current_path(frame):
+    """Baseline: object columns plus two int64 LabelEncoder columns"""
+    frame = frame.copy()
+    frame['district_encoded'] = LabelEncoder().fit_transform(frame['district'])
+    frame['service_encoded'] = LabelEncoder().fit_transform(frame['service_type'])
+    return megabytes(frame)
+
+
+def compact_path(frame):
+    """Categorical columns with their codes reused as features"""
+    frame = compact_frame(frame.copy())
+    features = pd.DataFrame({
+        'district_encoded': frame['district'].cat.codes,
+        'service_encoded': frame['service_type'].cat.codes
+    })
+    return megabytes(frame) + megabytes(features)
+
+
+if __name__ == "__main__":
+    frame = synthetic_query_result()
+    before = current_path(frame)
+    after = compact_path(frame)
+
+    print(f"📦 Training frame memory ({len(frame):,} rows)")
+    print("=" * 50)
+    print(f"Current path (object + int64 + LabelEncoder): {before:8.1f} MB")
+    print(f"Compact path (category + downcast + codes):   {after:8.1f} MB")
+    print(f"Reduction: {before / after:.1f}x")
+    print("=" * 50)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Offline throughput of the routing and summary pipelines
+
+Runs ServicePrioritizationEngine against the deterministic local LLM
+provider with a simulated latency, so results are reproducible on a
+machine with no network or credentials.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bench_dedup import synthetic_burst
+from llm_client import LLMClient
+from llm_providers import LocalProvider
+from service_engine import ServicePrioritizationEngine
+
+
+class OfflineWarehouse:
+    """Stands in for the BigQuery client; reports no workload data"""
+
+    def query(self, query):
+        raise RuntimeError("offline")
+
+
+def make_engine(latency_ms, words_per_second, concurrency):
+    provider = LocalProvider(latency_ms=latency_ms, words_per_second=words_per_second)
+    # Quota limits are Gemini's; offline only the concurrency cap matters
+    llm = LLMClient(provider, rate=1e9, burst=1e9, max_concurrency=concurrency)
+    return ServicePrioritizationEngine(llm=llm, bq_client=OfflineWarehouse())
+
+
+def timed_run(step):
+    started = time.perf_counter()
+    result = step()
+    return result, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline routing and summary throughput")
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Simulated LLM latency per call")
+    parser.add_argument("--words-per-second", type=float, default=400, help="Simulated streaming pace")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    burst = synthetic_burst(args.requests)
+    print(f"🧪 Offline pipeline throughput: {args.requests} requests, "
+          f"{args.latency_ms:.0f} ms simulated LLM latency, {args.workers} workers")
+    print("=" * 72)
+
+    engine = make_engine(args.latency_ms, args.words_per_second, args.workers)
+    _, elapsed = timed_run(lambda: [engine.route_service_request(request) for request in burst[:100]])
+    print(f"{'Routing, one by one (first 100)':<40} {100 / elapsed:>8.1f} req/s")
+
+    engine = make_engine(args.latency_ms, args.words_per_second, args.workers)
+    with ThreadPoolExecutor(args.workers) as pool:
+        _, elapsed = timed_run(lambda: list(pool.map(engine.route_service_request, burst)))
+    print(f"{'Routing, ' + str(args.workers) + ' workers':<40} {len(burst) / elapsed:>8.1f} req/s")
+
+    engine = make_engine(args.latency_ms, args.words_per_second, args.workers)
+    _, elapsed = timed_run(lambda: engine.route_service_requests(burst))
+    print(f"{'Routing, burst with dedup':<40} {len(burst) / elapsed:>8.1f} req/s")
+
+    engine = make_engine(args.latency_ms, args.words_per_second, args.workers)
+    _, elapsed = timed_run(lambda: engine.generate_summary_report(burst))
+    print(f"{'Summary, uncached':<40} {elapsed * 1000:>8.1f} ms")
+    _, elapsed = timed_run(lambda: engine.generate_summary_report(burst))
+    print(f"{'Summary, cached':<40} {elapsed * 1000:>8.3f} ms")
+
+    engine = make_engine(args.latency_ms, args.words_per_second, args.workers)
+    stream = engine.generate_summary_report(burst, stream=True)
+    _, elapsed = timed_run(lambda: list(stream))
+    print(f"{'Summary, streamed':<40} {stream.first_token_seconds * 1000:>8.1f} ms to first text, "
+          f"{elapsed * 1000:.0f} ms total")
+    print("=" * 72)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Query latency of the request search index over a large synthetic corpus
+
+Descriptions mix English, romanized Marathi and Devanagari complaints
+with random landmarks, so posting lists range from a handful of entries
+to a quarter of the corpus.
+"""
+
+import argparse
+import time
+import numpy as np
+from config import Config
+from search_index import SearchIndex
+from working_dashboard import simulated_descriptions
+
+QUERIES = ["pothole near station road", "paani nahi", "खड्डा", "street light school", "ambulance hospital",
+           "ration card pending", "raasta khadda bridge", "teacher absent"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Request search latency")
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for request_id, text, district, category, _ in simulated_descriptions(args.docs):
+        index.add(request_id, text, district, category)
+    build = time.perf_counter() - started
+    # Each varint ends on a byte without the continuation bit; two varints per posting
+    postings = sum(np.count_nonzero(np.frombuffer(bytes(p), dtype=np.uint8) < 0x80) // 2
+                   for p in index.postings.values())
+
+    print(f"🔎 Request search over {len(index):,} descriptions")
+    print("=" * 72)
+    print(f"Index build {build:.1f}s ({len(index) / build:,.0f} docs/s), {len(index.postings):,} terms")
+    print(f"Postings {index.posting_bytes() / 1e6:.1f} MB compressed "
+          f"(~{postings * 8 / 1e6:.1f} MB as int32 doc id + tf pairs)")
+    print("-" * 72)
+    for query in QUERIES:
+        for filters in ({}, {'district': 'Nashik'}, {'district': 'Pune', 'category': 'infrastructure'}):
+            timings = []
+            for _ in range(args.repeats):
+                begin = time.perf_counter()
+                results = index.search(query, limit=Config.SEARCH_MAX_RESULTS, **filters)
+                timings.append((time.perf_counter() - begin) * 1000)
+            label = query + (f" [{', '.join(filters.values())}]" if filters else "")
+            print(f"{label:<52} p50 {np.median(timings):6.1f} ms  max {max(timings):6.1f} ms  "
+                  f"{len(results):>2} hits")
+    print("=" * 72)
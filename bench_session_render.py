@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Multi-session render benchmark for the Streamlit dashboards
+
+Starts one ``streamlit run`` server and drives N concurrent sessions against
+it over Streamlit's websocket, the way N browser tabs would: every role and
+page, and each page's buttons. All sessions share the one server process, its
+cross-session caches and its script threads, so the results show how rerun
+latency grows with concurrent sessions and how much memory each session adds
+to the served app. Reports per-page rerun latency percentiles at each session
+count, and server memory, against a pass/fail budget.
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+import numpy as np
+from websockets.sync.client import connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROLES = ["citizen_service", "data_analyst", "admin"]
+SAMPLE_QUERY = "Water supply pipe leaking near station road, urgent help needed"
+# The first rerun of each session includes the session's setup; it is reported but not budgeted
+COLD_START = "initial load"
+# Bulk jobs, timed by bench_export.py; reported but not held to the render budget
+BULK_ACTIONS = ("Prepare export",)
+TEXT_WIDGETS = ("text_area", "text_input")
+
+
+def budgeted(name):
+    return name != COLD_START and not name.endswith(BULK_ACTIONS)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB, from /proc"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class DashboardServer:
+    """One headless ``streamlit run`` process serving the app"""
+
+    def __init__(self, app, startup_timeout=60):
+        self.app = app
+        self.port = free_port()
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    @property
+    def url(self):
+        return f"ws://localhost:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.app,
+             "--server.port", str(self.port), "--server.headless", "true",
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"streamlit exited with status {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://localhost:{self.port}/_stcore/health", timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.process.kill()
+        raise RuntimeError(f"streamlit did not become healthy within {self.startup_timeout:.0f}s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def rss_mb(self):
+        return rss_mb(self.process.pid)
+
+
+class BrowserSession:
+    """One session on the server, sending widget states like the browser does"""
+
+    def __init__(self, url, timeout):
+        self.ws = connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+        self.timeout = timeout
+        self.widgets = {}
+        self.values = {}
+        self.exceptions = []
+
+    def close(self):
+        self.ws.close()
+
+    def find(self, kind, label):
+        return next((widget for widget in self.widgets.values()
+                     if widget['type'] == kind and widget['label'] == label), None)
+
+    def set_value(self, widget, value):
+        self.values[widget['id']] = value
+
+    def rerun(self, trigger=None):
+        """Rerun the script with the current widget values; returns latency in ms"""
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        for widget_id, value in self.values.items():
+            if widget_id in self.widgets:
+                message.rerun_script.widget_states.widgets.append(WidgetState(id=widget_id, string_value=value))
+        if trigger is not None:
+            message.rerun_script.widget_states.widgets.append(WidgetState(id=trigger, trigger_value=True))
+
+        started = time.perf_counter()
+        self.ws.send(message.SerializeToString())
+        widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                self._collect(forward.delta.new_element, widgets)
+            elif kind == 'script_finished':
+                break
+        latency_ms = (time.perf_counter() - started) * 1000
+        # Widgets no longer on the page drop out of the next rerun's state, as in the browser
+        self.widgets = widgets
+        return latency_ms
+
+    def _collect(self, element, widgets):
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.exceptions.append(element.exception.message)
+            return
+        proto = getattr(element, kind)
+        if kind in ('button', 'selectbox', 'radio') + TEXT_WIDGETS:
+            widgets[proto.id] = {
+                'id': proto.id,
+                'type': kind,
+                'label': proto.label,
+                'options': list(getattr(proto, 'options', []))
+            }
+
+
+def run_session(url, iterations, timeout, start_barrier, latencies, errors):
+    """Drive one session through every role, page and button"""
+    def record(name, latency_ms):
+        latencies[name].append(latency_ms)
+
+    session = None
+    try:
+        session = BrowserSession(url, timeout)
+        start_barrier.wait()
+        record(COLD_START, session.rerun())
+
+        for _ in range(iterations):
+            for role in ROLES:
+                session.set_value(session.find('selectbox', "User Role"), role)
+                for page in session.find('radio', "Select Dashboard")['options']:
+                    session.set_value(session.find('radio', "Select Dashboard"), page)
+                    record(page, session.rerun())
+
+                    for widget in session.widgets.values():
+                        if widget['type'] in TEXT_WIDGETS:
+                            session.set_value(widget, SAMPLE_QUERY)
+                    # A rerun can add or drop buttons, so each one is looked up again by id
+                    for button_id in [w['id'] for w in session.widgets.values() if w['type'] == 'button']:
+                        button = session.widgets.get(button_id)
+                        if button is None:
+                            continue
+                        record(f"{page} › {button['label']}", session.rerun(trigger=button_id))
+    except Exception as e:
+        errors.append(f"session: {e!r}")
+    finally:
+        if session is not None:
+            session.close()
+            for message in session.exceptions:
+                if f"app exception: {message}" not in errors:
+                    errors.append(f"app exception: {message}")
+
+
+class SessionBenchmark:
+    def __init__(self, app, session_counts, iterations, timeout):
+        self.app = app
+        self.session_counts = session_counts
+        self.iterations = iterations
+        self.timeout = timeout
+        self.levels = []
+        self.errors = []
+        self.rss_baseline = None
+
+    def run(self):
+        with DashboardServer(self.app) as server:
+            # One warm-up session loads the script's modules and shared caches
+            warmup = BrowserSession(server.url, self.timeout)
+            warmup.rerun()
+            warmup.close()
+            self.rss_baseline = server.rss_mb()
+
+            for sessions in self.session_counts:
+                self.levels.append(self._run_level(server, sessions))
+
+    def _run_level(self, server, sessions):
+        latencies = defaultdict(list)
+        errors = []
+        barrier = threading.Barrier(sessions)
+        threads = [
+            threading.Thread(target=run_session,
+                             args=(server.url, self.iterations, self.timeout, barrier, latencies, errors))
+            for _ in range(sessions)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.errors.extend(error for error in errors if error not in self.errors)
+        return {
+            'sessions': sessions,
+            'latencies': dict(latencies),
+            'elapsed': time.perf_counter() - started,
+            'rss': server.rss_mb()
+        }
+
+
+def report(test, p95_budget_ms, memory_budget_mb):
+    print(f"🧪 Session render benchmark: {test.app}, one server, "
+          f"{', '.join(str(n) for n in test.session_counts)} concurrent sessions")
+    print("=" * 78)
+
+    failures = []
+    for level in test.levels:
+        runs = sum(len(samples) for samples in level['latencies'].values())
+        print(f"\n👥 {level['sessions']} sessions: {runs} reruns in {level['elapsed']:.1f}s "
+              f"({runs / level['elapsed']:.1f}/s)")
+        print(f"{'page':<44} {'runs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for name in sorted(level['latencies']):
+            samples = np.array(level['latencies'][name])
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            over_budget = budgeted(name) and p95 > p95_budget_ms
+            flag = "❌" if over_budget else "  "
+            print(f"{flag}{name[:42]:<42} {len(samples):>5} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f}")
+            if over_budget:
+                failures.append(f"{level['sessions']} sessions, {name}: p95 {p95:.0f} ms > {p95_budget_ms:.0f} ms")
+
+    # Rerun latency across all pages as sessions are added
+    print("\n📈 Latency growth (budgeted reruns)")
+    print(f"{'sessions':>8} {'p50 ms':>8} {'p95 ms':>8} {'server MB':>10}")
+    for level in test.levels:
+        samples = np.concatenate([samples for name, samples in level['latencies'].items()
+                                  if budgeted(name)] or [[np.nan]])
+        p50, p95 = np.percentile(samples, [50, 95])
+        print(f"{level['sessions']:>8} {p50:>8.0f} {p95:>8.0f} {level['rss']:>10.0f}")
+
+    growth = max(level['rss'] for level in test.levels) - test.rss_baseline
+    per_session = growth / max(test.session_counts)
+    print("-" * 78)
+    print(f"Server memory: {test.rss_baseline:.0f} MB after warm-up, peak growth +{growth:.0f} MB "
+          f"over {max(test.session_counts)} sessions ({per_session:.1f} MB per session)")
+    if per_session > memory_budget_mb:
+        failures.append(f"server memory growth {per_session:.1f} MB per session > {memory_budget_mb:.0f} MB")
+
+    for error in test.errors:
+        failures.append(error)
+
+    print("=" * 78)
+    if failures:
+        print("❌ FAIL")
+        for failure in failures:
+            print(f"   - {failure}")
+        return False
+
+    print("✅ PASS")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session dashboard render benchmark against one server")
+    parser.add_argument("--app", default="working_dashboard.py")
+    parser.add_argument("--sessions", default="1,4,8",
+                        help="Comma-separated concurrent session counts, run in turn against the same server")
+    parser.add_argument("--iterations", type=int, default=1, help="Passes over every role and page per session")
+    parser.add_argument("--p95-budget-ms", type=float, default=2000)
+    parser.add_argument("--memory-budget-mb", type=float, default=25,
+                        help="Max server RSS growth over its warm-up size, per concurrent session")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-rerun timeout in seconds")
+    args = parser.parse_args()
+
+    test = SessionBenchmark(args.app, [int(n) for n in args.sessions.split(",")], args.iterations, args.timeout)
+    test.run()
+    sys.exit(0 if report(test, args.p95_budget_ms, args.memory_budget_mb) else 1)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Metric card latency from the tiered store against aggregating raw events
+
+Both answer the dashboard's "this week vs last week" satisfaction card;
+the raw scan grows with history while the store's read stays flat.
+"""
+
+import argparse
+import time
+import numpy as np
+from timeseries_store import TimeSeriesStore
+
+
+def raw_card(times, ratings, now):
+    week = 7 * 86400
+    current = ratings[times > now - week].mean()
+    previous = ratings[(times > now - 2 * week) & (times <= now - week)].mean()
+    return current, previous
+
+
+def best_of(step, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        step()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metric card latency vs history size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    now = time.time()
+    print("📈 Satisfaction card: 7 days vs the 7 before")
+    print("=" * 72)
+    for size in args.sizes:
+        times = now - rng.uniform(0, 365 * 86400, size)
+        ratings = np.clip(rng.normal(4.0, 0.6, size), 1, 5)
+        store = TimeSeriesStore()
+        started = time.perf_counter()
+        store.record_many('satisfaction', ratings, times)
+        ingest = time.perf_counter() - started
+
+        raw = best_of(lambda: raw_card(times, ratings, now), args.repeats)
+        tiered = best_of(lambda: store.card('satisfaction', periods=7), args.repeats)
+        print(f"{size:>12,} ratings  raw scan {raw:8.2f} ms  store {tiered:6.3f} ms  "
+              f"(ingest {size / ingest / 1e6:.1f}M/s)")
+    print("=" * 72)
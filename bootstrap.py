@@ -0,0 +1,173 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib
+import json
+import os
+import threading
+import time
+from config import Config
+
+
+class Step:
+    """One bootstrap step: a callable, the steps it needs, and its inputs
+
+    ``fingerprint`` returns a JSON-serializable description of everything
+    the step's outcome depends on; it is evaluated once the dependencies
+    have finished. Steps without one always run. ``outputs`` are files the
+    step's work must leave behind; if one is missing the step runs again.
+    """
+
+    def __init__(self, name, run, deps=(), fingerprint=None, outputs=()):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.fingerprint = fingerprint
+        self.outputs = list(outputs)
+
+
+class Bootstrap:
+    """Platform bootstrap as a DAG of steps on a thread pool
+
+    A step starts as soon as all its dependencies have finished, so
+    independent branches run concurrently. Each completed step saves its
+    digest (its fingerprint plus the versions of its fingerprinted
+    dependencies) and a new version to a state file; on restart a step
+    whose digest is unchanged is skipped and keeps its version, while a
+    step that runs again gets a new one, so everything downstream of it
+    runs too. A failed step is retried next boot and blocks its dependents.
+    """
+
+    def __init__(self, state_path=None, workers=None):
+        self.state_path = state_path or Config.BOOTSTRAP_STATE_PATH
+        self.workers = workers or Config.BOOTSTRAP_WORKERS
+        self.steps = {}
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+
+    def add(self, name, run, deps=(), fingerprint=None, outputs=()):
+        for dep in deps:
+            if dep not in self.steps:
+                raise ValueError(f"Step {name} depends on unknown step {dep}")
+        self.steps[name] = Step(name, run, deps, fingerprint, outputs)
+
+    def run(self, force=False):
+        """Run every step; returns the report (see ``report``)"""
+        results = {}
+        versions = {}
+        started = time.perf_counter()
+        pending = dict(self.steps)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            running = {}
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if any(results.get(dep, {}).get('status') in ('failed', 'blocked') for dep in step.deps):
+                        results[name] = {'status': 'blocked', 'start': 0.0, 'end': 0.0}
+                        del pending[name]
+                    elif all(dep in results for dep in step.deps):
+                        del pending[name]
+                        running[pool.submit(self._run_step, step, versions, force, started)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], versions[name] = future.result()
+
+        return self.report(results, time.perf_counter() - started)
+
+    def _run_step(self, step, versions, force, started):
+        digest = None
+        if step.fingerprint is not None:
+            payload = {'inputs': step.fingerprint(), 'deps': {dep: versions.get(dep) for dep in step.deps}}
+            digest = self._hash(payload)
+
+        begin = time.perf_counter() - started
+        previous = self.state.get(step.name, {})
+        unchanged = digest is not None and previous.get('digest') == digest
+        if not force and unchanged and all(os.path.exists(path) for path in step.outputs):
+            return {'status': 'skipped', 'start': begin, 'end': begin}, previous['version']
+
+        print(f"▶️ {step.name}...")
+        try:
+            step.run()
+        except Exception as e:
+            print(f"⚠️ {step.name} failed: {e}")
+            with self._lock:
+                self.state.pop(step.name, None)
+                self._save_state()
+            return {'status': 'failed', 'start': begin, 'end': time.perf_counter() - started, 'error': str(e)}, None
+
+        version = None
+        if digest is not None:
+            version = self._hash([digest, time.time()])
+            with self._lock:
+                self.state[step.name] = {'digest': digest, 'version': version}
+                self._save_state()
+        return {'status': 'ran', 'start': begin, 'end': time.perf_counter() - started}, version
+
+    @staticmethod
+    def _hash(payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def report(self, results, total):
+        """Per-step results, total boot time and the critical path
+
+        The critical path is the chain of dependencies with the longest
+        summed step time: the floor on boot time however many workers run.
+        """
+        finish = {}
+        chain = {}
+        for name in self._topological_order():
+            duration = results[name]['end'] - results[name]['start']
+            slowest = max(self.steps[name].deps, key=lambda dep: finish[dep], default=None)
+            finish[name] = duration + (finish[slowest] if slowest else 0.0)
+            chain[name] = (chain[slowest] if slowest else []) + [name]
+
+        last = max(finish, key=finish.get, default=None)
+        return {
+            'steps': results,
+            'total_seconds': total,
+            'critical_path': chain.get(last, []),
+            'critical_path_seconds': finish.get(last, 0.0)
+        }
+
+    def _topological_order(self):
+        order, seen = [], set()
+
+        def visit(name):
+            if name not in seen:
+                seen.add(name)
+                for dep in self.steps[name].deps:
+                    visit(dep)
+                order.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self):
+        # Write-then-rename so a crash mid-boot never corrupts the state
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+
+def print_report(report):
+    icons = {'ran': '✅', 'skipped': '⏭️', 'failed': '❌', 'blocked': '⛔'}
+    print("\n⏱️ Bootstrap steps:")
+    # In start order, with steps that never started last
+    order = sorted(report['steps'].items(), key=lambda item: (item[1]['status'] == 'blocked', item[1]['start']))
+    for name, result in order:
+        print(f"  {icons[result['status']]} {name:<24} {result['status']:<8} "
+              f"{result['end'] - result['start']:>7.2f}s")
+    print(f"⏱️ Boot time {report['total_seconds']:.2f}s; critical path "
+          f"{' → '.join(report['critical_path'])} ({report['critical_path_seconds']:.2f}s)")
@@ -17,4 +17,129 @@ class Config:
     
     # Data Privacy Settings
     PII_FIELDS = ["citizen_id", "phone", "address", "aadhaar"]
-    RETENTION_DAYS = 2555  # 7 years as per Indian data laws
\ No newline at end of file
+    RETENTION_DAYS = 2555  # 7 years as per Indian data laws
+    
+    # Executive summary generation
+    SUMMARY_CACHE_SIZE = 32  # Distinct request digests kept in memory
+
+    # Observability
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))  # Local Prometheus scrape endpoint
+    
+    # Platform bootstrap
+    BOOTSTRAP_STATE_PATH = os.getenv("BOOTSTRAP_STATE_PATH", ".bootstrap_state.json")  # Digests of completed steps
+    BOOTSTRAP_WORKERS = 4  # Steps run concurrently when their dependencies allow
+    
+    # Model training
+    FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "feature_store")
+    TRAINING_WINDOW_DAYS = 730  # Matches the 2-year window in get_training_data
+    TRAINING_JOIN_WORKERS = 4  # Months fetched and joined in parallel for the family models
+    
+    # Retraining gate: the demand model is retrained only when incoming data drifts
+    DRIFT_PSI_THRESHOLD = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.2"))  # Population stability index
+    DRIFT_MEAN_SHIFT = 0.5  # Mean shift in training standard deviations
+    DRIFT_MIN_SAMPLES = 200  # New rows a district needs before its drift is judged
+    DRIFT_HISTOGRAM_BINS = 10  # Quantile bins of the training distribution
+    
+    # Local prediction service
+    PREDICTION_SERVER_PORT = int(os.getenv("PREDICTION_SERVER_PORT", "8601"))
+    PREDICTION_MAX_BATCH_SIZE = 64  # Rows coalesced into one model.predict call
+    PREDICTION_MAX_WAIT_MS = 2.0  # How long the first request waits for company
+    FLAT_FOREST_MAX_ROWS = 512  # Larger batches go through sklearn's own predict
+    
+    # Near-duplicate complaint collapsing
+    DEDUP_SIMILARITY_THRESHOLD = 0.6  # Estimated Jaccard similarity of word shingles
+    DEDUP_WINDOW_SECONDS = 6 * 3600  # Clusters expire after this long without a new member
+    DEDUP_RESULT_TTL_SECONDS = 3600  # A cluster's classification is redone this long after it was made
+    
+    # Real-time alerts
+    ALERT_BUCKET_SECONDS = 300  # Ring counter resolution
+    ALERT_WINDOW_MINUTES = 15  # Short window the alerts fire on
+    ALERT_BASELINE_HOURS = 24  # Window the usual rate is measured over
+    ALERT_THRESHOLD = 100  # Requests per district x category in the short window
+    ALERT_SPIKE_RATIO = 3.0  # Short-window rate versus baseline rate
+    ALERT_MIN_SPIKE_COUNT = 20  # Ignore spikes on tiny counts
+    ALERT_MAX_EXACT_KEYS = 4096  # Keys beyond this share a count-min sketch
+    
+    # LLM backend: "gemini", or "local" for the offline deterministic provider
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")  # 1.5+ for JSON-schema responses
+    LLM_LOCAL_LATENCY_MS = float(os.getenv("LLM_LOCAL_LATENCY_MS", "0"))  # Simulated latency of the local provider
+    LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH", "")  # JSONL of recorded responses for the local provider
+    LLM_RECORD_PATH = os.getenv("LLM_RECORD_PATH", "")  # Append Gemini responses here for later replay
+    
+    # LLM client limits
+    LLM_RATE_PER_SECOND = float(os.getenv("LLM_RATE_PER_SECOND", "1.0"))  # Gemini quota, requests per second
+    LLM_BURST = 5  # Requests allowed back to back before the rate applies
+    LLM_MAX_CONCURRENCY = 8  # Upper bound for the adaptive in-flight limit
+    LLM_MAX_RETRIES = 3  # Retries on 429 and 5xx responses
+    LLM_RETRY_BASE_SECONDS = 0.5  # First retry waits up to this long, doubling after
+    LLM_RETRY_MAX_SECONDS = 8.0
+    LLM_CIRCUIT_FAILURES = 5  # Consecutive failed calls before failing fast
+    LLM_CIRCUIT_RESET_SECONDS = 30  # How long to fail fast before probing again
+    LLM_WAIT_TIMEOUT_SECONDS = 10  # Longest a caller queues for the limiter
+    
+    # Budget allocation
+    DISTRICTS = [
+        "Ahmednagar", "Akola", "Amravati", "Aurangabad", "Beed", "Bhandara", "Buldhana", "Chandrapur",
+        "Dhule", "Gadchiroli", "Gondia", "Hingoli", "Jalgaon", "Jalna", "Kolhapur", "Latur",
+        "Mumbai City", "Mumbai Suburban", "Nagpur", "Nanded", "Nandurbar", "Nashik", "Osmanabad", "Palghar",
+        "Parbhani", "Pune", "Raigad", "Ratnagiri", "Sangli", "Satara", "Sindhudurg", "Solapur",
+        "Thane", "Wardha", "Washim", "Yavatmal"
+    ]
+    ALLOCATION_COST_PER_REQUEST = 5000  # Rupees to serve one forecast request
+    SERVICE_WEIGHTS = {"Health": 1.5, "Infrastructure": 1.0, "Safety": 1.3}  # Value of a served request
+    
+    # Officer assignment
+    ASSIGNMENT_CHUNK_SIZE = int(os.getenv("ASSIGNMENT_CHUNK_SIZE", "128"))  # Requests per exact matching within a department
+    ASSIGNMENT_DEMO_RESOLUTION_SECONDS = int(os.getenv("ASSIGNMENT_DEMO_RESOLUTION_SECONDS", "300"))  # Dashboard demo: simulated time to resolve
+    
+    # Staffing what-if simulation
+    SIM_REPLICATIONS = int(os.getenv("SIM_REPLICATIONS", "2000"))  # Monte-Carlo runs per scenario
+    SIM_CHUNK_SIZE = 500  # Replications vectorized together in one worker task
+    SIM_WORKERS = int(os.getenv("SIM_WORKERS", str(os.cpu_count() or 1)))
+    SIM_STEP_HOURS = 6  # Simulation clock resolution
+    SIM_REQUESTS_PER_STAFF_DAY = 8.0  # Requests one officer resolves per day
+    SIM_BASELINE_UTILIZATION = 0.95  # Current staffing: this busy on the mean forecast
+    SIM_SURGE_SHAPE = 25  # Gamma shape of the daily demand multiplier; higher is steadier
+    
+    # Data exports
+    EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "50000"))  # Rows held in memory at once
+    EXPORT_PARQUET_COMPRESSION = "zstd"
+    EXPORT_GZIP_LEVEL = 6
+    EXPORT_MAX_ROWS = 2_000_000  # Largest export the dashboard offers
+    
+    # Request search
+    SEARCH_BM25_K1 = 1.2  # Term-frequency saturation
+    SEARCH_BM25_B = 0.75  # Document-length normalization
+    SEARCH_MAX_RESULTS = 20
+    SEARCH_DEMO_DOCUMENTS = int(os.getenv("SEARCH_DEMO_DOCUMENTS", "5000"))  # Simulated past requests each dashboard worker indexes
+    
+    # Dashboard metric store: tier -> (bucket seconds, buckets kept)
+    TIMESERIES_TIERS = {
+        "minute": (60, 24 * 60),  # One day
+        "hour": (3600, 24 * 90),  # 90 days
+        "day": (86400, 2 * 365)  # Two years
+    }
+    
+    # Shared snapshots for dashboard workers (memory-backed on Linux)
+    SHARED_CACHE_DIR = os.getenv(
+        "SHARED_CACHE_DIR", "/dev/shm/governance_cache" if os.path.isdir("/dev/shm") else "shared_cache"
+    )
+    SHARED_CACHE_REFRESH_SECONDS = int(os.getenv("SHARED_CACHE_REFRESH_SECONDS", "300"))
+    SHARED_CACHE_POLL_SECONDS = 2  # How often a worker checks for a newer version
+    SHARED_CACHE_KEEP_VERSIONS = 3  # Old versions kept for workers still reading them
+    SHARED_CACHE_ROLLUP_ROWS = 1_000_000  # Requests aggregated into the district rollup
+    SHARED_CACHE_LOCAL_ROLLUP_ROWS = 50_000  # Sample a worker aggregates itself when no snapshot is published
+    
+    # Backlog reclassification: hashed TF-IDF linear models trained on routing history
+    ROUTING_HISTORY_TABLE = "routed_requests"  # request_id, description, service_category, department
+    RECLASSIFICATION_TABLE = "request_classifications"
+    CLASSIFIER_MODEL_PATH = "backlog_classifier.pkl"
+    CLASSIFIER_HASH_FEATURES = 2 ** 18
+    CLASSIFIER_ALPHA = 1e-6  # SGD L2 regularization
+    CLASSIFIER_BATCH_ROWS = int(os.getenv("CLASSIFIER_BATCH_ROWS", "20000"))
+    CLASSIFIER_WORKERS = int(os.getenv("CLASSIFIER_WORKERS", str(os.cpu_count() or 1)))
+    CLASSIFIER_REVIEW_CONFIDENCE = 0.6  # Below this, a label is worth an LLM second opinion
+    
+    # Dashboard charts
+    CHART_MAX_POINTS = 1000  # Points per line after downsampling, about one per pixel
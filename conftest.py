@@ -0,0 +1,2 @@
+# test_ai.py is a live Gemini connection check run by hand, not a unit test
+collect_ignore = ["test_ai.py"]
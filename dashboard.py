@@ -7,6 +7,7 @@ from data_pipeline import DataPipeline
 from predictive_models import PredictiveModels
 from service_engine import ServicePrioritizationEngine
 from security_framework import SecurityFramework
+from metrics import PAGE_RENDER_LATENCY, start_metrics_server, timed
 
 class GovernanceDashboard:
     def __init__(self):
@@ -16,6 +17,7 @@ class GovernanceDashboard:
         
     def run(self):
         st.set_page_config(page_title="Maharashtra AI Governance", layout="wide")
+        start_metrics_server()
         
         st.title("🏛️ Maharashtra AI-Powered Governance Platform")
         st.sidebar.title("Navigation")
@@ -32,16 +34,17 @@ class GovernanceDashboard:
             "Compliance Monitor"
         ])
         
-        if page == "Executive Overview":
-            self.executive_overview()
-        elif page == "Predictive Analytics":
-            self.predictive_analytics()
-        elif page == "Service Prioritization":
-            self.service_prioritization()
-        elif page == "Citizen Insights":
-            self.citizen_insights()
-        elif page == "Compliance Monitor":
-            self.compliance_monitor()
+        with timed(PAGE_RENDER_LATENCY, dashboard="main", page=page):
+            if page == "Executive Overview":
+                self.executive_overview()
+            elif page == "Predictive Analytics":
+                self.predictive_analytics()
+            elif page == "Service Prioritization":
+                self.service_prioritization()
+            elif page == "Citizen Insights":
+                self.citizen_insights()
+            elif page == "Compliance Monitor":
+                self.compliance_monitor()
     
     def executive_overview(self):
         st.header("📊 Executive Overview")
@@ -158,7 +161,7 @@ class GovernanceDashboard:
         satisfaction = [3.8 + (i % 10) * 0.1 + (i % 3) * 0.05 for i in range(30)]
         
         fig = px.line(x=dates, y=satisfaction, title="Citizen Satisfaction Trend (30 Days)")
-        fig.update_yaxis(range=[3.5, 4.5])
+        fig.update_yaxes(range=[3.5, 4.5])
         st.plotly_chart(fig, use_container_width=True)
         
         # Service category breakdown
@@ -0,0 +1,96 @@
+import gzip
+import os
+import time
+from config import Config
+from security_framework import SecurityFramework
+
+# Output formats: file suffix and download MIME type
+FORMATS = {
+    'parquet': {'suffix': '.parquet', 'mime': 'application/vnd.apache.parquet'},
+    'csv': {'suffix': '.csv.gz', 'mime': 'application/gzip'}
+}
+
+
+class _ParquetWriter:
+    """Parquet row groups appended one batch at a time; schema from the first batch"""
+
+    def __init__(self, path):
+        # Imported here so CSV exports don't need pyarrow installed
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        if self.writer is None:
+            table = self.pa.Table.from_pandas(frame, preserve_index=False)
+            self.writer = self.pq.ParquetWriter(self.path, table.schema, compression=Config.EXPORT_PARQUET_COMPRESSION)
+        else:
+            # Later batches are cast to the first one's schema (e.g. categories seen only later)
+            table = self.pa.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CsvWriter:
+    """Gzip-compressed CSV with the header written once"""
+
+    def __init__(self, path):
+        self.file = gzip.open(path, 'wt', newline='', compresslevel=Config.EXPORT_GZIP_LEVEL)
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+WRITERS = {'parquet': _ParquetWriter, 'csv': _CsvWriter}
+
+
+def export_batches(batches, path, fmt='parquet', user_role='data_analyst', security=None):
+    """Write DataFrame batches to a compressed file, one batch at a time
+
+    Each batch is projected to the fields ``user_role`` may read and its PII
+    anonymized before it is written, so only one batch is ever in memory
+    and nothing unprojected reaches the file. The file is written under a
+    temporary name and renamed when complete; a source with no batches
+    raises ValueError. Returns a summary dict (rows, batches, fields, bytes, seconds).
+    """
+    security = security or SecurityFramework()
+    started = time.perf_counter()
+    tmp_path = path + '.tmp'
+    writer = WRITERS[fmt](tmp_path)
+    summary = {'rows': 0, 'batches': 0, 'fields': None}
+
+    try:
+        for batch in batches:
+            if summary['fields'] is None:
+                summary['fields'] = security.project_fields(user_role, list(batch.columns))
+                if not summary['fields']:
+                    raise PermissionError(f"Role {user_role} may not read any of: {', '.join(batch.columns)}")
+            batch = security.anonymize_frame(batch[summary['fields']])
+            writer.write(batch)
+            summary['rows'] += len(batch)
+            summary['batches'] += 1
+        if summary['fields'] is None:
+            raise ValueError("Nothing to export: the source returned no batches")
+    except BaseException:
+        writer.close()
+        # The Parquet file only exists once the first batch is written
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    writer.close()
+    os.replace(tmp_path, path)
+    summary['bytes'] = os.path.getsize(path)
+    summary['seconds'] = time.perf_counter() - started
+    return summary
@@ -1,7 +1,30 @@
+from google.api_core.exceptions import Conflict
 from google.cloud import bigquery
 from google.cloud import storage
 import pandas as pd
 from config import Config
+from metrics import WAREHOUSE_LATENCY, timed
+
+# Low-cardinality string columns kept as pandas categoricals
+CATEGORICAL_COLUMNS = ("district", "service_type", "infrastructure_type")
+# Calendar columns that always fit in a signed byte
+CALENDAR_COLUMNS = ("month", "day_of_week")
+
+
+def compact_frame(frame):
+    """Convert a query result to compact dtypes in place and return it"""
+    for column in frame.columns:
+        series = frame[column]
+        if column in CATEGORICAL_COLUMNS:
+            frame[column] = series.astype("category")
+        elif column in CALENDAR_COLUMNS:
+            frame[column] = series.astype("int8")
+        elif pd.api.types.is_integer_dtype(series):
+            frame[column] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            frame[column] = pd.to_numeric(series, downcast="float")
+    return frame
+
 
 class DataPipeline:
     def __init__(self):
@@ -20,8 +43,9 @@ class DataPipeline:
             try:
                 self.bq_client.create_dataset(dataset_id)
                 print(f"Created dataset: {dataset_id}")
-            except Exception as e:
-                print(f"Dataset exists or error: {e}")
+            except Conflict:
+                # AlreadyExists; any other error propagates so bootstrap reruns the step
+                print(f"Dataset exists: {dataset_id}")
     
     def load_sample_data(self):
         """Load sample governance data"""
@@ -54,13 +78,26 @@ class DataPipeline:
         try:
             self.bq_client.create_table(table)
             print(f"Created table: {table_name}")
-        except Exception as e:
-            print(f"Table exists or error: {e}")
+        except Conflict:
+            print(f"Table exists: {table_name}")
     
-    def get_training_data(self):
-        """Fetch data for ML training"""
+    def get_training_data(self, since=None):
+        """Fetch data for ML training
+
+        ``since`` (YYYY-MM-DD) limits the result to that date and later, so
+        the feature store only pulls partitions it has not seen yet.
+        """
+        date_filter = "date >= DATE_SUB(CURRENT_DATE(), INTERVAL 2 YEAR)"
+        job_config = None
+        if since:
+            date_filter += " AND date >= @since"
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[bigquery.ScalarQueryParameter("since", "DATE", since)]
+            )
+        
         query = f"""
         SELECT 
+            date,
             district,
             service_type,
             request_count,
@@ -69,6 +106,51 @@ class DataPipeline:
             EXTRACT(MONTH FROM date) as month,
             EXTRACT(DAYOFWEEK FROM date) as day_of_week
         FROM `{Config.PROJECT_ID}.{Config.DATASET_ID}.health_services`
-        WHERE date >= DATE_SUB(CURRENT_DATE(), INTERVAL 2 YEAR)
+        WHERE {date_filter}
+        """
+        with timed(WAREHOUSE_LATENCY, query="training_data"):
+            frame = self.bq_client.query(query, job_config=job_config).to_dataframe()
+        return compact_frame(frame)
+    
+    def iter_batches(self, table, columns=None, batch_size=None):
+        """Stream a governance table as DataFrames of at most ``batch_size`` rows
+
+        Pages are fetched as they are consumed, so memory holds one batch
+        rather than the whole table.
+        """
+        query = f"""
+        SELECT {', '.join(columns) if columns else '*'}
+        FROM `{Config.PROJECT_ID}.{Config.DATASET_ID}.{table}`
+        """
+        with timed(WAREHOUSE_LATENCY, query=f"{table}_export"):
+            rows = self.bq_client.query(query).result(page_size=batch_size or Config.EXPORT_BATCH_ROWS)
+        for frame in rows.to_dataframe_iterable():
+            yield compact_frame(frame)
+    
+    def append_frame(self, table, frame):
+        """Append a DataFrame to a governance table, creating it on first write"""
+        table_id = f"{Config.PROJECT_ID}.{Config.DATASET_ID}.{table}"
+        job_config = bigquery.LoadJobConfig(write_disposition=bigquery.WriteDisposition.WRITE_APPEND)
+        with timed(WAREHOUSE_LATENCY, query=f"{table}_append"):
+            self.bq_client.load_table_from_dataframe(frame, table_id, job_config=job_config).result()
+    
+    def get_month_data(self, table, month_start):
+        """One calendar month of a governance table
+
+        Used for partition-wise joins, so no query ever spans more than a
+        month of either table.
+        """
+        query = f"""
+        SELECT 
+            *,
+            EXTRACT(MONTH FROM date) as month,
+            EXTRACT(DAYOFWEEK FROM date) as day_of_week
+        FROM `{Config.PROJECT_ID}.{Config.DATASET_ID}.{table}`
+        WHERE date >= @month_start AND date < DATE_ADD(@month_start, INTERVAL 1 MONTH)
         """
-        return self.bq_client.query(query).to_dataframe()
\ No newline at end of file
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("month_start", "DATE", str(month_start))]
+        )
+        with timed(WAREHOUSE_LATENCY, query=f"{table}_month"):
+            frame = self.bq_client.query(query, job_config=job_config).to_dataframe()
+        return compact_frame(frame)
@@ -0,0 +1,160 @@
+import re
+import time
+import zlib
+from collections import defaultdict, deque
+import numpy as np
+from config import Config
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text, size=3):
+    """Word n-gram shingles of a normalized description, hashed to uint32"""
+    tokens = _TOKEN.findall(str(text).lower())
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else [""]
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return np.fromiter((zlib.crc32(g.encode()) for g in set(grams)), dtype=np.uint64)
+
+
+class MinHasher:
+    """Vectorized MinHash signatures from universal hash permutations"""
+
+    def __init__(self, num_perm=64, seed=13):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, (1 << 32) - 1, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, (1 << 32) - 1, num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_hashes):
+        # (a * x + b) mod p on uint64; x < 2^32 and a < 2^32 so no overflow past 2^64
+        hashed = (np.outer(shingle_hashes, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+class ComplaintDeduplicator:
+    """MinHash/LSH index of recent descriptions, scoped per district and window
+
+    Each description joins the most similar existing cluster that shares an
+    LSH band with it and clears the Jaccard threshold, or starts a new one.
+    Clusters expire with the time window, so a new wave starts fresh. A
+    cluster's classification lasts a fixed time from when it was made, so
+    a cluster kept alive by a steady trickle still gets reclassified.
+    """
+
+    def __init__(self, threshold=None, num_perm=64, bands=16, window_seconds=None, result_ttl_seconds=None):
+        self.threshold = Config.DEDUP_SIMILARITY_THRESHOLD if threshold is None else threshold
+        self.window = Config.DEDUP_WINDOW_SECONDS if window_seconds is None else window_seconds
+        self.result_ttl = Config.DEDUP_RESULT_TTL_SECONDS if result_ttl_seconds is None else result_ttl_seconds
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self._buckets = defaultdict(list)   # (district, band, band hash) -> cluster ids
+        self._clusters = {}                 # cluster id -> {'signature', 'district', 'seen', 'members'}
+        self._expiry = deque()              # (last seen, cluster id) in arrival order
+        self._next_id = 0
+
+    def add(self, request_id, description, district, timestamp=None):
+        """Index one description and return its cluster id"""
+        now = time.time() if timestamp is None else timestamp
+        self._expire(now)
+
+        signature = self.hasher.signature(shingles(description))
+        keys = self._band_keys(district, signature)
+
+        cluster_id = self._match(keys, signature)
+        if cluster_id is None:
+            cluster_id = self._next_id
+            self._next_id += 1
+            self._clusters[cluster_id] = {
+                'signature': signature, 'district': district, 'keys': keys, 'members': []
+            }
+            for key in keys:
+                self._buckets[key].append(cluster_id)
+
+        cluster = self._clusters[cluster_id]
+        cluster['members'].append(request_id)
+        cluster['seen'] = now
+        self._expiry.append((now, cluster_id))
+        return cluster_id
+
+    def members(self, cluster_id):
+        return list(self._clusters[cluster_id]['members'])
+
+    def result(self, cluster_id, now=None):
+        """Classification attached to a cluster within the last ``result_ttl`` seconds, if any"""
+        cluster = self._clusters[cluster_id]
+        now = time.time() if now is None else now
+        if 'result' not in cluster or now - cluster['classified_at'] > self.result_ttl:
+            return None
+        return cluster['result']
+
+    def set_result(self, cluster_id, result, now=None):
+        cluster = self._clusters[cluster_id]
+        cluster['result'] = result
+        cluster['classified_at'] = time.time() if now is None else now
+
+    def _band_keys(self, district, signature):
+        rows = self.rows_per_band
+        return [
+            (district, band, signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _match(self, keys, signature):
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_similarity = None, self.threshold
+        for cluster_id in candidates:
+            similarity = float(np.mean(self._clusters[cluster_id]['signature'] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = cluster_id, similarity
+        return best
+
+    def _expire(self, now):
+        cutoff = now - self.window
+        while self._expiry and self._expiry[0][0] < cutoff:
+            seen, cluster_id = self._expiry.popleft()
+            cluster = self._clusters.get(cluster_id)
+            # Only the cluster's latest sighting is allowed to expire it
+            if cluster is None or cluster['seen'] != seen:
+                continue
+            for key in cluster['keys']:
+                bucket = self._buckets[key]
+                bucket.remove(cluster_id)
+                if not bucket:
+                    del self._buckets[key]
+            del self._clusters[cluster_id]
+
+
+def classify_with_dedup(requests, classify, deduplicator=None):
+    """Classify a burst of requests once per near-duplicate cluster
+
+    ``requests`` are dicts with ``id``, ``description`` and ``district``
+    (optionally ``timestamp``); ``classify`` maps a description to
+    (analysis, cacheable). Only cacheable results are reused for the rest
+    of the cluster, so e.g. a keyword fallback given while the LLM was down
+    is not handed to later duplicates.
+    Returns ({request id: analysis}, number of classify calls).
+    """
+    deduplicator = deduplicator or ComplaintDeduplicator()
+    results = {}
+    calls = 0
+
+    for request in requests:
+        timestamp = request.get('timestamp')
+        cluster_id = deduplicator.add(request['id'], request['description'], request['district'], timestamp)
+        result = deduplicator.result(cluster_id, timestamp)
+        if result is None:
+            result, cacheable = classify(request['description'])
+            if cacheable:
+                deduplicator.set_result(cluster_id, result, timestamp)
+            calls += 1
+        results[request['id']] = result
+
+    return results, calls
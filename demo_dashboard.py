@@ -2,23 +2,24 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import google.generativeai as genai
 from datetime import datetime, timedelta
 import os
+import time
 from dotenv import load_dotenv
+from llm_client import LLMUnavailable, shared_client
+from metrics import PAGE_RENDER_LATENCY, start_metrics_server, timed
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 class GovernanceDashboard:
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-pro')
+        # Shared across reruns and sessions so every user draws on one quota
+        self.llm = shared_client(api_key=os.getenv("GEMINI_API_KEY"))
         
     def run(self):
         st.set_page_config(page_title="Maharashtra AI Governance", layout="wide")
+        start_metrics_server()
         
         st.title("🏛️ Maharashtra AI-Powered Governance Platform")
         st.sidebar.title("Navigation")
@@ -34,14 +35,15 @@ class GovernanceDashboard:
             "Citizen Insights"
         ])
         
-        if page == "Executive Overview":
-            self.executive_overview()
-        elif page == "AI Service Engine":
-            self.ai_service_engine()
-        elif page == "Predictive Analytics":
-            self.predictive_analytics()
-        elif page == "Citizen Insights":
-            self.citizen_insights()
+        with timed(PAGE_RENDER_LATENCY, dashboard="demo", page=page):
+            if page == "Executive Overview":
+                self.executive_overview()
+            elif page == "AI Service Engine":
+                self.ai_service_engine()
+            elif page == "Predictive Analytics":
+                self.predictive_analytics()
+            elif page == "Citizen Insights":
+                self.citizen_insights()
     
     def executive_overview(self):
         st.header("📊 Executive Overview")
@@ -80,6 +82,59 @@ class GovernanceDashboard:
             color_continuous_scale="Reds"
         )
         st.plotly_chart(fig_heatmap, use_container_width=True)
+        
+        # AI executive summary of the figures above
+        if st.button("📝 Generate Executive Summary"):
+            summary_prompt = f"""
+            Generate an executive summary for Maharashtra governance dashboard.
+            
+            Service requests by district: {dict(zip(districts, service_counts))}
+            Priority scores: {priority_data.to_dict('records')}
+            Active requests: 2,847 (+12%), average resolution: 4.2 days, satisfaction: 4.1/5
+            
+            Include:
+            - Key trends in citizen service requests
+            - Top priority areas requiring attention
+            - 3 actionable insights for decision makers
+            
+            Keep response under 200 words.
+            """
+            
+            try:
+                st.markdown("### 📝 Executive Summary")
+                self.stream_response(summary_prompt, "executive_summary")
+            except LLMUnavailable as e:
+                st.warning(f"⚠️ AI summary unavailable, please retry shortly ({e})")
+            except Exception as e:
+                st.error(f"Summary generation failed: {str(e)}")
+        else:
+            self.show_partial("executive_summary")
+    
+    def stream_response(self, prompt, feature):
+        """Stream a generation onto the page as it arrives"""
+        stream = self.llm.stream(prompt, feature=feature)
+        try:
+            st.write_stream(stream)
+        finally:
+            # A rerun can cut the stream short; keep what arrived for the next run
+            if stream.chunks and (stream.interrupted or stream.total_seconds is None):
+                st.session_state[f"partial_{feature}"] = stream.text
+            else:
+                st.session_state.pop(f"partial_{feature}", None)
+        
+        if stream.interrupted:
+            st.warning("⚠️ The response was cut off; showing the partial output")
+        if stream.first_token_seconds is not None:
+            st.caption(f"⏱️ First text after {stream.first_token_seconds * 1000:.0f} ms, "
+                       f"complete in {stream.total_seconds:.1f} s")
+        return stream
+    
+    def show_partial(self, feature):
+        """Partial output of an interrupted stream, until the feature is run again"""
+        partial = st.session_state.get(f"partial_{feature}")
+        if partial:
+            st.warning("⚠️ The last response was interrupted; partial output below")
+            st.markdown(partial)
     
     def ai_service_engine(self):
         st.header("🤖 AI-Powered Service Engine")
@@ -94,50 +149,47 @@ class GovernanceDashboard:
             if st.form_submit_button("🔍 Analyze with AI"):
                 if citizen_query:
                     with st.spinner("AI analyzing request..."):
-                        try:
-                            # Use Gemini to analyze the query
-                            prompt = f"""
-                            Analyze this citizen service request for Maharashtra government:
-                            
-                            Query: {citizen_query}
-                            District: {district}
-                            
-                            Provide analysis in this format:
-                            - Service Category: [health/infrastructure/safety/education/other]
-                            - Urgency Level: [low/medium/high/critical]
-                            - Department: [specific department name]
-                            - Estimated Resolution: [number] days
-                            - Priority Score: [1-100]
-                            - Action Required: [brief description]
-                            """
-                            
-                            response = self.model.generate_content(prompt)
-                            
+                        started = time.perf_counter()
+                        # One schema-constrained call returns analysis and routing together; it falls
+                        # back to local keyword rules itself when Gemini is unavailable
+                        analysis, missing, fallback = self.llm.analyze(citizen_query, district)
+                        latency_ms = (time.perf_counter() - started) * 1000
+                        st.session_state.setdefault("analysis_latencies_ms", []).append(latency_ms)
+                        
+                        if fallback:
+                            st.warning("⚠️ Gemini is unavailable right now; routed with local keyword rules")
+                        else:
                             st.success("✅ AI Analysis Complete!")
+                        if missing:
+                            st.warning(f"Recovered partial response; defaults used for: {', '.join(missing)}")
+                        
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
                             st.markdown("### 🎯 AI Analysis Results:")
-                            st.markdown(response.text)
-                            
-                            # Generate routing decision
-                            routing_prompt = f"""
-                            Based on this analysis: {response.text}
-                            
-                            Generate a routing decision with:
-                            1. Assigned Officer/Department
-                            2. Timeline for resolution
-                            3. Required resources
-                            4. Citizen communication message
-                            
-                            Keep it concise and actionable.
-                            """
-                            
-                            routing_response = self.model.generate_content(routing_prompt)
-                            
+                            st.json({
+                                "service_category": analysis["service_category"],
+                                "urgency_level": analysis["urgency_level"],
+                                "department": analysis["department"],
+                                "estimated_days": analysis["estimated_days"],
+                                "priority_score": analysis["priority_score"],
+                                "action_required": analysis["action_required"]
+                            })
+                        
+                        with col2:
                             st.markdown("### 📋 Routing Decision:")
-                            st.info(routing_response.text)
-                            
-                        except Exception as e:
-                            st.error(f"AI analysis failed: {str(e)}")
-                            st.info("Please check your Gemini API key in the .env file")
+                            st.json({
+                                "assigned_officer": analysis["assigned_officer"],
+                                "timeline": analysis["timeline"],
+                                "required_resources": analysis["required_resources"],
+                                "citizen_message": analysis["citizen_message"]
+                            })
+                        
+                        latencies = st.session_state["analysis_latencies_ms"]
+                        st.caption(
+                            f"⏱️ End-to-end latency: {latency_ms:.0f} ms "
+                            f"(session average {sum(latencies) / len(latencies):.0f} ms over {len(latencies)} requests)"
+                        )
         
         # Recent AI-processed requests
         st.subheader("📊 Recent AI-Processed Requests")
@@ -182,9 +234,8 @@ class GovernanceDashboard:
             """
             
             try:
-                response = self.model.generate_content(prediction_prompt)
+                self.stream_response(prediction_prompt, "demand_prediction")
                 st.success("🤖 AI Prediction Generated!")
-                st.markdown(response.text)
                 
                 # Generate forecast chart
                 dates = pd.date_range(start=datetime.now(), periods=30, freq='D')
@@ -197,8 +248,12 @@ class GovernanceDashboard:
                 fig.update_layout(title=f"30-Day Demand Forecast: {service_type} in {district}")
                 st.plotly_chart(fig, use_container_width=True)
                 
+            except LLMUnavailable as e:
+                st.warning(f"⚠️ AI prediction unavailable, please retry shortly ({e})")
             except Exception as e:
                 st.error(f"Prediction failed: {str(e)}")
+        else:
+            self.show_partial("demand_prediction")
     
     def citizen_insights(self):
         st.header("👥 Citizen Insights")
@@ -208,7 +263,7 @@ class GovernanceDashboard:
         satisfaction = [3.8 + (i % 10) * 0.1 + (i % 3) * 0.05 for i in range(30)]
         
         fig = px.line(x=dates, y=satisfaction, title="Citizen Satisfaction Trend (30 Days)")
-        fig.update_yaxis(range=[3.5, 4.5])
+        fig.update_yaxes(range=[3.5, 4.5])
         st.plotly_chart(fig, use_container_width=True)
         
         # Service category breakdown
@@ -235,11 +290,15 @@ class GovernanceDashboard:
             """
             
             try:
-                response = self.model.generate_content(insights_prompt)
                 st.markdown("### 🎯 AI-Generated Insights:")
-                st.info(response.text)
+                with st.container(border=True):
+                    self.stream_response(insights_prompt, "citizen_insights")
+            except LLMUnavailable as e:
+                st.warning(f"⚠️ AI insights unavailable, please retry shortly ({e})")
             except Exception as e:
                 st.error(f"Insights generation failed: {str(e)}")
+        else:
+            self.show_partial("citizen_insights")
 
 if __name__ == "__main__":
     dashboard = GovernanceDashboard()
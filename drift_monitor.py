@@ -0,0 +1,196 @@
+import json
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import Config
+from feature_store import FEATURES, TARGET
+from streaming_stats import Histogram, RunningMoments
+
+# Monitored columns: the demand target and its continuous input feature
+MONITORED = [TARGET, 'resolution_time']
+OVERALL = '__all__'  # Key for the statewide statistics next to the per-district ones
+
+
+def population_stability(reference, current):
+    """Population stability index of two histograms over the same bins
+
+    Under 0.1 is stable, 0.1-0.25 a moderate shift, above 0.25 a major one.
+    """
+    expected = np.maximum(reference.proportions(), 1e-4)
+    actual = np.maximum(current.proportions(), 1e-4)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def store_frame(store):
+    """The feature store's training rows as district names and monitored columns"""
+    X, y = store.load()
+    districts = np.asarray(store.vocabularies.get('district', []), dtype=object)
+    return {
+        'district': districts[X[:, FEATURES.index('district_encoded')].astype(np.int64)] if len(X) else [],
+        TARGET: y,
+        'resolution_time': X[:, FEATURES.index('resolution_time')]
+    }
+
+
+class DriftMonitor:
+    """Streaming drift detection against the distribution the model was trained on
+
+    ``snapshot`` records Welford moments and quantile-binned histograms of
+    each monitored column, statewide and per district, at training time.
+    ``observe`` folds newly ingested rows into the same statistics, over the
+    snapshot's bin edges; ``save`` persists both, so drift accumulates across
+    runs until the next retrain resets it. Only summaries are kept, never rows.
+    The newest partition date seen is kept too, so a day ingested again (the
+    feature store re-reads the latest one) is not counted twice.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Config.FEATURE_STORE_DIR, 'drift_monitor.json')
+        self.reference = {}
+        self.current = {}
+        self.trained_at = None
+        self.observed_through = None  # Newest partition (YYYY-MM-DD) already folded in
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        self.trained_at = state.get('trained_at')
+        self.observed_through = state.get('observed_through')
+        self.reference = self._decode(state.get('reference', {}))
+        self.current = self._decode(state.get('current', {}))
+
+    def save(self):
+        # Write-then-rename, as the feature store does for its manifest
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'trained_at': self.trained_at, 'observed_through': self.observed_through,
+                       'reference': self._encode(self.reference),
+                       'current': self._encode(self.current)}, f)
+        os.replace(tmp_path, self.path)
+
+    def snapshot(self, data, through=None):
+        """Record the training distribution and reset the incoming statistics
+
+        ``through`` is the newest partition date in the training data.
+        """
+        self.reference = {}
+        for column in MONITORED:
+            for district, values in self._groups(data, column):
+                self.reference.setdefault(column, {})[district] = {
+                    'moments': self._moments(values),
+                    'histogram': Histogram.from_quantiles(values, Config.DRIFT_HISTOGRAM_BINS)
+                }
+        self.current = {}
+        self.observed_through = through
+        self.trained_at = datetime.now().isoformat()
+
+    def observe(self, data):
+        """Fold newly ingested rows (district plus monitored columns) into the stream
+
+        Rows with a ``date`` on or before the newest partition already
+        observed are skipped.
+        """
+        if 'date' in data and len(data['date']):
+            dates = pd.to_datetime(pd.Series(data['date'])).dt.strftime('%Y-%m-%d').to_numpy()
+            if self.observed_through is not None:
+                newer = dates > self.observed_through
+                data = {key: np.asarray(data[key])[newer] for key in ('district', *MONITORED)}
+                dates = dates[newer]
+            if len(dates):
+                self.observed_through = str(dates.max())
+        for column in MONITORED:
+            for district, values in self._groups(data, column):
+                stats = self.current.setdefault(column, {}).get(district)
+                if stats is None:
+                    reference = self.reference.get(column, {}).get(district)
+                    # Districts the model never saw are binned on the statewide edges
+                    binned = (reference or self.reference.get(column, {}).get(OVERALL) or {}).get('histogram')
+                    stats = self.current[column][district] = {
+                        'moments': RunningMoments(),
+                        'histogram': Histogram(binned.edges if binned else [])
+                    }
+                stats['moments'].update(values)
+                stats['histogram'].update(values)
+
+    def report(self):
+        """Drift per (column, district) with enough new rows to judge
+
+        Each entry has the population stability index and the mean shift in
+        training standard deviations.
+        """
+        rows = []
+        for column, districts in self.current.items():
+            for district, stats in districts.items():
+                if stats['moments'].count < Config.DRIFT_MIN_SAMPLES:
+                    continue
+                reference = self.reference.get(column, {}).get(district)
+                if reference is None:
+                    rows.append({'column': column, 'district': district, 'samples': stats['moments'].count,
+                                 'psi': None, 'mean_shift': None, 'drifted': True})
+                    continue
+                std = reference['moments'].std or 1.0
+                psi = population_stability(reference['histogram'], stats['histogram'])
+                shift = abs(stats['moments'].mean - reference['moments'].mean) / std
+                rows.append({
+                    'column': column, 'district': district, 'samples': stats['moments'].count,
+                    'psi': psi, 'mean_shift': shift,
+                    'drifted': psi > Config.DRIFT_PSI_THRESHOLD or shift > Config.DRIFT_MEAN_SHIFT
+                })
+        return rows
+
+    def should_retrain(self):
+        """(retrain, reasons): retrain with no snapshot yet or when any monitored slice drifted"""
+        if not self.reference:
+            return True, ["no training snapshot"]
+        reasons = []
+        for row in self.report():
+            if not row['drifted']:
+                continue
+            where = 'statewide' if row['district'] == OVERALL else row['district']
+            if row['psi'] is None:
+                reasons.append(f"{row['column']} in {where}: district not in training data")
+            else:
+                reasons.append(f"{row['column']} in {where}: PSI {row['psi']:.2f}, "
+                               f"mean shift {row['mean_shift']:.2f} sd")
+        return bool(reasons), reasons
+
+    @staticmethod
+    def _groups(data, column):
+        values = np.asarray(data[column], dtype=np.float64)
+        districts = np.asarray(data['district'], dtype=object).astype(str)
+        yield OVERALL, values
+        if len(values):
+            names, inverse = np.unique(districts, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.cumsum(np.bincount(inverse, minlength=len(names)))[:-1]
+            for name, rows in zip(names, np.split(order, bounds)):
+                yield name, values[rows]
+
+    @staticmethod
+    def _moments(values):
+        moments = RunningMoments()
+        moments.update(values)
+        return moments
+
+    @staticmethod
+    def _encode(stats):
+        return {
+            column: {district: {'moments': entry['moments'].to_dict(), 'histogram': entry['histogram'].to_dict()}
+                     for district, entry in districts.items()}
+            for column, districts in stats.items()
+        }
+
+    @staticmethod
+    def _decode(state):
+        return {
+            column: {district: {'moments': RunningMoments.from_dict(entry['moments']),
+                                'histogram': Histogram.from_dict(entry['histogram'])}
+                     for district, entry in districts.items()}
+            for column, districts in state.items()
+        }
@@ -0,0 +1,121 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+
+FEATURES = ['district_encoded', 'service_encoded', 'month', 'day_of_week', 'resolution_time']
+TARGET = 'request_count'
+
+
+def encode_categories(values, vocabulary):
+    """Category codes for a string column against an append-only vocabulary
+
+    Unseen values are appended to ``vocabulary`` in place, so codes already
+    handed out never change.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+
+    known = set(vocabulary)
+    vocabulary.extend(sorted(c for c in values.cat.categories if c not in known))
+
+    # Re-coding against the vocabulary only touches the integer codes
+    return values.cat.set_categories(vocabulary).cat.codes
+
+
+def build_demand_features(data, vocabularies):
+    """Engineered feature matrix for the demand predictor"""
+    return pd.DataFrame({
+        'district_encoded': encode_categories(data['district'], vocabularies.setdefault('district', [])),
+        'service_encoded': encode_categories(data['service_type'], vocabularies.setdefault('service', [])),
+        'month': data['month'].astype('int8'),
+        'day_of_week': data['day_of_week'].astype('int8'),
+        'resolution_time': data['resolution_time'].astype('float32')
+    })[FEATURES]
+
+
+class FeatureStore:
+    """Engineered demand features persisted per date partition"""
+
+    def __init__(self, root=None):
+        self.root = root or Config.FEATURE_STORE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self.manifest_path = os.path.join(self.root, 'manifest.json')
+        self.vocabularies = {}
+        self.partitions = {}
+        self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        self.vocabularies = manifest.get('vocabularies', {})
+        self.partitions = manifest.get('partitions', {})
+
+    def _save_manifest(self):
+        # Write-then-rename so a crash never leaves a half-written manifest
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'vocabularies': self.vocabularies, 'partitions': self.partitions}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def latest_partition(self):
+        """Most recent stored partition date (YYYY-MM-DD), or None"""
+        return max(self.partitions) if self.partitions else None
+
+    def append(self, data):
+        """Engineer features for the given rows and store them by date
+
+        Partitions present in ``data`` replace any stored version, so the
+        newest (possibly still filling) day can be refreshed in place.
+        Returns the partition keys that were written.
+        """
+        if data.empty:
+            return []
+
+        # Engineer the whole batch once, then split the matrix by date
+        X = build_demand_features(data, self.vocabularies).to_numpy(dtype=np.float32)
+        y = data[TARGET].to_numpy(dtype=np.float32)
+        dates = pd.to_datetime(data['date']).dt.strftime('%Y-%m-%d').to_numpy()
+        written = []
+
+        for partition, rows in sorted(pd.Series(dates).groupby(dates).indices.items()):
+            path = os.path.join(self.root, f"{partition}.npz")
+            with open(path + '.tmp', 'wb') as f:
+                np.savez(f, X=X[rows], y=y[rows])
+            os.replace(path + '.tmp', path)
+
+            self.partitions[partition] = {'rows': len(rows)}
+            written.append(partition)
+
+        self._save_manifest()
+        return written
+
+    def prune(self, before):
+        """Drop partitions older than the given YYYY-MM-DD date"""
+        expired = [p for p in self.partitions if p < before]
+        for partition in expired:
+            self.partitions.pop(partition)
+            try:
+                os.remove(os.path.join(self.root, f"{partition}.npz"))
+            except FileNotFoundError:
+                pass
+        if expired:
+            self._save_manifest()
+        return expired
+
+    def load(self):
+        """Concatenate every stored partition into (X, y)"""
+        if not self.partitions:
+            return np.empty((0, len(FEATURES)), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        matrices, targets = [], []
+        for partition in sorted(self.partitions):
+            with np.load(os.path.join(self.root, f"{partition}.npz")) as stored:
+                matrices.append(stored['X'])
+                targets.append(stored['y'])
+
+        return np.concatenate(matrices), np.concatenate(targets)
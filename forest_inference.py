@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class FlatForest:
+    """Random forest flattened into contiguous node arrays
+
+    Every tree's nodes are concatenated into one set of arrays, and leaves
+    point back at themselves, so a single vectorized step advances every
+    (row, tree) pair at once. This skips sklearn's per-call input
+    validation and per-tree dispatch, which dominate small-batch latency.
+    """
+
+    # Rows traversed per chunk; bounds the (rows x trees) working arrays
+    CHUNK_ROWS = 8192
+    # Traversal steps between compactions of the active (row, tree) pairs
+    COMPACT_EVERY = 4
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Export a fitted RandomForestRegressor (single output)"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop to themselves, so extra traversal steps are no-ops
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int64),
+            threshold=_float32_thresholds(np.concatenate(thresholds)),
+            left=np.concatenate(lefts).astype(np.int64),
+            right=np.concatenate(rights).astype(np.int64),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int64),
+            depth=depth,
+            n_features=forest.n_features_in_
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def predict(self, X):
+        """Mean leaf value across trees; matches sklearn's predict"""
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32).reshape(-1, self.n_features))
+        predictions = np.empty(len(X), dtype=np.float64)
+
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            chunk = X[start:start + self.CHUNK_ROWS]
+            predictions[start:start + len(chunk)] = self._predict_chunk(chunk)
+
+        return predictions
+
+    def _predict_chunk(self, X):
+        flat_X = X.ravel()
+        n_rows = len(X)
+
+        # Tree-major pair order keeps consecutive lookups inside one tree
+        pairs = np.arange(n_rows * self.n_trees, dtype=np.int64)
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows, dtype=np.int64) * self.n_features, self.n_trees)
+        leaves = np.empty_like(nodes)
+
+        for step in range(self.depth + 1):
+            # Periodically drop pairs that reached a leaf so later steps shrink
+            if step % self.COMPACT_EVERY == 0 or step == self.depth:
+                done = self.is_leaf[nodes]
+                if done.any():
+                    leaves[pairs[done]] = nodes[done]
+                    keep = ~done
+                    pairs, nodes, row_offsets = pairs[keep], nodes[keep], row_offsets[keep]
+                if not len(pairs):
+                    break
+
+            go_left = flat_X[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[leaves].reshape(self.n_trees, n_rows).mean(axis=0)
+
+
+def _float32_thresholds(thresholds):
+    """Round float64 split thresholds down to float32 without changing splits
+
+    sklearn tests ``float32(x) <= float64(t)``. For a float32 x that holds
+    exactly when x is <= the largest float32 not above t, so comparing in
+    float32 against that value gives identical branch decisions.
+    """
+    rounded = thresholds.astype(np.float32)
+    too_high = rounded.astype(np.float64) > thresholds
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
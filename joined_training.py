@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import numpy as np
+import pandas as pd
+from config import Config
+from feature_store import encode_categories
+
+# Service families: source table, type column (and its vocabulary) and demand target
+FAMILIES = {
+    'health': {'table': 'health_services', 'type': 'service_type', 'vocabulary': 'service',
+               'target': 'request_count'},
+    'infrastructure': {'table': 'infrastructure_services', 'type': 'infrastructure_type',
+                       'vocabulary': 'infrastructure', 'target': 'maintenance_requests'},
+}
+
+JOINED_FEATURES = [
+    'family', 'district_encoded', 'type_encoded', 'month', 'day_of_week',
+    # Row-level measures; zero on the other family's rows
+    'resolution_time', 'priority_score', 'budget_allocated', 'completion_rate',
+    # District-day context joined from each table
+    'health_requests', 'health_resolution_time', 'infra_requests', 'infra_budget', 'infra_completion_rate'
+]
+COLUMN = {name: index for index, name in enumerate(JOINED_FEATURES)}
+
+# A family's model never sees its own district-day totals, which contain its target
+FAMILY_FEATURES = {
+    'health': ['district_encoded', 'type_encoded', 'month', 'day_of_week', 'resolution_time',
+               'priority_score', 'infra_requests', 'infra_budget', 'infra_completion_rate'],
+    'infrastructure': ['district_encoded', 'type_encoded', 'month', 'day_of_week', 'budget_allocated',
+                       'completion_rate', 'health_requests', 'health_resolution_time'],
+}
+
+
+def month_starts(days):
+    """First day of every calendar month overlapping the last ``days`` days"""
+    start = pd.Timestamp(date.today()) - pd.Timedelta(days=days)
+    return [month.date() for month in pd.date_range(start.replace(day=1), date.today(), freq='MS')]
+
+
+def join_month(health, infra):
+    """Join one month of both tables on district and date
+
+    Each side is first reduced to district-day totals (the hash-join build
+    side, one row per key) and every row of the other side probes it. The
+    result has one row per source row, never the rows-times-rows product
+    a direct join on (district, date) would produce.
+    Returns ({family: (X, y, type categories)}, district categories) with
+    codes local to this month.
+    """
+    districts = sorted(set(health['district'].astype(str)) | set(infra['district'].astype(str)))
+    health_keys = _day_keys(health, districts)
+    infra_keys = _day_keys(infra, districts)
+
+    health_totals = _district_day_totals(health_keys, {
+        'requests': health['request_count'], 'resolution_time': health['resolution_time']
+    })
+    infra_totals = _district_day_totals(infra_keys, {
+        'requests': infra['maintenance_requests'], 'budget': infra['budget_allocated'],
+        'completion_rate': infra['completion_rate']
+    })
+
+    blocks = {}
+    for family, frame, keys in (('health', health, health_keys), ('infrastructure', infra, infra_keys)):
+        spec = FAMILIES[family]
+        types = pd.Categorical(frame[spec['type']].astype(str))
+        X = np.zeros((len(frame), len(JOINED_FEATURES)), dtype=np.float32)
+
+        X[:, COLUMN['family']] = list(FAMILIES).index(family)
+        X[:, COLUMN['district_encoded']] = pd.Categorical(frame['district'].astype(str), categories=districts).codes
+        X[:, COLUMN['type_encoded']] = types.codes
+        X[:, COLUMN['month']] = frame['month']
+        X[:, COLUMN['day_of_week']] = frame['day_of_week']
+        if family == 'health':
+            X[:, COLUMN['resolution_time']] = frame['resolution_time']
+            X[:, COLUMN['priority_score']] = frame['priority_score']
+        else:
+            X[:, COLUMN['budget_allocated']] = frame['budget_allocated']
+            X[:, COLUMN['completion_rate']] = frame['completion_rate']
+
+        _probe(X, keys, health_totals, {'requests': 'health_requests', 'resolution_time': 'health_resolution_time'},
+               means=('resolution_time',))
+        _probe(X, keys, infra_totals, {'requests': 'infra_requests', 'budget': 'infra_budget',
+                                       'completion_rate': 'infra_completion_rate'}, means=('completion_rate',))
+
+        y = frame[spec['target']].to_numpy(dtype=np.float32)
+        blocks[family] = (X, y, list(types.categories))
+
+    return blocks, districts
+
+
+def _day_keys(frame, districts):
+    days = pd.to_datetime(frame['date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+    codes = pd.Categorical(frame['district'].astype(str), categories=districts).codes.astype(np.int64)
+    return days * len(districts) + codes
+
+
+def _district_day_totals(keys, columns):
+    """Hash table of district-day keys with per-key row counts and sums"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique))
+    sums = {
+        name: np.bincount(inverse, weights=values.to_numpy(dtype=np.float64), minlength=len(unique))
+        for name, values in columns.items()
+    }
+    return pd.Index(unique), counts, sums
+
+
+def _probe(X, keys, totals, columns, means=()):
+    index, counts, sums = totals
+    rows = index.get_indexer(keys)
+    matched = rows >= 0
+    for name, column in columns.items():
+        values = sums[name][rows[matched]]
+        if name in means:
+            values = values / counts[rows[matched]]
+        X[matched, COLUMN[column]] = values
+
+
+class JoinedTrainingBuilder:
+    """Health and infrastructure training matrix built month by month
+
+    Months are fetched and joined in parallel; each month's raw frames are
+    dropped as soon as its block is built. Blocks carry month-local codes
+    and are re-coded against the shared append-only vocabularies in month
+    order, so the codes are deterministic whatever order months finish in.
+    """
+
+    def __init__(self, pipeline, vocabularies=None, workers=None):
+        self.pipeline = pipeline
+        self.vocabularies = vocabularies if vocabularies is not None else {}
+        self.workers = workers or Config.TRAINING_JOIN_WORKERS
+
+    def build(self, months):
+        """Family-major (X, y) over the given month start dates"""
+        with ThreadPoolExecutor(self.workers) as pool:
+            blocks = list(pool.map(self._build_month, months))
+
+        matrices, targets = [], []
+        for family, spec in FAMILIES.items():
+            for family_blocks, districts in blocks:
+                X, y, types = family_blocks[family]
+                self._recode(X, 'district_encoded', districts, 'district')
+                self._recode(X, 'type_encoded', types, spec['vocabulary'])
+                matrices.append(X)
+                targets.append(y)
+
+        if not matrices:
+            return np.empty((0, len(JOINED_FEATURES)), dtype=np.float32), np.empty(0, dtype=np.float32)
+        return np.concatenate(matrices), np.concatenate(targets)
+
+    def _build_month(self, month):
+        health = self.pipeline.get_month_data(FAMILIES['health']['table'], month)
+        infra = self.pipeline.get_month_data(FAMILIES['infrastructure']['table'], month)
+        return join_month(health, infra)
+
+    def _recode(self, X, column, local_categories, vocabulary):
+        if not len(X):
+            return
+        global_codes = encode_categories(
+            pd.Series(local_categories, dtype='category'), self.vocabularies.setdefault(vocabulary, [])
+        ).to_numpy()
+        X[:, COLUMN[column]] = global_codes[X[:, COLUMN[column]].astype(np.int64)]
@@ -0,0 +1,384 @@
+import random
+import threading
+import time
+from config import Config
+from metrics import (
+    LLM_CIRCUIT_OPEN, LLM_CONCURRENCY_LIMIT, LLM_ERRORS, LLM_FALLBACKS, LLM_FIRST_TOKEN, LLM_LATENCY, LLM_RETRIES,
+    timed
+)
+from llm_providers import create_provider
+from query_analysis import ANALYSIS_GENERATION_CONFIG, build_analysis_prompt, keyword_analysis, parse_analysis
+
+THROTTLED = 429
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailable(RuntimeError):
+    """The call was rejected by the circuit breaker, timed out waiting, or ran out of retries"""
+
+
+def error_status(error):
+    """HTTP status of an API error, if it carries one
+
+    google.api_core exceptions expose the status as an int ``code``; older
+    client versions only mention it in the message.
+    """
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    message = str(error)
+    for status in RETRYABLE_STATUSES:
+        if message.startswith(str(status)):
+            return status
+    if "quota" in message.lower() or "rate limit" in message.lower():
+        return THROTTLED
+    return None
+
+
+class TokenBucket:
+    """Requests per second with bursts of up to ``capacity``
+
+    The configured rate is a ceiling: slow_down() and speed_up() let the
+    client move the effective rate with the quota it actually gets.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to ``timeout`` seconds; False if none came free"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def slow_down(self, factor=0.5):
+        with self._lock:
+            self.rate = max(self.max_rate / 16, self.rate * factor)
+
+    def speed_up(self):
+        # About +1 request/second for every second of successful traffic
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD cap on in-flight calls
+
+    Each success adds 1/limit (about +1 per limit's worth of calls); a
+    throttled call halves the limit. Calls that started before the last
+    cut cannot cut again, so one burst of 429s halves the limit once.
+    release() returns True when it made a cut.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, backoff=0.5):
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.backoff = backoff
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.epoch = 0
+        self._condition = threading.Condition()
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot; returns the epoch to hand back to release(), or None"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return None
+            self.in_flight += 1
+            return self.epoch
+
+    def release(self, epoch, throttled=False):
+        with self._condition:
+            self.in_flight -= 1
+            cut = throttled and epoch == self.epoch
+            if cut:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self.epoch += 1
+            elif not throttled:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            LLM_CONCURRENCY_LIMIT.set(self.limit)
+            self._condition.notify_all()
+        return cut
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures, then lets one probe call through"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """The state the call goes through under (CLOSED, or HALF_OPEN for the probe), or None if rejected"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return self.CLOSED
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                # This caller becomes the probe; everyone else keeps failing fast
+                self.state = self.HALF_OPEN
+                return self.HALF_OPEN
+            return None
+
+    def abandon_probe(self):
+        """The probe ended without an upstream result (e.g. it timed out waiting
+        for a local slot): reopen without restarting the timer, so the next call probes"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+        LLM_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                LLM_CIRCUIT_OPEN.set(1)
+
+
+class LLMClient:
+    """Rate-limited, self-throttling and retrying wrapper around an LLM provider
+
+    Every call takes a token from the bucket and a slot from the adaptive
+    concurrency limit; a 429 halves both, successes grow them back. Throttling
+    and server errors are retried with full-jitter exponential backoff, and
+    every outcome feeds the circuit breaker. When the breaker is
+    open, calls fail fast with LLMUnavailable so callers can fall back.
+    """
+
+    def __init__(self, model, rate=None, burst=None, max_concurrency=None, max_retries=None,
+                 retry_base_seconds=None, retry_max_seconds=None, failure_threshold=None,
+                 reset_seconds=None, wait_timeout=None):
+        self.model = model
+        self.bucket = TokenBucket(rate or Config.LLM_RATE_PER_SECOND, burst or Config.LLM_BURST)
+        self.limiter = AdaptiveConcurrencyLimit(max_concurrency or Config.LLM_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker(
+            failure_threshold or Config.LLM_CIRCUIT_FAILURES,
+            Config.LLM_CIRCUIT_RESET_SECONDS if reset_seconds is None else reset_seconds
+        )
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_base_seconds = Config.LLM_RETRY_BASE_SECONDS if retry_base_seconds is None else retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds or Config.LLM_RETRY_MAX_SECONDS
+        self.wait_timeout = wait_timeout or Config.LLM_WAIT_TIMEOUT_SECONDS
+
+    def generate(self, prompt, feature="default", **kwargs):
+        """``model.generate_content`` under the limits; raises LLMUnavailable"""
+        admitted = self.breaker.allow()
+        if not admitted:
+            raise LLMUnavailable("LLM circuit breaker is open")
+
+        try:
+            attempt = 0
+            while True:
+                epoch = self._acquire()
+                error = None
+                try:
+                    with timed(LLM_LATENCY, feature=feature):
+                        response = self.model.generate_content(prompt, **kwargs)
+                except Exception as e:
+                    error = e
+                finally:
+                    self._release(epoch, error)
+
+                if error is None:
+                    self._succeeded()
+                    return response
+                attempt = self._retry_or_raise(error, feature, attempt)
+        finally:
+            if admitted == CircuitBreaker.HALF_OPEN:
+                # No-op once the probe recorded an outcome
+                self.breaker.abandon_probe()
+
+    def stream(self, prompt, feature="default", on_complete=None, **kwargs):
+        """Streaming ``generate_content``; returns a TextStream of text chunks"""
+        return TextStream(self, prompt, feature, kwargs, on_complete)
+
+    def analyze(self, query_text, district=None, feature="query_analysis"):
+        """Structured analysis of a citizen query, falling back to keyword rules
+
+        Returns (analysis, missing, fallback) where fallback is True when the
+        local keyword classifier answered instead of the LLM.
+        """
+        try:
+            response = self.generate(
+                build_analysis_prompt(query_text, district), feature=feature,
+                generation_config=ANALYSIS_GENERATION_CONFIG
+            )
+            analysis, missing = parse_analysis(response.text)
+            return analysis, missing, False
+        except (LLMUnavailable, ValueError):
+            # ValueError: the response was blocked and has no text
+            LLM_FALLBACKS.labels(feature=feature).inc()
+            return keyword_analysis(query_text), [], True
+
+    def _stream(self, stream):
+        admitted = self.breaker.allow()
+        if not admitted:
+            raise LLMUnavailable("LLM circuit breaker is open")
+
+        try:
+            started = time.perf_counter()
+            attempt = 0
+            while True:
+                epoch = self._acquire()
+                error = None
+                try:
+                    for chunk in self.model.generate_content(stream.prompt, stream=True, **stream.kwargs):
+                        text = _chunk_text(chunk)
+                        if not text:
+                            continue
+                        if not stream.chunks:
+                            stream.first_token_seconds = time.perf_counter() - started
+                            LLM_FIRST_TOKEN.labels(feature=stream.feature).observe(stream.first_token_seconds)
+                        stream.chunks.append(text)
+                        yield text
+                except GeneratorExit:
+                    # The reader went away, e.g. the Streamlit script was rerun mid-stream
+                    stream.interrupted = True
+                    raise
+                except Exception as e:
+                    error = e
+                finally:
+                    self._release(epoch, error)
+
+                if error is None:
+                    break
+                if stream.chunks:
+                    # Text is already on screen; keep it rather than retry and repeat it
+                    LLM_ERRORS.labels(feature=stream.feature).inc()
+                    self.breaker.record_failure()
+                    stream.interrupted = True
+                    stream.error = error
+                    break
+                attempt = self._retry_or_raise(error, stream.feature, attempt)
+
+            stream.total_seconds = time.perf_counter() - started
+            LLM_LATENCY.labels(feature=stream.feature).observe(stream.total_seconds)
+            if not stream.interrupted:
+                self._succeeded()
+                if stream.on_complete:
+                    stream.on_complete(stream.text)
+        finally:
+            if admitted == CircuitBreaker.HALF_OPEN:
+                self.breaker.abandon_probe()
+
+    def _acquire(self):
+        if not self.bucket.acquire(self.wait_timeout):
+            raise LLMUnavailable("Timed out waiting for the LLM rate limit")
+        epoch = self.limiter.acquire(self.wait_timeout)
+        if epoch is None:
+            raise LLMUnavailable("Timed out waiting for an LLM concurrency slot")
+        return epoch
+
+    def _release(self, epoch, error):
+        throttled = error is not None and error_status(error) == THROTTLED
+        if self.limiter.release(epoch, throttled):
+            self.bucket.slow_down()
+
+    def _succeeded(self):
+        self.bucket.speed_up()
+        self.breaker.record_success()
+
+    def _retry_or_raise(self, error, feature, attempt):
+        """Sleep before the next attempt and return its number, or give up"""
+        LLM_ERRORS.labels(feature=feature).inc()
+        if error_status(error) in RETRYABLE_STATUSES and attempt < self.max_retries:
+            LLM_RETRIES.labels(feature=feature).inc()
+            time.sleep(self._backoff(attempt + 1))
+            return attempt + 1
+        self.breaker.record_failure()
+        raise LLMUnavailable(f"{feature} failed after {attempt + 1} attempts: {error}") from error
+
+    def _backoff(self, attempt):
+        # Full jitter keeps retrying callers from synchronizing
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempt - 1)))
+
+
+class TextStream:
+    """Text chunks of one streaming generation, as they arrive
+
+    Iterate it (or hand it to ``st.write_stream``) to run the call. If the
+    stream breaks after some text has arrived, iteration just ends with
+    ``interrupted`` set and the partial output kept in ``text``; a failure
+    before any text raises LLMUnavailable like ``generate`` does.
+    """
+
+    def __init__(self, client, prompt, feature, kwargs, on_complete=None):
+        self.client = client
+        self.prompt = prompt
+        self.feature = feature
+        self.kwargs = kwargs
+        self.on_complete = on_complete
+        self.chunks = []
+        self.interrupted = False
+        self.error = None
+        self.first_token_seconds = None
+        self.total_seconds = None
+
+    def __iter__(self):
+        return self.client._stream(self)
+
+    @property
+    def text(self):
+        return "".join(self.chunks)
+
+
+def _chunk_text(chunk):
+    try:
+        return chunk.text
+    except ValueError:
+        # Chunks without text parts, e.g. a final chunk carrying only the finish reason
+        return ""
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(model_name=None, api_key=None):
+    """Process-wide client per model, so every caller shares one quota
+
+    The backend comes from ``Config.LLM_PROVIDER`` and the Gemini model
+    defaults to ``Config.GEMINI_MODEL``. The Gemini SDK holds one API key
+    per process, so asking for a model's client with a different key than
+    it was created with raises ValueError; ``api_key=None`` reuses it as is.
+    """
+    model_name = model_name or Config.GEMINI_MODEL
+    with _clients_lock:
+        entry = _clients.get(model_name)
+        if entry is None:
+            entry = _clients[model_name] = (
+                LLMClient(create_provider(model_name=model_name, api_key=api_key)), api_key
+            )
+        elif api_key is not None and api_key != entry[1]:
+            raise ValueError(f"The shared {model_name} client was created with a different API key")
+        return entry[0]
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from config import Config
+from query_analysis import keyword_analysis
+
+_QUERY_LINE = re.compile(r"^\s*Query:\s*(.*)$", re.MULTILINE)
+_BULLET = re.compile(r"^\s*(?:-|\d+\.)\s+(.+)$", re.MULTILINE)
+
+
+class LLMResponse:
+    """Response or stream chunk with the ``.text`` attribute callers read"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class LLMProvider(ABC):
+    """Backend behind LLMClient: anything with Gemini's ``generate_content``
+
+    ``generate_content(prompt, stream=False, **kwargs)`` returns an object
+    with ``.text``, or with ``stream=True`` an iterable of such chunks.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def generate_content(self, prompt, stream=False, **kwargs):
+        """Response with ``.text``, or with ``stream=True`` an iterable of chunks"""
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google-generativeai"""
+
+    name = "gemini"
+
+    def __init__(self, model_name=None, api_key=None):
+        # Imported here so offline runs don't need the SDK installed
+        import google.generativeai as genai
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name or Config.GEMINI_MODEL)
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        return self.model.generate_content(prompt, stream=stream, **kwargs)
+
+
+class LocalProvider(LLMProvider):
+    """Deterministic offline backend with simulated latency
+
+    Replays recorded responses when ``replay_path`` has one for the prompt,
+    otherwise answers from rules: structured analysis requests get the
+    keyword classifier's JSON, free-text requests a templated answer.
+    ``latency_ms`` is the wait before the first (or only) chunk; streams
+    then emit one word every ``1 / words_per_second`` seconds.
+    """
+
+    name = "local"
+
+    def __init__(self, latency_ms=None, words_per_second=None, replay_path=None):
+        self.latency_ms = Config.LLM_LOCAL_LATENCY_MS if latency_ms is None else latency_ms
+        self.words_per_second = words_per_second
+        self.replay = _load_replay(replay_path or Config.LLM_REPLAY_PATH)
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        text = self.replay.get(prompt_key(prompt))
+        if text is None:
+            text = self._rule_response(prompt, generation_config)
+
+        if stream:
+            return self._stream(text)
+        self._sleep(self.latency_ms / 1000)
+        return LLMResponse(text)
+
+    def _stream(self, text):
+        self._sleep(self.latency_ms / 1000)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if i and self.words_per_second:
+                self._sleep(1 / self.words_per_second)
+            yield LLMResponse(word if i == len(words) - 1 else word + " ")
+
+    def _rule_response(self, prompt, generation_config):
+        query = _QUERY_LINE.search(prompt)
+        if generation_config and generation_config.get("response_mime_type") == "application/json":
+            return json.dumps(keyword_analysis(query.group(1) if query else prompt))
+
+        topics = [topic.strip() for topic in _BULLET.findall(prompt)] or ["Summary"]
+        lines = ["**Offline response** (local rule-based backend)", ""]
+        for topic in topics:
+            lines.append(f"- **{topic}**: no live model is configured; review the figures above for this item.")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _sleep(seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class RecordingProvider(LLMProvider):
+    """Wraps a provider and appends every non-streamed response to a replay file"""
+
+    def __init__(self, provider, path):
+        self.provider = provider
+        self.name = provider.name
+        self.path = path
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        if stream:
+            return self.provider.generate_content(prompt, stream=True, **kwargs)
+        response = self.provider.generate_content(prompt, **kwargs)
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps({"key": prompt_key(prompt), "response": response.text}) + "\n")
+        return response
+
+
+def prompt_key(prompt):
+    """Replay key: the prompt with whitespace normalized, hashed"""
+    return hashlib.sha256(" ".join(prompt.split()).encode()).hexdigest()
+
+
+def _load_replay(path):
+    if not path or not os.path.exists(path):
+        return {}
+    replay = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                replay[entry["key"]] = entry["response"]
+    return replay
+
+
+def create_provider(name=None, model_name=None, api_key=None):
+    """Provider selected by ``Config.LLM_PROVIDER`` (gemini or local)
+
+    With ``Config.LLM_RECORD_PATH`` set, Gemini responses are also appended
+    there, ready to replay offline through ``LLM_REPLAY_PATH``.
+    """
+    name = (name or Config.LLM_PROVIDER).lower()
+    if name == "local":
+        return LocalProvider()
+    if name == "gemini":
+        provider = GeminiProvider(model_name, api_key=api_key)
+        if Config.LLM_RECORD_PATH:
+            provider = RecordingProvider(provider, Config.LLM_RECORD_PATH)
+        return provider
+    raise ValueError(f"Unknown LLM provider: {name}")
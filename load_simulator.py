@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+import time
+import numpy as np
+from config import Config
+from query_analysis import URGENCY_WEIGHTS, calculate_priority
+
+# Urgency mix and typical resolution estimate of each service's requests
+SERVICE_PROFILES = {
+    'Health': {'urgency': {'low': 0.15, 'medium': 0.35, 'high': 0.3, 'critical': 0.2}, 'estimated_days': 2},
+    'Infrastructure': {'urgency': {'low': 0.3, 'medium': 0.4, 'high': 0.25, 'critical': 0.05}, 'estimated_days': 7},
+    'Safety': {'urgency': {'low': 0.1, 'medium': 0.3, 'high': 0.4, 'critical': 0.2}, 'estimated_days': 3},
+}
+FEEDBACK_SCORES = np.arange(1, 6)  # Citizen ratings, equally likely
+URGENT_SCORE = 75  # Classes at or above this priority are reported as urgent
+
+
+def priority_classes(service_type):
+    """Distinct priority scores of a service's requests and their arrival shares
+
+    Scores come from ``calculate_priority`` over every urgency level and
+    citizen rating; returned most urgent first, the order queues are served in.
+    """
+    profile = SERVICE_PROFILES[service_type]
+    weights = np.repeat([URGENCY_WEIGHTS[level] for level in profile['urgency']], len(FEEDBACK_SCORES))
+    shares = np.repeat(list(profile['urgency'].values()), len(FEEDBACK_SCORES)) / len(FEEDBACK_SCORES)
+    scores = calculate_priority(weights, np.tile(FEEDBACK_SCORES, len(profile['urgency'])), profile['estimated_days'])
+
+    classes, inverse = np.unique(scores, return_inverse=True)
+    return classes[::-1], np.bincount(inverse, weights=shares)[::-1]
+
+
+def baseline_staff(daily_demand, requests_per_staff_day=None):
+    """Staff that would run at the baseline utilization on the mean forecast"""
+    rate = requests_per_staff_day or Config.SIM_REQUESTS_PER_STAFF_DAY
+    return max(1, int(np.ceil(np.mean(daily_demand) / (rate * Config.SIM_BASELINE_UTILIZATION))))
+
+
+def simulate_load(daily_demand, staff, service_type, replications=None, requests_per_staff_day=None,
+                  step_hours=None, workers=None, seed=0):
+    """Monte-Carlo replay of forecast arrivals against a department's staff
+
+    Every replication draws Poisson arrivals per priority class from the
+    daily forecast (scaled by a random daily surge) and Poisson completions
+    from the staff's throughput, in steps of ``step_hours``. Each step's
+    completions go to the highest priority class first, oldest requests
+    first within a class; resolution time is the wait for an officer plus the
+    service's estimated handling days. Replications are vectorized with NumPy in chunks
+    spread over a process pool.
+    Returns a dict of per-replication arrays (mean and p90 resolution days,
+    urgent-class mean, share still open at the end) and the pooled
+    resolution-time histogram.
+    """
+    daily_demand = np.asarray(daily_demand, dtype=np.float64)
+    replications = replications or Config.SIM_REPLICATIONS
+    workers = workers or Config.SIM_WORKERS
+    scores, shares = priority_classes(service_type)
+    params = {
+        'daily_demand': daily_demand,
+        'shares': shares,
+        'urgent': scores >= URGENT_SCORE,
+        'capacity_per_day': staff * (requests_per_staff_day or Config.SIM_REQUESTS_PER_STAFF_DAY),
+        'steps_per_day': max(1, round(24 / (step_hours or Config.SIM_STEP_HOURS))),
+        'handling_days': SERVICE_PROFILES[service_type]['estimated_days']
+    }
+
+    # Same seed, same results, whatever the number of workers
+    chunks = np.array_split(np.arange(replications), max(1, -(-replications // Config.SIM_CHUNK_SIZE)))
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(params, len(chunk), chunk_seed) for chunk, chunk_seed in zip(chunks, seeds)]
+
+    started = time.perf_counter()
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(min(workers, len(tasks))) as pool:
+            results = list(pool.map(_replicate, tasks))
+    else:
+        results = [_replicate(task) for task in tasks]
+
+    combined = {name: np.concatenate([result[name] for result in results])
+                for name in ('mean_days', 'p90_days', 'urgent_mean_days', 'open_share')}
+    combined['histogram'] = sum(result['histogram'] for result in results)
+    combined['bin_days'] = (np.arange(len(combined['histogram'])) + 1) / params['steps_per_day'] + params['handling_days']
+    combined['elapsed'] = time.perf_counter() - started
+    return combined
+
+
+def _replicate(task):
+    """One chunk of replications, all advanced together step by step"""
+    params, replications, seed = task
+    rng = np.random.default_rng(seed)
+    shares = params['shares']
+    steps_per_day = params['steps_per_day']
+    steps = len(params['daily_demand']) * steps_per_day
+    classes = len(shares)
+
+    # queue[r, k, t]: requests of class k that arrived in step t, still open in replication r
+    queue = np.zeros((replications, classes, steps), dtype=np.int32)
+    # served[r, k, w]: requests of class k resolved w steps after the step they arrived in
+    served = np.zeros((replications, classes, steps), dtype=np.int32)
+    surge = rng.gamma(Config.SIM_SURGE_SHAPE, 1 / Config.SIM_SURGE_SHAPE, (replications, len(params['daily_demand'])))
+
+    # Per class, steps before this have no open requests in any replication
+    oldest = np.zeros(classes, dtype=np.int64)
+    for step in range(steps):
+        day = step // steps_per_day
+        rate = params['daily_demand'][day] * surge[:, day, None] * shares[None, :] / steps_per_day
+        queue[:, :, step] = rng.poisson(rate)
+
+        # Completions go to classes in priority order; within a class a running
+        # sum over its open cohorts, oldest first, gives each cohort its turn
+        remaining = rng.poisson(params['capacity_per_day'] / steps_per_day, replications)
+        for k in range(classes):
+            if not remaining.any():
+                break
+            cohorts = queue[:, k, oldest[k]:step + 1]
+            ahead = np.cumsum(cohorts, axis=1) - cohorts
+            done = np.clip(remaining[:, None] - ahead, 0, cohorts)
+
+            cohorts -= done
+            served[:, k, :cohorts.shape[1]] += done[:, ::-1]
+            remaining -= done.sum(axis=1)
+
+            still_open = cohorts.any(axis=0)
+            oldest[k] = oldest[k] + np.argmax(still_open) if still_open.any() else step + 1
+
+    # Picked up at the end of the step (waits of w steps take w + 1), then worked on
+    bin_days = (np.arange(steps) + 1) / steps_per_day + params['handling_days']
+    per_replication = served.sum(axis=1)
+    counts = per_replication.sum(axis=1)
+    urgent = served[:, params['urgent'], :].sum(axis=1)
+    opened = counts + queue.sum(axis=(1, 2))
+
+    return {
+        'mean_days': _mean(per_replication, bin_days),
+        'p90_days': bin_days[np.argmax(np.cumsum(per_replication, axis=1) >= 0.9 * counts[:, None], axis=1)],
+        'urgent_mean_days': _mean(urgent, bin_days),
+        'open_share': np.divide(opened - counts, opened, out=np.zeros(replications), where=opened > 0),
+        'histogram': per_replication.sum(axis=0)
+    }
+
+
+def _mean(histogram, bin_days):
+    counts = histogram.sum(axis=1)
+    return np.divide(histogram @ bin_days, counts, out=np.zeros(len(counts)), where=counts > 0)
@@ -5,43 +5,102 @@ Main orchestration script for deployment
 """
 
 import os
+import sys
+from datetime import date, timedelta
 from data_pipeline import DataPipeline
 from predictive_models import PredictiveModels
 from service_engine import ServicePrioritizationEngine
 from security_framework import SecurityFramework
+from bootstrap import Bootstrap, print_report
 from config import Config
+from drift_monitor import DriftMonitor, store_frame
+from feature_store import FeatureStore
+from joined_training import JoinedTrainingBuilder, month_starts
 
-def setup_platform():
-    """Initialize the governance platform"""
+def setup_platform(force=False):
+    """Initialize the governance platform
+    
+    Steps run as a dependency graph: independent ones concurrently, and
+    completed ones whose inputs are unchanged are skipped (``force`` reruns all).
+    """
     print("🏛️ Initializing Maharashtra AI Governance Platform...")
     
     # Initialize components
     data_pipeline = DataPipeline()
     models = PredictiveModels()
     security = SecurityFramework()
+    store = FeatureStore()
+    # Skipped training steps keep the saved models and vocabularies in play
+    models.load_models()
+    ingested = {}
     
-    # Setup data infrastructure
-    print("📊 Setting up data infrastructure...")
-    data_pipeline.create_datasets()
-    data_pipeline.load_sample_data()
-    
-    # Configure security
-    print("🔒 Configuring security framework...")
-    security.setup_iam_policies()
-    security.setup_data_retention()
+    def ingest_features():
+        # Only partitions newer than the cache are fetched and engineered;
+        # the latest cached day is re-read in case it was still filling
+        ingested['data'] = data_pipeline.get_training_data(since=store.latest_partition())
+        written = store.append(ingested['data'])
+        store.prune((date.today() - timedelta(days=Config.TRAINING_WINDOW_DAYS)).isoformat())
+        print(f"📦 Feature store: {len(written)} new partitions, {len(store.partitions)} cached")
     
-    # Train initial models
-    print("🤖 Training predictive models...")
-    try:
-        training_data = data_pipeline.get_training_data()
-        if not training_data.empty:
-            accuracy = models.train_demand_predictor(training_data)
+    def train_demand_model():
+        # Retrain only when new data has drifted from what the model was trained on
+        monitor = DriftMonitor()
+        monitor.observe(ingested['data'])
+        retrain, reasons = monitor.should_retrain()
+        if not os.path.exists('demand_predictor.pkl'):
+            retrain, reasons = True, ["no saved model"]
+        
+        if not store.partitions:
+            print("⚠️ No training data available. Using pre-configured models.")
+        elif retrain:
+            print(f"📈 Retraining demand model: {'; '.join(reasons[:5])}")
+            accuracy = models.train_from_feature_store(store)
             print(f"✅ Model trained with accuracy: {accuracy:.2f}")
-            models.save_models()
+            monitor.snapshot(store_frame(store), through=store.latest_partition())
         else:
-            print("⚠️ No training data available. Using pre-configured models.")
-    except Exception as e:
-        print(f"⚠️ Model training skipped: {e}")
+            if 'demand_predictor' not in models.models:
+                models.load_models()
+            print(f"⏭️ No drift since training on {monitor.trained_at}; keeping the current demand model")
+        monitor.save()
+    
+    def train_family_models():
+        # Shares the district and service vocabularies, so existing codes stay valid
+        builder = JoinedTrainingBuilder(data_pipeline, vocabularies={
+            name: models.vocabulary(name) for name in ('district', 'service', 'infrastructure')
+        })
+        X, y = builder.build(month_starts(Config.TRAINING_WINDOW_DAYS))
+        if len(X):
+            scores = models.train_family_models(X, y, builder.vocabularies)
+            for family, score in scores.items():
+                print(f"✅ {family.title()} demand model trained with accuracy: {score:.2f}")
+        else:
+            print("⚠️ No joined training data available.")
+    
+    bootstrap = Bootstrap()
+    # Data infrastructure and security are independent branches
+    bootstrap.add('create_datasets', data_pipeline.create_datasets,
+                  fingerprint=lambda: [Config.PROJECT_ID, Config.DATASET_ID])
+    bootstrap.add('create_tables', data_pipeline.load_sample_data, deps=['create_datasets'],
+                  fingerprint=lambda: [Config.PROJECT_ID, Config.DATASET_ID])
+    bootstrap.add('setup_iam_policies', security.setup_iam_policies,
+                  fingerprint=lambda: [Config.PROJECT_ID, Config.IAM_ROLES])
+    # Lists the dataset's tables, so it runs once they exist
+    bootstrap.add('setup_data_retention', security.setup_data_retention, deps=['create_tables'],
+                  fingerprint=lambda: [Config.PROJECT_ID, Config.DATASET_ID, Config.RETENTION_DAYS])
+    # Incremental already, so it always runs; training is keyed on what it produced
+    bootstrap.add('ingest_features', ingest_features, deps=['create_tables'])
+    bootstrap.add('train_demand_model', train_demand_model, deps=['ingest_features'],
+                  fingerprint=lambda: store.partitions, outputs=['demand_predictor.pkl'])
+    # After the demand model, whose vocabularies the family models extend
+    bootstrap.add('train_family_models', train_family_models, deps=['train_demand_model'],
+                  fingerprint=lambda: [month_starts(Config.TRAINING_WINDOW_DAYS), date.today()],
+                  outputs=['health_demand.pkl', 'infrastructure_demand.pkl'])
+    # Re-saves only when a training step ran
+    bootstrap.add('save_models', models.save_models, deps=['train_demand_model', 'train_family_models'],
+                  fingerprint=lambda: [])
+    
+    report = bootstrap.run(force=force)
+    print_report(report)
     
     print("✅ Platform initialization complete!")
     return True
@@ -53,7 +112,7 @@ def run_dashboard():
 
 if __name__ == "__main__":
     # Setup platform
-    if setup_platform():
+    if setup_platform(force="--force" in sys.argv):
         print("\n" + "="*50)
         print("Maharashtra AI Governance Platform Ready!")
         print("="*50)
@@ -0,0 +1,291 @@
+import threading
+from time import perf_counter
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """Monotonically increasing counter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        self._lock.acquire()
+        self.value += amount
+        self._lock.release()
+
+    def samples(self, name, labels):
+        yield name + "_total", labels, self.value
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus two adds"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        # Explicit acquire/release is measurably cheaper than ``with`` here
+        self._lock.acquire()
+        self.counts[index] += 1
+        self.sum += value
+        self._lock.release()
+
+    def time(self):
+        """Context manager recording the elapsed wall-clock seconds"""
+        return _TimedSeries(self)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield name + "_bucket", labels + (("le", _format_value(bound)),), cumulative
+        cumulative += self.counts[-1]
+        yield name + "_bucket", labels + (("le", "+Inf"),), cumulative
+        yield name + "_sum", labels, self.sum
+        yield name + "_count", labels, cumulative
+
+
+class MetricFamily:
+    """A named metric with one child series per label combination"""
+
+    def __init__(self, name, documentation, kind, label_names, factory):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._children[()] = factory()
+
+    def labels(self, **labels):
+        """Return the child series for the given label values"""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def __getattr__(self, attr):
+        # Unlabelled families proxy straight to their single series
+        if attr.startswith("_") or self.label_names:
+            raise AttributeError(attr)
+        return getattr(self._children[()], attr)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            base_labels = tuple(zip(self.label_names, key))
+            for sample_name, labels, value in child.samples(self.name, base_labels):
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of counters, gauges and histograms"""
+
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(name, documentation, "counter", labels, Counter)
+
+    def gauge(self, name, documentation, labels=()):
+        return self._register(name, documentation, "gauge", labels, Gauge)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, documentation, "histogram", labels, lambda: Histogram(buckets))
+
+    def _register(self, name, documentation, kind, labels, factory):
+        # Get-or-create so several modules can share one metric name
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(name, documentation, kind, labels, factory)
+                self._families[name] = family
+            elif family.kind != kind or family.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return family
+
+    def render(self):
+        """Render every metric in Prometheus text exposition format"""
+        lines = []
+        for name in sorted(self._families):
+            lines.extend(self._families[name].render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_LATENCY = REGISTRY.histogram(
+    "governance_llm_request_seconds", "Latency of LLM generate calls", labels=("feature",)
+)
+LLM_FIRST_TOKEN = REGISTRY.histogram(
+    "governance_llm_first_token_seconds", "Time to the first streamed LLM chunk", labels=("feature",)
+)
+LLM_ERRORS = REGISTRY.counter(
+    "governance_llm_errors", "LLM calls that raised an error", labels=("feature",)
+)
+LLM_RETRIES = REGISTRY.counter(
+    "governance_llm_retries", "LLM calls retried after a retryable error", labels=("feature",)
+)
+LLM_FALLBACKS = REGISTRY.counter(
+    "governance_llm_fallbacks", "Requests served by the local fallback instead of the LLM", labels=("feature",)
+)
+LLM_CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "governance_llm_concurrency_limit", "Current adaptive limit on in-flight LLM calls"
+)
+LLM_CIRCUIT_OPEN = REGISTRY.gauge(
+    "governance_llm_circuit_open", "1 while the LLM circuit breaker is failing fast"
+)
+WAREHOUSE_LATENCY = REGISTRY.histogram(
+    "governance_warehouse_query_seconds", "Latency of BigQuery queries", labels=("query",)
+)
+MODEL_PREDICT_LATENCY = REGISTRY.histogram(
+    "governance_model_predict_seconds", "Latency of model predictions", labels=("model",)
+)
+MODEL_TRAIN_LATENCY = REGISTRY.histogram(
+    "governance_model_train_seconds", "Duration of model training runs", labels=("model",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+ANONYMIZE_LATENCY = REGISTRY.histogram(
+    "governance_anonymize_seconds", "Latency of PII anonymization",
+    buckets=(0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.001)
+)
+PAGE_RENDER_LATENCY = REGISTRY.histogram(
+    "governance_dashboard_render_seconds", "Dashboard page render time", labels=("dashboard", "page")
+)
+
+
+def timed(histogram, **labels):
+    """Time a block or a function into a histogram
+
+    Works both as ``with timed(LLM_LATENCY, feature="summary"):`` and as a
+    decorator ``@timed(MODEL_TRAIN_LATENCY, model="demand_predictor")``.
+    """
+    return _TimedSeries(histogram.labels(**labels))
+
+
+class _TimedSeries:
+    __slots__ = ("series", "observe", "started")
+
+    def __init__(self, series):
+        self.series = series
+        self.observe = series.observe
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.observe(perf_counter() - self.started)
+        return False
+
+    def __call__(self, func):
+        observe = self.observe
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(perf_counter() - started)
+
+        return wrapper
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host="127.0.0.1"):
+    """Expose /metrics on a local port; safe to call on every rerun"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port or Config.METRICS_PORT), _MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint not started: {e}")
+            return None
+        thread = threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        return _server
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,158 @@
+from collections import defaultdict
+import threading
+import time
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from config import Config
+
+# Assignment costs; a request's mismatch costs scale with its priority, so
+# the most urgent requests get the best-matched officers
+SKILL_MISMATCH_COST = 4.0  # Officer lacks the request's service category
+DISTRICT_MISMATCH_COST = 1.0  # Officer is based in another district
+LOAD_COST = 1.0  # Per unit of officer utilization after the assignment
+
+
+class OfficerAssignmentEngine:
+    """Capacity-aware batch assignment of routed requests to officers
+
+    Each department is a separate shard solved as min-cost matchings
+    (rectangular Hungarian, ``scipy.optimize.linear_sum_assignment``) of
+    priority-ordered chunks of requests to free capacity slots. An officer's k-th free slot costs more
+    than the one before, so work spreads across the roster. Requests beyond
+    a shard's free capacity wait in its backlog, highest priority first,
+    and ``release`` re-solves only the shard whose officer freed up.
+    """
+
+    def __init__(self, officers):
+        self.officers = {officer['id']: dict(officer, active=officer.get('active', 0)) for officer in officers}
+        self.shards = defaultdict(list)
+        for officer in self.officers.values():
+            self.shards[officer['department']].append(officer['id'])
+        self.backlog = defaultdict(list)
+        self.assignments = {}  # request id -> officer id
+        self.assigned_at = {}  # request id -> time.monotonic() of its assignment
+        self._lock = threading.Lock()
+
+    def assign_batch(self, requests):
+        """Assign a batch of routed requests; returns the new assignments
+
+        Each request needs ``id``, ``department``, ``service_category``,
+        ``priority_score`` and ``district``. Requests for a department with
+        no free officer are queued and assigned by a later ``release``.
+        """
+        with self._lock:
+            touched = set()
+            for request in requests:
+                self.backlog[request['department']].append(request)
+                touched.add(request['department'])
+
+            assigned = []
+            for department in touched:
+                assigned.extend(self._solve_shard(department))
+            return assigned
+
+    def release(self, request_id):
+        """Mark a request resolved, freeing its officer's slot for the backlog"""
+        with self._lock:
+            department = self._free(request_id)
+            return self._solve_shard(department) if department else []
+
+    def release_older_than(self, seconds):
+        """Release every request assigned more than ``seconds`` ago, e.g. simulated completions
+
+        Each affected shard is re-solved once; returns the new assignments.
+        """
+        with self._lock:
+            cutoff = time.monotonic() - seconds
+            departments = {self._free(request_id) for request_id, at in list(self.assigned_at.items())
+                           if at <= cutoff}
+            assigned = []
+            for department in departments:
+                assigned.extend(self._solve_shard(department))
+            return assigned
+
+    def _free(self, request_id):
+        officer_id = self.assignments.pop(request_id, None)
+        self.assigned_at.pop(request_id, None)
+        if officer_id is None:
+            return None
+        officer = self.officers[officer_id]
+        officer['active'] = max(0, officer['active'] - 1)
+        return officer['department']
+
+    def pending(self, department=None):
+        if department is not None:
+            return len(self.backlog.get(department, []))
+        return sum(len(queue) for queue in self.backlog.values())
+
+    def _solve_shard(self, department):
+        queue = self.backlog.get(department)
+        officer_ids = self.shards.get(department)
+        if not queue or not officer_ids:
+            return []
+
+        officers = [self.officers[officer_id] for officer_id in officer_ids]
+        free = np.array([max(0, o['capacity'] - o['active']) for o in officers])
+        if not free.sum():
+            return []
+
+        # Only as many requests as there are free slots are matched, most urgent
+        # first, in chunks: each chunk is an exact matching against the slots
+        # left by the more urgent chunks before it, and far cheaper than one
+        # matching over the whole shard (the solve is cubic in its size)
+        queue.sort(key=lambda request: -request['priority_score'])
+        batch = queue[:free.sum()]
+        del queue[:len(batch)]
+
+        assigned = []
+        for start in range(0, len(batch), Config.ASSIGNMENT_CHUNK_SIZE):
+            assigned.extend(self._match(department, officers, batch[start:start + Config.ASSIGNMENT_CHUNK_SIZE]))
+        return assigned
+
+    def _match(self, department, officers, batch):
+        free = np.array([max(0, o['capacity'] - o['active']) for o in officers])
+
+        # One column per usable slot; no officer needs more slots than there are requests
+        slots = np.minimum(free, len(batch))
+        slot_officer = np.repeat(np.arange(len(officers)), slots)
+        slot_rank = np.arange(len(slot_officer)) - np.repeat(np.cumsum(slots) - slots, slots)
+        capacity = np.array([o['capacity'] for o in officers], dtype=np.float64)
+        active = np.array([o['active'] for o in officers], dtype=np.float64)
+        load = LOAD_COST * (active[slot_officer] + slot_rank + 1) / capacity[slot_officer]
+
+        cost = self._cost_matrix(batch, officers, slot_officer) + load
+        rows, columns = linear_sum_assignment(cost)
+
+        assigned = []
+        for row, column in zip(rows, columns):
+            request = batch[row]
+            officer = officers[slot_officer[column]]
+            officer['active'] += 1
+            self.assignments[request['id']] = officer['id']
+            self.assigned_at[request['id']] = time.monotonic()
+            assigned.append({
+                'request_id': request['id'],
+                'officer_id': officer['id'],
+                'department': department,
+                'officer_district': officer['district'],
+                'cost': float(cost[row, column])
+            })
+        return assigned
+
+    @staticmethod
+    def _cost_matrix(batch, officers, slot_officer):
+        """Priority-weighted skill and district mismatch, requests x slots"""
+        categories = sorted({request['service_category'] for request in batch})
+        districts = sorted({o['district'] for o in officers} | {request['district'] for request in batch})
+        category_code = {name: code for code, name in enumerate(categories)}
+        district_code = {name: code for code, name in enumerate(districts)}
+
+        skilled = np.array([[name in o['skills'] for name in categories] for o in officers], dtype=bool)
+        officer_district = np.array([district_code[o['district']] for o in officers])
+        request_category = np.array([category_code[request['service_category']] for request in batch])
+        request_district = np.array([district_code[request['district']] for request in batch])
+        weight = np.array([request['priority_score'] for request in batch], dtype=np.float64) / 100
+
+        mismatch = (SKILL_MISMATCH_COST * ~skilled[slot_officer][:, request_category].T
+                    + DISTRICT_MISMATCH_COST * (request_district[:, None] != officer_district[slot_officer][None, :]))
+        return weight[:, None] * mismatch
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Local demand prediction service with request coalescing
+
+Concurrent single-row requests arriving within a few milliseconds of each
+other are answered by one vectorized model.predict call.
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+from metrics import REGISTRY
+from streaming_stats import QuantileSketch
+
+SERVER_LATENCY = REGISTRY.histogram(
+    "governance_prediction_server_seconds", "End-to-end latency of coalesced prediction requests"
+)
+SERVER_BATCH_SIZE = REGISTRY.histogram(
+    "governance_prediction_batch_rows", "Rows per coalesced model.predict call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+)
+
+class LatencyStats:
+    """Thread-safe latency percentiles and throughput for the service"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = QuantileSketch(relative_accuracy=0.01)
+        self.batch_sizes = QuantileSketch(relative_accuracy=0.01)
+        self.completed = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    def record_batch(self, latencies):
+        with self._lock:
+            for latency in latencies:
+                self.latency.add(latency)
+            self.batch_sizes.add(len(latencies))
+            self.completed += len(latencies)
+            self.batches += 1
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            return {
+                'requests': self.completed,
+                'batches': self.batches,
+                'throughput_rps': round(self.completed / elapsed, 1) if elapsed > 0 else 0.0,
+                'latency_p50_ms': _milliseconds(self.latency.quantile(0.5)),
+                'latency_p99_ms': _milliseconds(self.latency.quantile(0.99)),
+                'batch_size_p50': round(self.batch_sizes.quantile(0.5) or 0, 1),
+                'batch_size_max': self.batch_sizes.max
+            }
+
+
+class RequestCoalescer:
+    """Collects single-row predictions into vectorized batches"""
+
+    def __init__(self, predict_batch, max_batch_size=None, max_wait_ms=None):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size or Config.PREDICTION_MAX_BATCH_SIZE
+        self.max_wait = (Config.PREDICTION_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.stats = LatencyStats()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="prediction-coalescer", daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        """Queue one row; returns a Future resolving to its prediction"""
+        future = Future()
+        self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    def predict(self, row, timeout=None):
+        return self.submit(row).result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        rows = [row for row, _, _ in batch]
+        try:
+            predictions = self.predict_batch(rows)
+            if predictions is None:
+                raise RuntimeError("Demand model is not trained")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        latencies = []
+        for (_, future, enqueued), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+            latencies.append(finished - enqueued)
+            SERVER_LATENCY.observe(finished - enqueued)
+
+        SERVER_BATCH_SIZE.observe(len(batch))
+        self.stats.record_batch(latencies)
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    coalescer = None
+    vocabularies = {}
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._reply(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._reply(200, self.coalescer.stats.snapshot())
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._reply(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            rows = [self._parse_row(item) for item in (payload if isinstance(payload, list) else [payload])]
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {'error': f"Invalid request: {e}"})
+            return
+
+        futures = [self.coalescer.submit(row) for row in rows]
+        try:
+            predictions = [future.result(timeout=30) for future in futures]
+        except Exception as e:
+            self._reply(503, {'error': str(e)})
+            return
+
+        if isinstance(payload, list):
+            self._reply(200, {'predictions': predictions})
+        else:
+            self._reply(200, {'prediction': predictions[0]})
+
+    def _parse_row(self, item):
+        row = (
+            str(item['district']),
+            str(item['service_type']),
+            int(item['month']),
+            int(item['day_of_week']),
+            float(item.get('avg_resolution_time', 4.5))
+        )
+        # Reject unknown categories here so one bad row cannot fail a whole batch
+        if row[0] not in self.vocabularies['district']:
+            raise ValueError(f"unknown district {row[0]!r}")
+        if row[1] not in self.vocabularies['service']:
+            raise ValueError(f"unknown service_type {row[1]!r}")
+        return row
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(models, port=None, host='127.0.0.1', max_batch_size=None, max_wait_ms=None):
+    """Build (but do not start) a prediction server around loaded models"""
+    coalescer = RequestCoalescer(models.predict_service_demand_batch, max_batch_size, max_wait_ms)
+    handler = type('BoundPredictionHandler', (PredictionHandler,), {
+        'coalescer': coalescer,
+        'vocabularies': {name: set(models.vocabulary(name)) for name in ('district', 'service')}
+    })
+    server = ThreadingHTTPServer((host, port or Config.PREDICTION_SERVER_PORT), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+if __name__ == "__main__":
+    from predictive_models import PredictiveModels
+
+    parser = argparse.ArgumentParser(description="Local demand prediction service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=Config.PREDICTION_SERVER_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=Config.PREDICTION_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=Config.PREDICTION_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    models = PredictiveModels()
+    models.load_models()
+
+    server = create_server(models, args.port, args.host, args.max_batch_size, args.max_wait_ms)
+    print(f"🤖 Prediction service listening on http://{args.host}:{args.port}")
+    print(f"   POST /predict  GET /stats  (batch ≤ {args.max_batch_size}, wait ≤ {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Prediction service stopped")
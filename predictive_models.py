@@ -1,57 +1,126 @@
 from google.cloud import aiplatform
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
 import pandas as pd
 import numpy as np
 import joblib
 from config import Config
+from feature_store import FEATURES, build_demand_features
+from joined_training import COLUMN, FAMILIES, FAMILY_FEATURES
+from forest_inference import FlatForest
+from metrics import MODEL_PREDICT_LATENCY, MODEL_TRAIN_LATENCY, timed
 
 class PredictiveModels:
     def __init__(self):
         aiplatform.init(project=Config.PROJECT_ID, location=Config.REGION)
         self.models = {}
         self.encoders = {}
+        self.flat_forests = {}
         
+    @timed(MODEL_TRAIN_LATENCY, model="demand_predictor")
     def train_demand_predictor(self, data):
         """Train service demand prediction model"""
-        # Encode categorical variables
-        le_district = LabelEncoder()
-        le_service = LabelEncoder()
-        
-        data['district_encoded'] = le_district.fit_transform(data['district'])
-        data['service_encoded'] = le_service.fit_transform(data['service_type'])
-        
-        # Features and target
-        features = ['district_encoded', 'service_encoded', 'month', 'day_of_week', 'resolution_time']
-        X = data[features]
+        # Categorical codes are used directly as features; no copy of the
+        # string columns and no extra int64 columns on the input frame
+        vocabularies = {name: self.vocabulary(name) for name in ('district', 'service')}
+        X = build_demand_features(data, vocabularies)
         y = data['request_count']
         
-        # Train model
+        self.encoders.update(vocabularies)
+        return self._fit_demand_predictor(X, y)
+    
+    @timed(MODEL_TRAIN_LATENCY, model="demand_predictor")
+    def train_from_feature_store(self, store):
+        """Train on the cached per-partition feature matrix"""
+        X, y = store.load()
+        
+        # The store's vocabularies define the codes baked into X
+        self.encoders['district'] = list(store.vocabularies.get('district', []))
+        self.encoders['service'] = list(store.vocabularies.get('service', []))
+        return self._fit_demand_predictor(pd.DataFrame(X, columns=FEATURES), y)
+    
+    def _fit_demand_predictor(self, X, y):
         model = RandomForestRegressor(n_estimators=100, random_state=42)
         model.fit(X, y)
         
-        # Store model and encoders
         self.models['demand_predictor'] = model
-        self.encoders['district'] = le_district
-        self.encoders['service'] = le_service
-        
         return model.score(X, y)
     
+    @timed(MODEL_TRAIN_LATENCY, model="family_demand")
+    def train_family_models(self, X, y, vocabularies):
+        """Train one demand model per service family on the joined matrix
+        
+        Returns {family: training score}; families without rows are skipped.
+        """
+        self.encoders.update(vocabularies)
+        scores = {}
+        for index, family in enumerate(FAMILIES):
+            rows = X[:, COLUMN['family']] == index
+            if not rows.any():
+                continue
+            columns = [COLUMN[name] for name in FAMILY_FEATURES[family]]
+            family_X = pd.DataFrame(X[np.ix_(rows, columns)], columns=FAMILY_FEATURES[family])
+            
+            model = RandomForestRegressor(n_estimators=100, random_state=42)
+            model.fit(family_X, y[rows])
+            self.models[f'{family}_demand'] = model
+            scores[family] = model.score(family_X, y[rows])
+        return scores
+    
+    def vocabulary(self, name):
+        encoder = self.encoders.get(name)
+        if encoder is None:
+            return []
+        # Models saved before the vocabulary format stored LabelEncoders
+        return list(getattr(encoder, 'classes_', encoder))
+    
     def predict_service_demand(self, district, service_type, month, day_of_week, avg_resolution_time):
         """Predict future service demand"""
         if 'demand_predictor' not in self.models:
             return None
             
         # Encode inputs
-        district_encoded = self.encoders['district'].transform([district])[0]
-        service_encoded = self.encoders['service'].transform([service_type])[0]
+        district_encoded = self.vocabulary('district').index(district)
+        service_encoded = self.vocabulary('service').index(service_type)
         
         # Make prediction
         features = np.array([[district_encoded, service_encoded, month, day_of_week, avg_resolution_time]])
-        prediction = self.models['demand_predictor'].predict(features)[0]
+        with timed(MODEL_PREDICT_LATENCY, model="demand_predictor"):
+            prediction = self.flat_forest('demand_predictor').predict(features)[0]
         
         return max(0, int(prediction))
     
+    def predict_service_demand_batch(self, rows):
+        """Predict demand for many (district, service_type, month, day_of_week,
+        avg_resolution_time) rows with a single model call"""
+        if 'demand_predictor' not in self.models:
+            return None
+        
+        district_codes = {name: code for code, name in enumerate(self.vocabulary('district'))}
+        service_codes = {name: code for code, name in enumerate(self.vocabulary('service'))}
+        
+        features = np.array([
+            [district_codes[district], service_codes[service_type], month, day_of_week, avg_resolution_time]
+            for district, service_type, month, day_of_week, avg_resolution_time in rows
+        ], dtype=np.float32).reshape(-1, len(FEATURES))
+        with timed(MODEL_PREDICT_LATENCY, model="demand_predictor_batch"):
+            # The flat engine wins on small batches; sklearn's compiled
+            # traversal is faster once per-call overhead is amortized
+            if len(features) <= Config.FLAT_FOREST_MAX_ROWS:
+                predictions = self.flat_forest('demand_predictor').predict(features)
+            else:
+                predictions = self.models['demand_predictor'].predict(pd.DataFrame(features, columns=FEATURES))
+        
+        return np.maximum(0, predictions).astype(int).tolist()
+    
+    def flat_forest(self, name):
+        """Array-based inference engine for a forest, rebuilt when the model changes"""
+        model = self.models[name]
+        cached = self.flat_forests.get(name)
+        if cached is None or cached[0] is not model:
+            cached = (model, FlatForest.from_sklearn(model))
+            self.flat_forests[name] = cached
+        return cached[1]
+    
     def calculate_priority_score(self, request_count, population, urgency_level):
         """Calculate dynamic priority score"""
         base_score = (request_count / population) * 100
@@ -73,4 +142,12 @@ class PredictiveModels:
             self.encoders['district'] = joblib.load('district_encoder.pkl')
             self.encoders['service'] = joblib.load('service_encoder.pkl')
         except FileNotFoundError:
-            print("Models not found. Train models first.")
\ No newline at end of file
+            print("Models not found. Train models first.")
+        
+        # Per-family models are optional until the joined training has run
+        for family, spec in FAMILIES.items():
+            try:
+                self.models[f'{family}_demand'] = joblib.load(f'{family}_demand.pkl')
+                self.encoders[spec['vocabulary']] = joblib.load(f"{spec['vocabulary']}_encoder.pkl")
+            except FileNotFoundError:
+                pass
\ No newline at end of file
@@ -0,0 +1,200 @@
+import json
+import re
+import numpy as np
+
+# Single response schema covering both the analysis and the routing decision
+ANALYSIS_FIELDS = {
+    "service_category": {"type": "string", "enum": ["health", "infrastructure", "safety", "education", "other"], "default": "other"},
+    "urgency_level": {"type": "string", "enum": ["low", "medium", "high", "critical"], "default": "medium"},
+    "department": {"type": "string", "default": "general"},
+    "estimated_days": {"type": "integer", "min": 0, "max": 365, "default": 7},
+    "priority_score": {"type": "integer", "min": 1, "max": 100, "default": 50},
+    "action_required": {"type": "string", "default": ""},
+    "assigned_officer": {"type": "string", "default": "Unassigned"},
+    "timeline": {"type": "string", "default": ""},
+    "required_resources": {"type": "array", "default": []},
+    "citizen_message": {"type": "string", "default": ""}
+}
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        name: (
+            {"type": "array", "items": {"type": "string"}} if spec["type"] == "array"
+            else {key: value for key, value in spec.items() if key in ("type", "enum")}
+        )
+        for name, spec in ANALYSIS_FIELDS.items()
+    },
+    "required": list(ANALYSIS_FIELDS)
+}
+
+ANALYSIS_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": ANALYSIS_SCHEMA
+}
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_FIELD_PATTERNS = {
+    name: re.compile(
+        r'"%s"\s*:\s*(\[[^\]]*\]|"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)' % name
+    )
+    for name in ANALYSIS_FIELDS
+}
+
+
+def build_analysis_prompt(query_text, district=None):
+    """Prompt asking for analysis and routing in one structured response"""
+    location = f"\n    District: {district}" if district else ""
+    return f"""
+    Analyze this citizen service request for Maharashtra government and
+    decide how to route it. Respond with a single JSON object only.
+
+    Query: {query_text}{location}
+
+    Fields:
+    - service_category: health, infrastructure, safety, education or other
+    - urgency_level: low, medium, high or critical
+    - department: specific department name
+    - estimated_days: estimated resolution time in days
+    - priority_score: 1-100
+    - action_required: brief description of the action
+    - assigned_officer: officer or desk the request is assigned to
+    - timeline: timeline for resolution
+    - required_resources: list of required resources
+    - citizen_message: short message to send to the citizen
+    """
+
+
+def parse_analysis(text):
+    """Validate a structured analysis response, recovering partial fields
+
+    Returns (analysis, missing) where missing lists the fields that had to
+    fall back to their defaults.
+    """
+    raw = _load_object(text)
+    if raw is None:
+        raw = _recover_fields(text)
+
+    analysis = {}
+    missing = []
+    for name, spec in ANALYSIS_FIELDS.items():
+        value = _coerce(raw.get(name), spec)
+        if value is None:
+            value = list(spec["default"]) if spec["type"] == "array" else spec["default"]
+            missing.append(name)
+        analysis[name] = value
+
+    return analysis, missing
+
+
+# Local keyword rules, used when the LLM is unavailable: (keywords, analysis)
+KEYWORD_RULES = [
+    (("water", "supply", "pipe", "leak"), {
+        "service_category": "infrastructure", "urgency_level": "high",
+        "department": "Water Supply Department", "estimated_days": 3, "priority_score": 85
+    }),
+    (("health", "medical", "hospital", "doctor"), {
+        "service_category": "health", "urgency_level": "critical",
+        "department": "Health Services", "estimated_days": 1, "priority_score": 95
+    }),
+    (("road", "traffic", "street", "pothole"), {
+        "service_category": "infrastructure", "urgency_level": "medium",
+        "department": "Public Works Department", "estimated_days": 7, "priority_score": 70
+    })
+]
+KEYWORD_DEFAULT = {
+    "service_category": "other", "urgency_level": "medium",
+    "department": "General Administration", "estimated_days": 5, "priority_score": 60
+}
+
+
+def keyword_analysis(query_text):
+    """Rule-based analysis in the same shape as parse_analysis output"""
+    query_lower = str(query_text).lower()
+    matched = KEYWORD_DEFAULT
+    for keywords, rule in KEYWORD_RULES:
+        if any(word in query_lower for word in keywords):
+            matched = rule
+            break
+
+    analysis, _ = parse_analysis(json.dumps({
+        **matched,
+        "action_required": f"Route to {matched['department']} for review",
+        "assigned_officer": f"{matched['department']} duty desk",
+        "timeline": f"{matched['estimated_days']} days",
+        "citizen_message": "Your request has been registered and routed to the concerned department."
+    }))
+    return analysis
+
+
+URGENCY_WEIGHTS = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+
+
+def calculate_priority(urgency, feedback_score, estimated_days):
+    """Dynamic priority score from urgency, citizen rating and resolution estimate
+
+    ``urgency`` is a level name or its URGENCY_WEIGHTS weight. Array
+    arguments (weights, not names) give an array of scores.
+    """
+    weight = URGENCY_WEIGHTS.get(urgency, 2) if isinstance(urgency, str) else np.asarray(urgency)
+
+    base_score = weight * 25
+    feedback_bonus = (np.asarray(feedback_score) - 3) * 5  # Boost for high citizen ratings
+    time_penalty = np.maximum(0, (np.asarray(estimated_days) - 3) * 2)  # Penalty for long resolution
+
+    return np.clip(base_score + feedback_bonus - time_penalty, 10, 100)
+
+
+def _load_object(text):
+    if not text:
+        return None
+    body = _FENCE.sub("", text.strip())
+    start, end = body.find("{"), body.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(body[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _recover_fields(text):
+    """Pull whichever fields are intact out of truncated or malformed JSON"""
+    recovered = {}
+    for name, pattern in _FIELD_PATTERNS.items():
+        match = pattern.search(text or "")
+        if match:
+            try:
+                recovered[name] = json.loads(match.group(1))
+            except ValueError:
+                continue
+    return recovered
+
+
+def _coerce(value, spec):
+    if value is None:
+        return None
+
+    if spec["type"] == "integer":
+        try:
+            number = int(round(float(value)))
+        except (TypeError, ValueError):
+            digits = re.search(r"-?\d+", str(value))
+            if not digits:
+                return None
+            number = int(digits.group())
+        return min(spec["max"], max(spec["min"], number))
+
+    if spec["type"] == "array":
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(",")]
+        if not isinstance(value, list):
+            return None
+        return [str(item) for item in value if str(item).strip()]
+
+    value = str(value).strip()
+    if "enum" in spec:
+        value = value.lower()
+        return value if value in spec["enum"] else None
+    return value or None
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import re
+from streaming_stats import QuantileSketch, TopK
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'at', 'for', 'from', 'has', 'have', 'help', 'in',
+    'is', 'it', 'my', 'near', 'need', 'needed', 'no', 'not', 'of', 'on', 'our',
+    'please', 'the', 'there', 'this', 'to', 'urgent', 'very', 'with'
+}
+
+
+class RequestDigest:
+    """Single-pass, bounded-memory statistical digest of citizen requests"""
+
+    # Fixed output shape so the prompt size never depends on the input
+    MAX_DISTRICTS = 10
+    MAX_CATEGORIES = 6
+    MAX_CONCERNS = 10
+    LABEL_WIDTH = 32
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self.total = 0
+        self.districts = TopK(capacity=64)
+        self.categories = TopK(capacity=32)
+        self.concerns = TopK(capacity=256)
+        self.resolution = QuantileSketch()
+        self.priority = QuantileSketch()
+
+    def add(self, record):
+        """Fold one request record into the digest"""
+        self.total += 1
+        self.districts.add(self._label(record.get('district')))
+        self.categories.add(self._label(
+            record.get('service_category') or record.get('service_type') or record.get('category')
+        ))
+        self.resolution.add(self._number(
+            record.get('resolution_time', record.get('estimated_resolution'))
+        ))
+        self.priority.add(self._number(record.get('priority_score')))
+
+        if record.get('concern'):
+            self.concerns.add(self._label(record['concern']))
+        else:
+            for keyword in self._keywords(record.get('description')):
+                self.concerns.add(keyword)
+
+    def update(self, records):
+        """Consume an iterable of request records in one pass"""
+        for record in records:
+            self.add(record)
+        return self
+
+    def to_dict(self):
+        """Serialize the digest into a fixed-size structure"""
+        return {
+            'total_requests': self.total,
+            'by_district': self._ranked(self.districts, self.MAX_DISTRICTS),
+            'by_category': self._ranked(self.categories, self.MAX_CATEGORIES),
+            'resolution_days': self._quantiles(self.resolution),
+            'priority_score': self._quantiles(self.priority),
+            'top_concerns': self._ranked(self.concerns, self.MAX_CONCERNS)
+        }
+
+    def to_prompt(self):
+        """Compact, deterministic JSON used as the LLM prompt payload"""
+        return json.dumps(self.to_dict(), separators=(',', ':'), sort_keys=True)
+
+    def fingerprint(self):
+        """Stable hash of the digest, used as the summary cache key"""
+        return hashlib.sha256(self.to_prompt().encode()).hexdigest()
+
+    def _ranked(self, counter, limit):
+        ranked = counter.top(limit)
+        ranked = [[label, count] for label, count in ranked]
+        other = self.total - sum(count for _, count in ranked)
+        if counter is not self.concerns and other > 0:
+            ranked.append(['other', other])
+        return ranked
+
+    def _quantiles(self, sketch):
+        values = {}
+        for q in self.QUANTILES:
+            estimate = sketch.quantile(q)
+            values[f"p{int(q * 100)}"] = None if estimate is None else round(estimate, 2)
+        return values
+
+    def _label(self, value):
+        # Missing labels get their own bucket rather than a None key
+        if value is None:
+            return 'unknown'
+        return str(value).strip().lower()[:self.LABEL_WIDTH] or 'unknown'
+
+    def _number(self, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _keywords(self, text):
+        if not text:
+            return []
+        words = re.findall(r"[a-z]+", str(text).lower())
+        return sorted({word for word in words if len(word) > 2 and word not in STOPWORDS})
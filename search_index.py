@@ -0,0 +1,215 @@
+from array import array
+from collections import defaultdict
+import re
+import threading
+import numpy as np
+from config import Config
+
+_TOKEN = re.compile(r"[a-z0-9]+|[ऀ-ॿ]+")
+STOPWORDS = frozenset(
+    "a an and are at be by for from has have in is it my near of on or our please the there this to was "
+    "with since no not".split()
+)
+
+# Devanagari to Latin, ITRANS-like: consonants carry an inherent "a" that a
+# vowel sign replaces and the virama drops
+_VOWELS = dict(zip("अआइईउऊऋएऐओऔ", ["a", "aa", "i", "ee", "u", "oo", "ru", "e", "ai", "o", "au"]))
+_VOWEL_SIGNS = dict(zip("ािीुूृेैोौ", ["aa", "i", "ee", "u", "oo", "ru", "e", "ai", "o", "au"]))
+_CONSONANTS = dict(zip(
+    "कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसहळ",
+    ["k", "kh", "g", "gh", "n", "ch", "chh", "j", "jh", "n", "t", "th", "d", "dh", "n", "t", "th", "d", "dh",
+     "n", "p", "ph", "b", "bh", "m", "y", "r", "l", "v", "sh", "sh", "s", "h", "l"]
+))
+_VIRAMA = "्"
+_NASALS = {"ं": "n", "ँ": "n", "ः": "h"}
+_DIGITS = {chr(0x0966 + i): str(i) for i in range(10)}
+
+# Romanized Marathi has no fixed spelling ("paani"/"pani", "rastha"/"rasta"):
+# tokens are folded to a spelling-insensitive key before indexing and search
+_FOLDS = [("chh", "ch"), ("ph", "f"), ("sh", "s"), ("th", "t"), ("dh", "d"), ("kh", "k"), ("gh", "g"),
+          ("bh", "b"), ("jh", "j"), ("w", "v"), ("z", "j"), ("ee", "i"), ("oo", "u")]
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def transliterate(word):
+    """Latin spelling of a Devanagari word"""
+    out = []
+    pending = False  # A consonant whose inherent "a" is not yet written
+    for char in word:
+        if char in _CONSONANTS:
+            if pending:
+                out.append("a")
+            out.append(_CONSONANTS[char])
+            pending = True
+        elif char in _VOWEL_SIGNS:
+            out.append(_VOWEL_SIGNS[char])
+            pending = False
+        elif char == _VIRAMA:
+            pending = False
+        else:
+            if pending:
+                out.append("a")
+            pending = False
+            out.append(_VOWELS.get(char) or _NASALS.get(char) or _DIGITS.get(char, ""))
+    if pending:
+        out.append("a")
+    return "".join(out)
+
+
+def fold(token):
+    """Spelling-insensitive key for an English or romanized Marathi token"""
+    if token.isdigit():
+        return token
+    for pattern, replacement in _FOLDS:
+        token = token.replace(pattern, replacement)
+    token = _REPEATS.sub(r"\1", token)
+    # Plural "s" and the final schwa ("rasta"/"rast") are dropped on longer words
+    if len(token) > 3 and token[-1] in "sa":
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Index terms of a description: English and Marathi (Devanagari or romanized)"""
+    terms = []
+    for token in _TOKEN.findall(str(text).lower()):
+        if token[0] >= "ऀ":
+            token = transliterate(token)
+        if token and token not in STOPWORDS:
+            terms.append(fold(token))
+    return terms
+
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varints(buffer):
+    """All varints in a byte buffer, decoded at once with NumPy
+
+    Values start from their last (most significant) byte; each pass folds
+    in the byte before, so the passes are bounded by the longest varint.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    continued = data >= 0x80
+    ends = np.flatnonzero(~continued)
+    values = data[ends].astype(np.int64)
+    position = ends - 1
+    open_ = (position >= 0) & continued[np.maximum(position, 0)]
+    while open_.any():
+        rows = np.flatnonzero(open_)
+        values[rows] = (values[rows] << 7) | (data[position[rows]] & 0x7F)
+        position[rows] -= 1
+        open_[rows] = (position[rows] >= 0) & continued[np.maximum(position[rows], 0)]
+    return values
+
+
+class SearchIndex:
+    """Incremental inverted index over citizen request descriptions
+
+    Each term's posting list is a byte string of varint (doc id gap, term
+    frequency) pairs, appended to as documents arrive; doc ids only grow,
+    so gaps stay small. Search decodes the lists of the query terms with
+    NumPy, scores them with BM25 into a dense accumulator and applies the
+    district and category filters on per-document code arrays.
+    """
+
+    def __init__(self, k1=None, b=None):
+        self.k1 = Config.SEARCH_BM25_K1 if k1 is None else k1
+        self.b = Config.SEARCH_BM25_B if b is None else b
+        self.postings = defaultdict(bytearray)
+        self.last_doc = {}
+        self.request_ids = []
+        self.descriptions = []
+        self.lengths = array('I')
+        self.districts = array('H')
+        self.categories = array('H')
+        self.vocabularies = {'district': {}, 'category': {}}
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.request_ids)
+
+    def add(self, request_id, description, district, category):
+        """Index one request; it is searchable as soon as this returns"""
+        terms = tokenize(description)
+        counts = defaultdict(int)
+        for term in terms:
+            counts[term] += 1
+
+        with self._lock:
+            doc = len(self.request_ids)
+            for term, count in counts.items():
+                postings = self.postings[term]
+                _encode_varint(doc - self.last_doc.get(term, 0), postings)
+                _encode_varint(count, postings)
+                self.last_doc[term] = doc
+
+            self.request_ids.append(request_id)
+            self.descriptions.append(description)
+            self.lengths.append(len(terms))
+            self.districts.append(self._code('district', district))
+            self.categories.append(self._code('category', category))
+            self.total_length += len(terms)
+        return doc
+
+    def search(self, query, district=None, category=None, limit=10):
+        """Top requests for a query by BM25, optionally within a district and category
+
+        Returns a list of dicts (request_id, description, district, category,
+        score), best first.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            size = len(self.request_ids)
+            if not terms or not size:
+                return []
+            filters = [
+                (np.frombuffer(self.districts, dtype=np.uint16), self.vocabularies['district'].get(district), district),
+                (np.frombuffer(self.categories, dtype=np.uint16), self.vocabularies['category'].get(category), category)
+            ]
+            if any(value is not None and code is None for _, code, value in filters):
+                return []  # Filter value never indexed
+
+            lengths = np.frombuffer(self.lengths, dtype=np.uint32)
+            average_length = self.total_length / size
+            scores = np.zeros(size, dtype=np.float32)
+            for term in terms:
+                if term not in self.postings:
+                    continue
+                pairs = decode_varints(bytes(self.postings[term]))
+                docs = np.cumsum(pairs[0::2])
+                frequency = pairs[1::2]
+                idf = np.log(1 + (size - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+                scores[docs] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            candidates = np.flatnonzero(scores)
+            for codes, code, value in filters:
+                if value is not None:
+                    candidates = candidates[codes[candidates] == code]
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+            names = {key: list(vocabulary) for key, vocabulary in self.vocabularies.items()}
+            return [{
+                'request_id': self.request_ids[doc],
+                'description': self.descriptions[doc],
+                'district': names['district'][self.districts[doc]],
+                'category': names['category'][self.categories[doc]],
+                'score': float(scores[doc])
+            } for doc in candidates]
+
+    def posting_bytes(self):
+        return sum(len(postings) for postings in self.postings.values())
+
+    def _code(self, field, value):
+        vocabulary = self.vocabularies[field]
+        if value not in vocabulary:
+            vocabulary[value] = len(vocabulary)
+        return vocabulary[value]
@@ -1,13 +1,36 @@
-from google.cloud import iam
-from google.cloud import bigquery
 import hashlib
 import re
 from config import Config
+from metrics import ANONYMIZE_LATENCY, WAREHOUSE_LATENCY, timed
 
 class SecurityFramework:
+    # Fields each role may read; PII fields are only ever exported anonymized
+    ACCESS_MATRIX = {
+        "citizen_service": ["service_type", "district", "status", "priority_score"],
+        "data_analyst": ["service_type", "district", "status", "priority_score", "request_count", "resolution_time",
+                         "request_id", "date", "predicted_demand", "timestamp", "action", "resource",
+                         "compliance_status"],
+        "admin": ["*"]  # Full access
+    }
+    
     def __init__(self):
-        self.iam_client = iam.IAMCredentialsServiceClient()
-        self.bq_client = bigquery.Client(project=Config.PROJECT_ID)
+        self._iam_client = None
+        self._bq_client = None
+    
+    @property
+    def iam_client(self):
+        """IAM client, created on first use so projection and anonymization work offline"""
+        if self._iam_client is None:
+            from google.cloud import iam
+            self._iam_client = iam.IAMCredentialsServiceClient()
+        return self._iam_client
+    
+    @property
+    def bq_client(self):
+        if self._bq_client is None:
+            from google.cloud import bigquery
+            self._bq_client = bigquery.Client(project=Config.PROJECT_ID)
+        return self._bq_client
         
     def setup_iam_policies(self):
         """Setup IAM roles and policies for data governance"""
@@ -27,6 +50,7 @@ class SecurityFramework:
         
         return policies
     
+    @timed(ANONYMIZE_LATENCY)
     def anonymize_pii(self, data_dict):
         """Remove/hash PII data for compliance"""
         anonymized = data_dict.copy()
@@ -42,21 +66,40 @@ class SecurityFramework:
         
         return anonymized
     
+    @timed(ANONYMIZE_LATENCY)
+    def anonymize_frame(self, frame):
+        """Batch version of anonymize_pii for a DataFrame; returns a new frame"""
+        anonymized = frame.copy(deep=False)
+        
+        for field in Config.PII_FIELDS:
+            if field not in anonymized.columns:
+                continue
+            if field == 'citizen_id':
+                # Each distinct ID is hashed once per batch
+                ids = anonymized[field].astype(str)
+                hashed = {value: hashlib.sha256(value.encode()).hexdigest()[:16] for value in ids.unique()}
+                anonymized[field] = ids.map(hashed)
+            else:
+                anonymized[field] = "[REDACTED]"
+        
+        return anonymized
+    
     def validate_data_access(self, user_role, requested_fields):
         """Validate if user can access requested data fields"""
-        access_matrix = {
-            "citizen_service": ["service_type", "district", "status", "priority_score"],
-            "data_analyst": ["service_type", "district", "status", "priority_score", "request_count", "resolution_time"],
-            "admin": ["*"]  # Full access
-        }
-        
-        allowed_fields = access_matrix.get(user_role, [])
+        allowed_fields = self.ACCESS_MATRIX.get(user_role, [])
         
         if "*" in allowed_fields:
             return True
             
         return all(field in allowed_fields for field in requested_fields)
     
+    def project_fields(self, user_role, fields):
+        """The subset of ``fields`` the role may read, in their original order"""
+        allowed_fields = self.ACCESS_MATRIX.get(user_role, [])
+        if "*" in allowed_fields:
+            return list(fields)
+        return [field for field in fields if field in allowed_fields]
+    
     def create_audit_log(self, user_id, action, resource, timestamp):
         """Create audit log entry"""
         audit_entry = {
@@ -82,11 +125,10 @@ class SecurityFramework:
         FROM `{Config.PROJECT_ID}.{Config.DATASET_ID}.INFORMATION_SCHEMA.TABLES`
         """
         
-        try:
-            self.bq_client.query(retention_query)
-            print("Data retention policy created")
-        except Exception as e:
-            print(f"Retention policy error: {e}")
+        # Waits for the job, so a failed query raises instead of passing as done
+        with timed(WAREHOUSE_LATENCY, query="data_retention"):
+            self.bq_client.query(retention_query).result()
+        print("Data retention policy created")
     
     def encrypt_sensitive_data(self, data):
         """Basic encryption for sensitive data fields"""
@@ -1,43 +1,43 @@
-import google.generativeai as genai
-from google.cloud import bigquery
 from datetime import datetime, timedelta
-import json
+from collections import OrderedDict
 from config import Config
+from request_digest import RequestDigest
+from metrics import WAREHOUSE_LATENCY, timed
+from dedup_index import ComplaintDeduplicator, classify_with_dedup
+from llm_client import shared_client
+from query_analysis import calculate_priority
 
 class ServicePrioritizationEngine:
-    def __init__(self, api_key):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
-        self.bq_client = bigquery.Client(project=Config.PROJECT_ID)
+    def __init__(self, api_key=None, llm=None, bq_client=None):
+        self.llm = llm or shared_client(api_key=api_key)
+        self._bq_client = bq_client
+        self._bq_unavailable = False
+        self._summary_cache = OrderedDict()
+        self.deduplicator = ComplaintDeduplicator()
+    
+    @property
+    def bq_client(self):
+        """BigQuery client, created on first use so the engine also runs offline"""
+        if self._bq_client is None and not self._bq_unavailable:
+            try:
+                from google.cloud import bigquery
+                self._bq_client = bigquery.Client(project=Config.PROJECT_ID)
+            except Exception as e:
+                # No credentials or no network: don't retry on every request
+                self._bq_unavailable = True
+                print(f"⚠️ BigQuery unavailable, routing without workload data: {e}")
+        return self._bq_client
         
     def analyze_citizen_query(self, query_text):
         """Use Gemini to analyze and categorize citizen queries"""
-        prompt = f"""
-        Analyze this citizen service request and provide:
-        1. Service category (health, infrastructure, safety, education, other)
-        2. Urgency level (low, medium, high, critical)
-        3. Required department
-        4. Estimated resolution time in days
-        
-        Query: {query_text}
-        
-        Respond in JSON format only.
-        """
-        
-        response = self.model.generate_content(prompt)
-        try:
-            return json.loads(response.text)
-        except:
-            return {
-                "service_category": "other",
-                "urgency_level": "medium", 
-                "department": "general",
-                "estimated_days": 7
-            }
+        # Falls back to keyword rules when Gemini is throttled or down
+        analysis, _, _ = self.llm.analyze(query_text)
+        return analysis
     
-    def route_service_request(self, request_data):
+    def route_service_request(self, request_data, analysis=None):
         """Route service requests based on priority and capacity"""
-        analysis = self.analyze_citizen_query(request_data['description'])
+        if analysis is None:
+            analysis = self.analyze_citizen_query(request_data['description'])
         
         # Calculate priority score
         priority_score = self._calculate_priority(
@@ -61,15 +61,26 @@ class ServicePrioritizationEngine:
             'routing_timestamp': datetime.now().isoformat()
         }
     
+    def route_service_requests(self, requests_data):
+        """Route a burst of requests, classifying each near-duplicate cluster once"""
+        analyses, _ = classify_with_dedup(
+            ({'district': request.get('district'), **request} for request in requests_data),
+            self._classify_for_cluster,
+            self.deduplicator
+        )
+        return [
+            self.route_service_request(request, analyses[request['id']])
+            for request in requests_data
+        ]
+    
+    def _classify_for_cluster(self, query_text):
+        # A keyword fallback is not cached for the cluster, so duplicates get the LLM once it recovers
+        analysis, _, fallback = self.llm.analyze(query_text)
+        return analysis, not fallback
+    
     def _calculate_priority(self, urgency, feedback_score, estimated_days):
         """Calculate dynamic priority score"""
-        urgency_weights = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
-        
-        base_score = urgency_weights.get(urgency, 2) * 25
-        feedback_bonus = (feedback_score - 3) * 5  # Boost for high citizen ratings
-        time_penalty = max(0, (estimated_days - 3) * 2)  # Penalty for long resolution
-        
-        return min(100, max(10, base_score + feedback_bonus - time_penalty))
+        return int(calculate_priority(urgency, feedback_score, estimated_days))
     
     def _find_optimal_department(self, category, suggested_dept):
         """Find department with optimal capacity"""
@@ -82,8 +93,12 @@ class ServicePrioritizationEngine:
         ORDER BY active_requests ASC
         """
         
+        if self.bq_client is None:
+            return suggested_dept
+        
         try:
-            results = self.bq_client.query(query).to_dataframe()
+            with timed(WAREHOUSE_LATENCY, query="department_workload"):
+                results = self.bq_client.query(query).to_dataframe()
             if not results.empty:
                 return results.iloc[0]['department']
         except:
@@ -91,12 +106,29 @@ class ServicePrioritizationEngine:
             
         return suggested_dept
     
-    def generate_summary_report(self, requests_data):
-        """Generate executive summary using Gemini"""
+    def generate_summary_report(self, requests_data, stream=False):
+        """Generate executive summary using Gemini
+        
+        With ``stream=True`` returns an iterable of text chunks (a TextStream,
+        or the cached text as a single chunk) for ``st.write_stream``.
+        """
+        # One pass over the full request set; the digest has a fixed size
+        digest = RequestDigest().update(requests_data)
+        cache_key = digest.fingerprint()
+        
+        if cache_key in self._summary_cache:
+            self._summary_cache.move_to_end(cache_key)
+            cached = self._summary_cache[cache_key]
+            return iter([cached]) if stream else cached
+        
         summary_prompt = f"""
-        Generate an executive summary for Maharashtra governance dashboard:
+        Generate an executive summary for Maharashtra governance dashboard.
+        
+        The data below is a statistical digest of all citizen service requests:
+        counts by district and category, resolution time quantiles (days),
+        priority score quantiles and the most frequent concerns.
         
-        Data: {json.dumps(requests_data[:10])}  # Limit for token efficiency
+        Digest: {digest.to_prompt()}
         
         Include:
         - Key trends in citizen service requests
@@ -107,5 +139,16 @@ class ServicePrioritizationEngine:
         Keep response under 200 words.
         """
         
-        response = self.model.generate_content(summary_prompt)
-        return response.text
\ No newline at end of file
+        if stream:
+            # Only a summary that streamed to the end is cached
+            return self.llm.stream(summary_prompt, feature="executive_summary",
+                                   on_complete=lambda text: self._cache_summary(cache_key, text))
+        
+        response = self.llm.generate(summary_prompt, feature="executive_summary")
+        self._cache_summary(cache_key, response.text)
+        return response.text
+    
+    def _cache_summary(self, cache_key, text):
+        self._summary_cache[cache_key] = text
+        if len(self._summary_cache) > Config.SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Versioned read-only snapshots shared by every dashboard worker
+
+One refresher process builds the expensive shared state (metric rollups,
+reference tables) and publishes it here as a new version; each worker maps
+the files instead of building its own copy.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+import numpy as np
+from config import Config
+
+MANIFEST = 'manifest.json'
+
+
+def publish(arrays=None, tables=None, metadata=None, root=None):
+    """Write a new snapshot version and make it current; returns its number
+
+    ``arrays`` are NumPy arrays and ``tables`` Arrow tables (or DataFrames),
+    by name. The files go into a fresh version directory first; the swap is
+    a single ``os.replace`` of the manifest, so a reader sees either the old
+    version or the new one, never a mix.
+    """
+    root = root or Config.SHARED_CACHE_DIR
+    os.makedirs(root, exist_ok=True)
+    current = _read_manifest(root)
+    version = (current['version'] if current else 0) + 1
+    directory = f"v{version:06d}"
+    staging = os.path.join(root, directory + '.tmp')
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    entries = {}
+    for name, array in (arrays or {}).items():
+        entries[name] = {'kind': 'numpy', 'file': name + '.npy'}
+        np.save(os.path.join(staging, entries[name]['file']), np.ascontiguousarray(array))
+    if tables:
+        # Imported here so array-only snapshots don't need pyarrow installed
+        import pyarrow as pa
+        for name, table in tables.items():
+            if not isinstance(table, pa.Table):
+                table = pa.Table.from_pandas(table, preserve_index=False)
+            entries[name] = {'kind': 'arrow', 'file': name + '.arrow'}
+            with pa.OSFile(os.path.join(staging, entries[name]['file']), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    os.rename(staging, os.path.join(root, directory))
+
+    manifest = {'version': version, 'directory': directory, 'published': time.time(),
+                'entries': entries, 'metadata': metadata or {}}
+    tmp_path = os.path.join(root, MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(root, MANIFEST))
+
+    _prune(root, version)
+    return version
+
+
+def _prune(root, version):
+    # Workers still mapping a removed version keep their pages until they unmap
+    keep = {f"v{v:06d}" for v in range(version - Config.SHARED_CACHE_KEEP_VERSIONS + 1, version + 1)}
+    for name in os.listdir(root):
+        if name.startswith('v') and name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def _read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class Snapshot:
+    """One published version, mapped into this process
+
+    NumPy entries are read-only memory maps and Arrow entries tables over
+    a memory-mapped file, so no data is copied: every worker attached to a
+    version shares the same page-cache pages.
+    """
+
+    def __init__(self, root, manifest):
+        self.version = manifest['version']
+        self.published = manifest['published']
+        self.metadata = manifest['metadata']
+        self.path = os.path.join(root, manifest['directory'])
+        self.entries = manifest['entries']
+        self._mapped = {}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __getitem__(self, name):
+        if name not in self._mapped:
+            self._mapped[name] = self._map(name, private=False)
+        return self._mapped[name]
+
+    def array(self, name, private=False):
+        """A NumPy entry; ``private`` maps it copy-on-write so this process may modify it"""
+        return self._map(name, private) if private else self[name]
+
+    def _map(self, name, private):
+        entry = self.entries[name]
+        path = os.path.join(self.path, entry['file'])
+        if entry['kind'] == 'numpy':
+            return np.load(path, mmap_mode='c' if private else 'r')
+        import pyarrow as pa
+        return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+    def map_all(self):
+        """Map every entry now, so the version stays readable even if it is pruned"""
+        for name in self.entries:
+            self[name]
+        return self
+
+
+class SharedCache:
+    """A worker's handle on the published snapshots
+
+    ``current`` checks the manifest at most every poll interval and, when
+    a new version is out, maps it and swaps the reference in one
+    assignment. Callers keep the snapshot they got for a whole rerun, so
+    a page never mixes two versions.
+    """
+
+    def __init__(self, root=None, poll_seconds=None):
+        self.root = root or Config.SHARED_CACHE_DIR
+        self.poll_seconds = Config.SHARED_CACHE_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._snapshot = None
+        self._checked = 0.0
+        self._manifest_stamp = None
+
+    def current(self):
+        """The newest published snapshot, or None before the first publish"""
+        now = time.monotonic()
+        if now - self._checked >= self.poll_seconds:
+            self._checked = now
+            self._refresh()
+        return self._snapshot
+
+    def _refresh(self):
+        try:
+            stat = os.stat(os.path.join(self.root, MANIFEST))
+        except FileNotFoundError:
+            return
+        # Every publish replaces the manifest with a new file; the inode tells
+        # apart two publishes within one (coarse) mtime tick
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._manifest_stamp:
+            return
+        manifest = _read_manifest(self.root)
+        if manifest is None:
+            return
+        if self._snapshot is None or manifest['version'] != self._snapshot.version:
+            try:
+                snapshot = Snapshot(self.root, manifest).map_all()
+            except FileNotFoundError:
+                return  # Pruned between reading the manifest and mapping; the next poll sees a newer one
+            self._snapshot = snapshot
+            print(f"🔄 Attached shared snapshot v{snapshot.version}")
+        self._manifest_stamp = stamp
+
+
+def refresh(build, root=None):
+    """Build the shared state once and publish it; returns the version"""
+    started = time.perf_counter()
+    arrays, tables, metadata = build()
+    version = publish(arrays, tables, metadata, root)
+    directory = os.path.join(root or Config.SHARED_CACHE_DIR, f"v{version:06d}")
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    print(f"✅ Published shared snapshot v{version}: {len(os.listdir(directory))} entries, "
+          f"{size / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+    return version
+
+
+if __name__ == "__main__":
+    # Imported here so workers importing this module don't pull in the dashboard
+    from working_dashboard import shared_state
+
+    parser = argparse.ArgumentParser(description="Publish shared dashboard snapshots")
+    parser.add_argument('--root', default=Config.SHARED_CACHE_DIR)
+    parser.add_argument('--interval', type=float, default=Config.SHARED_CACHE_REFRESH_SECONDS,
+                        help="Seconds between publishes")
+    parser.add_argument('--once', action='store_true', help="Publish one version and exit")
+    args = parser.parse_args()
+
+    print(f"📦 Shared cache refresher writing to {args.root}")
+    try:
+        while True:
+            try:
+                refresh(shared_state, args.root)
+            except Exception as e:
+                if args.once:
+                    raise
+                print(f"⚠️ Refresh failed, workers keep the previous version: {e}")
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Shared cache refresher stopped")
@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# Maharashtra AI Governance Platform web process
+#
+# Runs the shared cache refresher next to the dashboard on the same host:
+# workers map its snapshots from local /dev/shm, so a refresher in another
+# container would never be seen. The refresher is restarted if it exits.
+
+(
+    while true; do
+        python shared_cache.py
+        echo "⚠️ Shared cache refresher exited with status $?; restarting in 5s"
+        sleep 5
+    done
+) &
+
+exec streamlit run working_dashboard.py --server.port "${PORT:-8501}" --server.address 0.0.0.0 --server.headless true
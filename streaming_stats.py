@@ -0,0 +1,201 @@
+import math
+import numpy as np
+
+
+class QuantileSketch:
+    """Bounded-memory quantile sketch with relative-error log buckets"""
+
+    def __init__(self, relative_accuracy=0.02, max_buckets=512):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, weight=1):
+        """Add a non-negative observation to the sketch"""
+        if value is None:
+            return
+        value = float(value)
+        if value != value or value < 0:
+            return
+
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        if value == 0:
+            self.zero_count += weight
+            return
+
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + weight
+
+        if len(self.buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def _collapse_lowest(self):
+        """Merge the two lowest buckets so memory stays bounded"""
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        for key, weight in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def quantile(self, q):
+        """Estimate the q-th quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(self.max, max(self.min, estimate))
+
+        return self.max
+
+
+class TopK:
+    """Space-Saving heavy hitters: approximate top-k in O(capacity) memory"""
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item, weight=1):
+        """Count one occurrence of an item"""
+        if item in self.counts:
+            self.counts[item] += weight
+            return
+
+        if len(self.counts) < self.capacity:
+            self.counts[item] = weight
+            self.errors[item] = 0
+            return
+
+        # Evict the current minimum and inherit its count as the error bound
+        victim = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(victim)
+        self.errors.pop(victim)
+        self.counts[item] = floor + weight
+        self.errors[item] = floor
+
+    def top(self, k):
+        """Return the k heaviest items as (item, count) pairs"""
+        # Ties break on the item's text, so None or mixed-type items still sort
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0] is None, str(kv[0])))[:k]
+
+
+class RunningMoments:
+    """Welford running mean and variance; batches fold in with Chan's update"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        """Add one observation"""
+        value = float(value)
+        if value != value:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update(self, values):
+        """Add a batch of observations; NaNs are skipped"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.merge(RunningMoments(len(values), values.mean(), ((values - values.mean()) ** 2).sum()))
+
+    def merge(self, other):
+        """Fold another set of moments into this one"""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['count'], state['mean'], state['m2'])
+
+
+class Histogram:
+    """Counts over fixed bin edges; the first and last bins are open-ended"""
+
+    def __init__(self, edges, counts=None):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if counts is None:
+            counts = np.zeros(len(self.edges) + 1)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_quantiles(cls, values, bins=10):
+        """Histogram of ``values`` over their own quantile edges, about equal counts per bin"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])) if len(values) else []
+        histogram = cls(edges)
+        histogram.update(values)
+        return histogram
+
+    def update(self, values):
+        """Count a batch of observations; NaNs are skipped"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(self.counts))
+
+    def merge(self, other):
+        """Fold in another histogram over the same edges"""
+        self.counts += other.counts
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def proportions(self):
+        total = self.counts.sum()
+        return self.counts / total if total else np.zeros(len(self.counts))
+
+    def to_dict(self):
+        return {'edges': self.edges.tolist(), 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['edges'], state['counts'])
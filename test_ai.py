@@ -1,12 +1,13 @@
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
+from llm_client import LLMClient
+from llm_providers import GeminiProvider
 
 load_dotenv()
 
 # Test Gemini AI connection
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel('gemini-pro')
+# Same limits and retries as the platform, but no fallback: this is a connection test
+client = LLMClient(GeminiProvider(api_key=os.getenv("GEMINI_API_KEY")))
 
 # Test query
 test_query = "Water supply issue in Pune area, urgent help needed"
@@ -25,11 +26,12 @@ Provide analysis:
 """
 
 try:
-    response = model.generate_content(prompt)
+    response = client.generate(prompt, feature="connection_test")
     print("✅ AI Analysis Working!")
     print("=" * 50)
     print(response.text)
     print("=" * 50)
     print("🎉 Maharashtra AI Governance Platform is fully operational!")
 except Exception as e:
-    print(f"❌ AI Error: {e}")
\ No newline at end of file
+    # LLMUnavailable wraps the underlying API error
+    print(f"❌ AI Error: {e.__cause__ or e}")
\ No newline at end of file
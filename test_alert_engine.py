@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sliding-window counters and threshold/spike alerts
+"""
+
+import unittest
+import numpy as np
+from alert_engine import RingCounter, StreamingAlertEngine
+
+
+class RingCounterTest(unittest.TestCase):
+
+    def setUp(self):
+        # 10 one-second slots, the last 3 of which form the short window
+        self.ring = RingCounter(rows=2, slots=10, short_slots=3, bucket_seconds=1)
+
+    def test_buckets_retire_from_short_then_long_window(self):
+        self.ring.add(0, 0.5, amount=4)
+        self.ring.add(1, 1.5)
+        np.testing.assert_array_equal(self.ring.short_totals, [4, 1])
+
+        self.ring.advance(3)
+        np.testing.assert_array_equal(self.ring.short_totals, [0, 1])
+        np.testing.assert_array_equal(self.ring.long_totals, [4, 1])
+
+        self.ring.advance(10)
+        np.testing.assert_array_equal(self.ring.long_totals, [0, 1])
+        self.ring.advance(11)
+        np.testing.assert_array_equal(self.ring.long_totals, [0, 0])
+        self.assertEqual(self.ring.counts.sum(), 0)
+
+    def test_late_events_and_long_gaps(self):
+        self.ring.add(0, 20)
+        self.ring.add(0, 18)
+        self.ring.add(0, 5)  # Older than the baseline window
+        self.assertEqual((self.ring.short_totals[0], self.ring.long_totals[0]), (2, 2))
+
+        self.ring.advance(100)
+        self.assertEqual((self.ring.short_totals[0], self.ring.long_totals[0]), (0, 0))
+        self.assertEqual(self.ring.head, 100)
+
+    def test_grow_keeps_existing_counts(self):
+        self.ring.add(1, 0, amount=2)
+        self.ring.grow(5)
+        self.assertEqual(self.ring.counts.shape, (5, 10))
+        np.testing.assert_array_equal(self.ring.long_totals, [0, 2, 0, 0, 0])
+
+
+class StreamingAlertEngineTest(unittest.TestCase):
+
+    def engine(self, **kwargs):
+        settings = dict(window_minutes=5, baseline_hours=1, bucket_seconds=60,
+                        threshold=10, spike_ratio=3, min_spike_count=4, max_exact_keys=4)
+        settings.update(kwargs)
+        return StreamingAlertEngine(**settings)
+
+    def test_threshold_alert_fires_and_clears_when_window_passes(self):
+        engine = self.engine()
+        for second in range(10):
+            engine.record('Pune', 'water', 3600 + second)
+
+        alerts = engine.current_alerts(now=3610)
+        self.assertEqual([(a['type'], a['count']) for a in alerts], [('High Priority', 10)])
+        self.assertEqual(alerts[0]['fired_at'], 3609)
+        self.assertEqual(engine.current_alerts(now=3600 + 6 * 60), [])
+
+    def test_spike_against_baseline_rate(self):
+        engine = self.engine()
+        # Steady one request per 5 minutes over the last hour, then a burst
+        for minute in range(0, 55, 5):
+            engine.record('Nagpur', 'roads', minute * 60)
+        for second in range(5):
+            engine.record('Nagpur', 'roads', 3300 + second)
+
+        self.assertEqual([a['type'] for a in engine.current_alerts(now=3310)], ['Spike'])
+
+    def test_keys_beyond_exact_limit_use_the_sketch(self):
+        engine = self.engine(max_exact_keys=2)
+        for district in ('A', 'B', 'C'):
+            for second in range(10):
+                engine.record(district, 'water', second)
+
+        self.assertEqual(len(engine._keys), 2)
+        alerts = engine.current_alerts(now=10)
+        self.assertEqual(sorted(a['district'] for a in alerts), ['A', 'B', 'C'])
+        # Count-min never undercounts
+        self.assertTrue(all(a['count'] >= 10 for a in alerts))
+
+
+if __name__ == "__main__":
+    unittest.main()
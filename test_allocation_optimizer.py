@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Budget allocation over a small district x service grid
+"""
+
+import unittest
+import warnings
+import numpy as np
+from allocation_optimizer import allocate_budget
+
+DEMAND = np.array([[10.0, 0.0], [5.0, 3.0]])
+COST = 100.0
+NEED = DEMAND * COST
+
+
+class AllocateBudgetTest(unittest.TestCase):
+
+    def allocate(self, budget, **kwargs):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return allocate_budget(DEMAND, budget, cost_per_request=COST, **kwargs)
+
+    def test_unbinding_budget_funds_full_need(self):
+        result = self.allocate(1e9)
+        self.assertTrue(result['feasible'])
+        self.assertEqual(result['multiplier'], 0.0)
+        np.testing.assert_allclose(result['allocation'], NEED)
+        self.assertEqual(result['coverage'][0, 1], 0.0)
+
+    def test_binding_budget_is_spent_with_equal_marginal_value(self):
+        result = self.allocate(1000, min_level=0.1)
+        self.assertTrue(result['feasible'])
+        self.assertAlmostEqual(result['spent'], 1000, delta=1e-6)
+        allocation = result['allocation']
+        self.assertTrue((allocation >= 0.1 * NEED - 1e-9).all())
+        # Marginal value exp(-x / need) (weights and cost equal) is the same in every cell above its minimum
+        funded = (allocation > 0.1 * NEED + 1e-6) & (NEED > 0)
+        marginal = np.exp(-allocation[funded] / NEED[funded])
+        np.testing.assert_allclose(marginal, marginal[0], rtol=1e-6)
+
+    def test_service_cap_limits_spend(self):
+        result = self.allocate(1e9, service_caps=[600, 1e9])
+        self.assertTrue(result['feasible'])
+        self.assertLessEqual(result['allocation'][:, 0].sum(), 600 + 1e-6)
+        np.testing.assert_allclose(result['allocation'][:, 1], NEED[:, 1])
+
+    def test_minimums_over_budget_are_funded_pro_rata(self):
+        result = self.allocate(500, min_level=0.5)
+        self.assertFalse(result['feasible'])
+        self.assertEqual(len(result['over_cap']), 0)
+        self.assertAlmostEqual(result['spent'], 500)
+        np.testing.assert_allclose(result['allocation'], 0.5 * NEED * 500 / (0.5 * NEED.sum()))
+
+    def test_minimums_over_service_cap_are_reported(self):
+        result = self.allocate(1e9, min_level=0.5, service_caps=[500, 1e9])
+        self.assertFalse(result['feasible'])
+        self.assertEqual(list(result['over_cap']), [0])
+        self.assertAlmostEqual(result['allocation'][:, 0].sum(), 500)
+        np.testing.assert_allclose(result['allocation'][:, 1], 0.5 * NEED[:, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
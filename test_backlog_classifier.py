@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Folded-IDF backlog classifier against sklearn's TF-IDF pipeline, and batch
+reclassification
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from config import Config
+from backlog_classifier import BacklogClassifier, reclassify, terms
+
+PHRASES = {
+    'water': ["water pipe leaking", "no water supply", "पाणी पुरवठा बंद", "paani nahi aala"],
+    'roads': ["pothole on the road", "road damaged after rain", "रस्ता खराब", "street broken"],
+    'health': ["no doctor at hospital", "ambulance late", "medicine not available", "clinic closed"],
+}
+N_FEATURES = 2 ** 12
+
+
+def history(rows, seed):
+    rng = np.random.default_rng(seed)
+    categories = rng.choice(list(PHRASES), rows)
+    descriptions = [f"{rng.choice(PHRASES[category])} near ward {rng.integers(1, 40)}" for category in categories]
+    return pd.DataFrame({
+        'request_id': [f"REQ_{seed}_{i}" for i in range(rows)],
+        'description': descriptions,
+        'service_category': categories,
+        # Two classes, to cover the binary coefficient layout
+        'urgent': np.where(categories == 'health', 'yes', 'no')
+    })
+
+
+def sklearn_pipeline(descriptions, labels):
+    """The unfolded TF-IDF pipeline the classifier must reproduce"""
+    vectorizer = HashingVectorizer(analyzer=terms, n_features=N_FEATURES, alternate_sign=False, norm=None,
+                                   dtype=np.float32)
+    tfidf = TfidfTransformer(sublinear_tf=True).fit(vectorizer.transform(descriptions))
+    model = SGDClassifier(loss='log_loss', alpha=Config.CLASSIFIER_ALPHA, max_iter=20, tol=None, random_state=42)
+    model.fit(tfidf.transform(vectorizer.transform(descriptions)), labels)
+    return lambda texts: model.decision_function(tfidf.transform(vectorizer.transform(texts))), model.classes_
+
+
+def confidence(block):
+    probabilities = 1 / (1 + np.exp(-block))
+    return (probabilities.max(axis=1) / probabilities.sum(axis=1)).round(3)
+
+
+class BacklogClassifierTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.train = history(600, seed=1)
+        cls.classifier = BacklogClassifier(n_features=N_FEATURES, targets=('service_category', 'urgent'))
+        cls.accuracy = cls.classifier.fit(cls.train['description'],
+                                          {target: cls.train[target] for target in cls.classifier.targets})
+
+    def test_predict_matches_sklearn_tfidf_pipeline(self):
+        holdout = history(200, seed=2)['description']
+        predicted = self.classifier.predict(holdout)
+
+        for target in self.classifier.targets:
+            decision, classes = sklearn_pipeline(self.train['description'], self.train[target])
+            scores = decision(holdout)
+            if scores.ndim == 1:
+                scores = np.column_stack([-scores, scores]) / 2
+            np.testing.assert_array_equal(predicted[target], classes[scores.argmax(axis=1)])
+            np.testing.assert_allclose(predicted[f"{target}_confidence"], confidence(scores), atol=0.0015)
+
+    def test_learns_folded_marathi_spellings(self):
+        self.assertGreater(self.accuracy['service_category'], 0.95)
+        predicted = self.classifier.predict(["paani puravatha band", "rasta kharab", ""])
+        self.assertEqual(predicted['service_category'].tolist()[:2], ['water', 'roads'])
+        self.assertEqual(len(predicted), 3)
+
+    def test_reclassify_keeps_order_and_counts(self):
+        backlog = history(300, seed=3)
+        batches = [backlog.iloc[start:start + 70] for start in range(0, 300, 70)]
+        for workers in (1, 2):
+            delivered = []
+            summary = reclassify(self.classifier, iter(batches), delivered.append, workers=workers)
+
+            self.assertEqual((summary['rows'], summary['batches']), (300, 5))
+            result = pd.concat(delivered)
+            self.assertEqual(result['request_id'].tolist(), backlog['request_id'].tolist())
+            self.assertIn('classified_at', result)
+            low = result[['service_category_confidence', 'urgent_confidence']].min(axis=1)
+            self.assertEqual(summary['low_confidence'], int((low < Config.CLASSIFIER_REVIEW_CONFIDENCE).sum()))
+
+    def test_save_load_round_trip(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        path = os.path.join(root.name, 'classifier.pkl')
+        self.classifier.save(path)
+
+        descriptions = history(50, seed=4)['description']
+        pd.testing.assert_frame_equal(BacklogClassifier.load(path).predict(descriptions),
+                                      self.classifier.predict(descriptions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted bootstrap step graph: skips, reruns, failures and parallelism
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from bootstrap import Bootstrap
+
+
+class BootstrapTest(unittest.TestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        self.state_path = os.path.join(self.root, 'state.json')
+        self.inputs = {'schema': 1, 'models': 1}
+        self.calls = []
+
+    def step(self, name, fail=False):
+        def run():
+            self.calls.append(name)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+        return run
+
+    def boot(self, force=False, fail=()):
+        bootstrap = Bootstrap(self.state_path, workers=4)
+        bootstrap.add('schema', self.step('schema', 'schema' in fail), fingerprint=lambda: self.inputs['schema'])
+        bootstrap.add('tables', self.step('tables', 'tables' in fail), deps=['schema'], fingerprint=lambda: 1)
+        bootstrap.add('models', self.step('models', 'models' in fail), fingerprint=lambda: self.inputs['models'],
+                      outputs=[os.path.join(self.root, 'model.pkl')])
+        bootstrap.add('dashboard', self.step('dashboard'), deps=['tables', 'models'])
+        self.calls = []
+        with redirect_stdout(StringIO()):
+            report = bootstrap.run(force)
+        return {name: result['status'] for name, result in report['steps'].items()}, report
+
+    def test_unchanged_steps_are_skipped_and_changes_rerun_downstream(self):
+        open(os.path.join(self.root, 'model.pkl'), 'w').close()
+        self.boot()
+
+        statuses, _ = self.boot()
+        self.assertEqual(statuses, {'schema': 'skipped', 'tables': 'skipped', 'models': 'skipped',
+                                    'dashboard': 'ran'})
+
+        self.inputs['schema'] = 2
+        statuses, _ = self.boot()
+        self.assertEqual((statuses['schema'], statuses['tables'], statuses['models']), ('ran', 'ran', 'skipped'))
+        self.assertEqual(sorted(self.calls), ['dashboard', 'schema', 'tables'])
+
+        statuses, _ = self.boot(force=True)
+        self.assertEqual(set(statuses.values()), {'ran'})
+
+    def test_missing_output_reruns_step(self):
+        self.boot()
+        statuses, _ = self.boot()
+        self.assertEqual(statuses['models'], 'ran')
+
+    def test_failure_blocks_dependents_and_retries_next_boot(self):
+        statuses, report = self.boot(fail=('schema',))
+        self.assertEqual((statuses['schema'], statuses['tables'], statuses['dashboard']),
+                         ('failed', 'blocked', 'blocked'))
+        self.assertEqual(report['steps']['schema']['error'], "schema broke")
+
+        statuses, _ = self.boot()
+        self.assertEqual((statuses['schema'], statuses['tables']), ('ran', 'ran'))
+
+    def test_independent_steps_run_concurrently_and_critical_path(self):
+        barrier = threading.Barrier(2, timeout=5)
+        bootstrap = Bootstrap(self.state_path, workers=2)
+        # Each waits for the other, so this only finishes if both run at once
+        bootstrap.add('left', barrier.wait)
+        bootstrap.add('right', barrier.wait)
+        bootstrap.add('slow', lambda: threading.Event().wait(0.2), deps=['left'])
+        bootstrap.add('join', lambda: None, deps=['slow', 'right'])
+        with redirect_stdout(StringIO()):
+            report = bootstrap.run()
+
+        self.assertEqual({result['status'] for result in report['steps'].values()}, {'ran'})
+        self.assertEqual(report['critical_path'], ['left', 'slow', 'join'])
+        with self.assertRaises(ValueError):
+            bootstrap.add('orphan', lambda: None, deps=['missing'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Streamed, role-projected and anonymized exports
+"""
+
+import gzip
+import os
+import tempfile
+import unittest
+import pandas as pd
+import pyarrow.parquet as pq
+from data_export import FORMATS, export_batches
+
+
+def batches(count=3, rows=100):
+    for index in range(count):
+        start = index * rows
+        yield pd.DataFrame({
+            'request_id': [f"REQ_{i}" for i in range(start, start + rows)],
+            'citizen_id': [f"CIT_{i % 7}" for i in range(start, start + rows)],
+            'phone': ['9800000000'] * rows,
+            'district': pd.Categorical(['Pune' if index else 'Nagpur'] * rows),
+            'priority_score': range(start, start + rows)
+        })
+
+
+class ExportBatchesTest(unittest.TestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+
+    def path(self, fmt):
+        return os.path.join(self.root, 'export' + FORMATS[fmt]['suffix'])
+
+    def test_parquet_is_projected_per_role(self):
+        summary = export_batches(batches(), self.path('parquet'), 'parquet', 'citizen_service')
+
+        self.assertEqual((summary['rows'], summary['batches']), (300, 3))
+        self.assertEqual(summary['fields'], ['district', 'priority_score'])
+        table = pq.read_table(self.path('parquet'))
+        self.assertEqual(table.column_names, ['district', 'priority_score'])
+        self.assertEqual(pq.ParquetFile(self.path('parquet')).num_row_groups, 3)
+        # A category first seen in a later batch is kept
+        self.assertEqual(set(table.column('district').to_pylist()), {'Nagpur', 'Pune'})
+
+    def test_csv_anonymizes_pii_and_writes_one_header(self):
+        summary = export_batches(batches(), self.path('csv'), 'csv', 'admin')
+
+        with gzip.open(self.path('csv'), 'rt') as f:
+            frame = pd.read_csv(f, dtype=str)
+        self.assertEqual(len(frame), summary['rows'])
+        self.assertEqual(list(frame.columns), summary['fields'])
+        self.assertEqual(set(frame['phone']), {'[REDACTED]'})
+        self.assertEqual(frame['citizen_id'].nunique(), 7)
+        self.assertFalse(frame['citizen_id'].str.startswith('CIT_').any())
+
+    def test_failures_leave_no_file(self):
+        with self.assertRaises(PermissionError):
+            export_batches(batches(), self.path('parquet'), 'parquet', 'visitor')
+        with self.assertRaises(ValueError):
+            export_batches(iter([]), self.path('csv'), 'csv', 'admin')
+        self.assertEqual(os.listdir(self.root), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compact dtypes of the training frame and the demand model's vocabularies
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from data_pipeline import compact_frame
+from predictive_models import PredictiveModels
+
+
+def query_result(rows=400):
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'district': rng.choice(['Mumbai', 'Pune', 'Nagpur'], rows).astype(object),
+        'service_type': rng.choice(['Health', 'Infrastructure'], rows).astype(object),
+        'request_count': rng.poisson(120, rows).astype('int64'),
+        'resolution_time': rng.gamma(2.0, 2.2, rows),
+        'month': rng.integers(1, 13, rows).astype('int64'),
+        'day_of_week': rng.integers(1, 8, rows).astype('int64')
+    })
+
+
+class CompactFrameTest(unittest.TestCase):
+
+    def test_dtypes_shrink_and_values_survive(self):
+        original = query_result()
+        frame = compact_frame(original.copy())
+
+        self.assertIsInstance(frame['district'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(frame['service_type'].dtype, pd.CategoricalDtype)
+        self.assertEqual(frame['month'].dtype, np.int8)
+        self.assertEqual(frame['day_of_week'].dtype, np.int8)
+        self.assertEqual(frame['request_count'].dtype, np.int16)
+        self.assertEqual(frame['resolution_time'].dtype, np.float32)
+
+        pd.testing.assert_frame_equal(frame.astype(original.dtypes), original, check_exact=False, rtol=1e-6)
+        self.assertLess(frame.memory_usage(deep=True).sum(), original.memory_usage(deep=True).sum() / 4)
+
+
+class DemandVocabularyTest(unittest.TestCase):
+
+    def test_training_keeps_existing_codes_and_leaves_input_untouched(self):
+        models = PredictiveModels()
+        # Encoders pickled by older runs were LabelEncoders
+        models.encoders['district'] = LabelEncoder().fit(['Pune', 'Thane'])
+        data = compact_frame(query_result())
+        columns = list(data.columns)
+
+        models.train_demand_predictor(data)
+
+        self.assertEqual(models.vocabulary('district'), ['Pune', 'Thane', 'Mumbai', 'Nagpur'])
+        self.assertEqual(models.vocabulary('service'), ['Health', 'Infrastructure'])
+        self.assertEqual(list(data.columns), columns)
+        self.assertIsNotNone(models.predict_service_demand('Nagpur', 'Health', 6, 3, 4.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate clustering and per-cluster classification reuse
+"""
+
+import unittest
+from dedup_index import ComplaintDeduplicator, classify_with_dedup
+
+LEAK = "Water pipe burst near the railway station road, water flooding the street since morning"
+LEAK_AGAIN = "Water pipe burst near the railway station road, water flooding the street since morning!!"
+POTHOLE = "Huge pothole outside the municipal school gate is causing accidents every evening"
+
+
+class Classifier:
+    """Counts calls; ``fallback`` marks results as the degraded keyword answer"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fallback = False
+
+    def __call__(self, text):
+        self.calls += 1
+        return {'label': 'keyword' if self.fallback else 'llm', 'call': self.calls}, not self.fallback
+
+
+def request(request_id, text, timestamp, district='Pune'):
+    return {'id': request_id, 'description': text, 'district': district, 'timestamp': timestamp}
+
+
+class ComplaintDeduplicatorTest(unittest.TestCase):
+
+    def test_near_duplicates_share_a_cluster_per_district(self):
+        index = ComplaintDeduplicator(window_seconds=3600)
+        first = index.add('r1', LEAK, 'Pune', 0)
+        self.assertEqual(index.add('r2', LEAK_AGAIN, 'Pune', 1), first)
+        self.assertNotEqual(index.add('r3', POTHOLE, 'Pune', 2), first)
+        self.assertNotEqual(index.add('r4', LEAK, 'Nagpur', 3), first)
+        self.assertEqual(index.members(first), ['r1', 'r2'])
+
+    def test_idle_cluster_expires_with_window(self):
+        index = ComplaintDeduplicator(window_seconds=100)
+        first = index.add('r1', LEAK, 'Pune', 0)
+        self.assertEqual(index.add('r2', LEAK, 'Pune', 90), first)
+        self.assertEqual(index.add('r3', LEAK, 'Pune', 180), first)  # Kept alive by r2
+        self.assertNotEqual(index.add('r4', LEAK, 'Pune', 400), first)
+
+
+class ClassifyWithDedupTest(unittest.TestCase):
+
+    def test_cluster_is_classified_once(self):
+        classify = Classifier()
+        results, calls = classify_with_dedup(
+            [request('r1', LEAK, 0), request('r2', LEAK_AGAIN, 1), request('r3', POTHOLE, 2)], classify,
+            ComplaintDeduplicator(window_seconds=3600, result_ttl_seconds=600)
+        )
+        self.assertEqual(calls, 2)
+        self.assertEqual(results['r1'], results['r2'])
+
+    def test_busy_cluster_is_reclassified_after_result_ttl(self):
+        classify = Classifier()
+        index = ComplaintDeduplicator(window_seconds=3600, result_ttl_seconds=600)
+        # A duplicate every five minutes keeps the cluster alive indefinitely
+        results, calls = classify_with_dedup(
+            [request(f"r{i}", LEAK, i * 300) for i in range(6)], classify, index
+        )
+        self.assertEqual(calls, 2)
+        self.assertEqual([results[f"r{i}"]['call'] for i in range(6)], [1, 1, 1, 2, 2, 2])
+
+    def test_fallback_result_is_not_reused(self):
+        classify = Classifier()
+        index = ComplaintDeduplicator(window_seconds=3600, result_ttl_seconds=600)
+        classify.fallback = True
+        results, _ = classify_with_dedup([request('r1', LEAK, 0), request('r2', LEAK, 1)], classify, index)
+        self.assertEqual(classify.calls, 2)
+        self.assertEqual(results['r2']['label'], 'keyword')
+
+        classify.fallback = False
+        results, _ = classify_with_dedup([request('r3', LEAK, 2), request('r4', LEAK, 3)], classify, index)
+        self.assertEqual(results['r3']['label'], 'llm')
+        self.assertEqual(results['r4'], results['r3'])
+        self.assertEqual(classify.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
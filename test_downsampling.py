@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+LTTB and min/max downsampling of chart series
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from downsampling import downsample, lttb_indices, minmax_indices
+
+
+def spiky_series(n=10_000):
+    rng = np.random.default_rng(11)
+    y = np.sin(np.linspace(0, 20, n)) + rng.normal(0, 0.05, n)
+    y[1234] = 9.0
+    y[7777] = -9.0
+    return np.arange(n), y
+
+
+class DownsamplingTest(unittest.TestCase):
+
+    def test_lttb_keeps_end_points_and_spikes_in_order(self):
+        x, y = spiky_series()
+        kept = lttb_indices(x, y, 500)
+        self.assertEqual(len(kept), 500)
+        self.assertEqual((kept[0], kept[-1]), (0, len(y) - 1))
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        self.assertIn(1234, kept)
+        self.assertIn(7777, kept)
+
+    def test_minmax_keeps_every_bucket_extreme(self):
+        x, y = spiky_series()
+        kept = minmax_indices(x, y, 400)
+        self.assertLessEqual(len(kept), 400)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        self.assertEqual((y[kept].min(), y[kept].max()), (y.min(), y.max()))
+
+    def test_short_series_and_datetimes_pass_through(self):
+        dates = pd.date_range('2026-01-01', periods=5_000, freq='min').to_numpy()
+        values = np.arange(5_000, dtype=float)
+
+        short_x, short_y = downsample(dates[:10], values[:10], max_points=50)
+        np.testing.assert_array_equal(short_y, values[:10])
+
+        x, y = downsample(dates, values, max_points=100)
+        self.assertEqual(len(x), 100)
+        self.assertEqual(x.dtype, dates.dtype)
+        self.assertEqual((x[0], x[-1]), (dates[0], dates[-1]))
+
+        _, y = downsample(dates, values, max_points=100, method="minmax")
+        self.assertEqual((y[0], y[-1]), (0, 4_999))
+
+
+if __name__ == "__main__":
+    unittest.main()
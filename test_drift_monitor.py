@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Drift detection against the training snapshot, across runs
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from drift_monitor import OVERALL, DriftMonitor
+
+DISTRICTS = ['Pune', 'Nagpur']
+
+
+def rows(n, seed, shift=None, district_names=DISTRICTS, date=None):
+    """Monitored columns for ``n`` rows; ``shift`` maps district -> added demand"""
+    rng = np.random.default_rng(seed)
+    districts = np.array(district_names)[rng.integers(0, len(district_names), n)]
+    demand = rng.normal(100, 10, n)
+    for district, amount in (shift or {}).items():
+        demand[districts == district] += amount
+    data = {'district': districts, 'request_count': demand, 'resolution_time': rng.gamma(2.0, 2.0, n)}
+    if date:
+        data['date'] = [date] * n
+    return data
+
+
+class DriftMonitorTest(unittest.TestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.path = os.path.join(root.name, 'drift.json')
+        self.monitor = DriftMonitor(self.path)
+
+    def test_no_snapshot_means_retrain(self):
+        self.assertEqual(self.monitor.should_retrain(), (True, ["no training snapshot"]))
+
+    def test_same_distribution_does_not_drift(self):
+        self.monitor.snapshot(rows(5_000, seed=1))
+        self.monitor.observe(rows(2_000, seed=2))
+        report = self.monitor.report()
+        self.assertEqual({row['district'] for row in report}, {OVERALL, *DISTRICTS})
+        self.assertEqual(self.monitor.should_retrain(), (False, []))
+
+    def test_shift_in_one_district_and_unseen_districts_drift(self):
+        self.monitor.snapshot(rows(5_000, seed=1))
+        self.monitor.observe(rows(2_000, seed=2, shift={'Nagpur': 15}))
+        self.monitor.observe(rows(300, seed=3, district_names=['Akola']))
+
+        retrain, reasons = self.monitor.should_retrain()
+        self.assertTrue(retrain)
+        self.assertTrue(any(reason.startswith("request_count in Nagpur: PSI") for reason in reasons))
+        self.assertFalse(any("in Pune" in reason for reason in reasons))
+        self.assertIn("request_count in Akola: district not in training data", reasons)
+
+    def test_state_survives_save_and_days_are_counted_once(self):
+        self.monitor.snapshot(rows(5_000, seed=1), through='2026-01-10')
+        self.monitor.observe(rows(150, seed=2, date='2026-01-10'))  # Already in the training data
+        self.monitor.observe(rows(150, seed=3, date='2026-01-11'))
+        self.monitor.save()
+
+        reloaded = DriftMonitor(self.path)
+        reloaded.observe(rows(150, seed=3, date='2026-01-11'))  # The latest day, read again
+        self.assertEqual(reloaded.observed_through, '2026-01-11')
+        self.assertEqual(reloaded.current['request_count'][OVERALL]['moments'].count, 150)
+        self.assertEqual(reloaded.reference['request_count'][OVERALL]['moments'].count, 5_000)
+        self.assertEqual(reloaded.report(), [])  # Below DRIFT_MIN_SAMPLES
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Per-partition feature store: append, refresh, prune and reload
+"""
+
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from feature_store import FEATURES, FeatureStore, build_demand_features
+
+
+def day(date, districts, count=10):
+    return pd.DataFrame({
+        'date': [date] * len(districts),
+        'district': districts,
+        'service_type': ['Health'] * len(districts),
+        'month': [int(date[5:7])] * len(districts),
+        'day_of_week': [1] * len(districts),
+        'resolution_time': [2.5] * len(districts),
+        'request_count': [count] * len(districts)
+    })
+
+
+class FeatureStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+
+    def test_append_splits_by_date_and_reloads(self):
+        store = FeatureStore(self.root.name)
+        written = store.append(pd.concat([day('2026-01-01', ['Pune', 'Mumbai']), day('2026-01-02', ['Nagpur'])]))
+
+        self.assertEqual(written, ['2026-01-01', '2026-01-02'])
+        self.assertEqual(store.latest_partition(), '2026-01-02')
+        X, y = FeatureStore(self.root.name).load()
+        self.assertEqual(X.shape, (3, len(FEATURES)))
+        # A new batch extends the vocabulary in sorted order
+        np.testing.assert_array_equal(X[:, 0], [2, 0, 1])
+        np.testing.assert_array_equal(y, [10, 10, 10])
+
+    def test_codes_stay_stable_as_new_values_arrive(self):
+        store = FeatureStore(self.root.name)
+        store.append(day('2026-01-01', ['Pune']))
+        store.append(day('2026-01-02', ['Akola', 'Pune']))
+
+        self.assertEqual(FeatureStore(self.root.name).vocabularies['district'], ['Pune', 'Akola'])
+        X, _ = store.load()
+        np.testing.assert_array_equal(X[:, 0], [0, 1, 0])
+
+    def test_refresh_replaces_partition_and_prune_drops_old(self):
+        store = FeatureStore(self.root.name)
+        store.append(pd.concat([day('2026-01-01', ['Pune']), day('2026-01-02', ['Pune'])]))
+        store.append(day('2026-01-02', ['Pune', 'Mumbai'], count=20))
+
+        _, y = store.load()
+        np.testing.assert_array_equal(y, [10, 20, 20])
+
+        self.assertEqual(store.prune('2026-01-02'), ['2026-01-01'])
+        self.assertEqual(list(FeatureStore(self.root.name).partitions), ['2026-01-02'])
+        self.assertEqual(store.load()[0].shape, (2, len(FEATURES)))
+
+    def test_empty_store_and_features(self):
+        store = FeatureStore(self.root.name)
+        self.assertEqual(store.append(day('2026-01-01', [])), [])
+        X, y = store.load()
+        self.assertEqual((X.shape, y.shape), ((0, len(FEATURES)), (0,)))
+        self.assertEqual(list(build_demand_features(day('2026-01-01', ['Pune']), {}).columns), FEATURES)
+
+
+if __name__ == "__main__":
+    unittest.main()
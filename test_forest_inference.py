@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Flat forest inference against sklearn's predict, and the batch-size cutover
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from config import Config
+from feature_store import FEATURES
+from forest_inference import FlatForest
+from predictive_models import PredictiveModels
+
+DISTRICTS = ['Mumbai', 'Pune', 'Nagpur']
+SERVICES = ['Health', 'Infrastructure']
+
+
+def fitted_forest():
+    rng = np.random.default_rng(3)
+    X = np.column_stack([
+        rng.integers(0, len(DISTRICTS), 2000), rng.integers(0, len(SERVICES), 2000),
+        rng.integers(1, 13, 2000), rng.integers(1, 8, 2000), rng.gamma(2.0, 2.0, 2000)
+    ]).astype(np.float32)
+    y = 50 + 10 * X[:, 0] + 5 * X[:, 2] + 3 * X[:, 4] + rng.normal(0, 2, len(X))
+    forest = RandomForestRegressor(n_estimators=12, max_depth=8, random_state=0)
+    forest.fit(pd.DataFrame(X, columns=FEATURES), y)
+    return forest, X
+
+
+class FlatForestTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.forest, cls.X = fitted_forest()
+        cls.flat = FlatForest.from_sklearn(cls.forest)
+
+    def test_matches_sklearn_on_both_sides_of_cutover(self):
+        for rows in (1, Config.FLAT_FOREST_MAX_ROWS, Config.FLAT_FOREST_MAX_ROWS + 1, 2000):
+            X = self.X[:rows]
+            expected = self.forest.predict(pd.DataFrame(X, columns=FEATURES))
+            self.assertTrue(np.allclose(self.flat.predict(X), expected), f"{rows} rows")
+
+    def test_matches_sklearn_across_chunks(self):
+        with mock.patch.object(FlatForest, 'CHUNK_ROWS', 300):
+            expected = self.forest.predict(pd.DataFrame(self.X, columns=FEATURES))
+            self.assertTrue(np.allclose(self.flat.predict(self.X), expected))
+
+    def test_batch_prediction_switches_to_sklearn_above_max_rows(self):
+        models = PredictiveModels()
+        models.models['demand_predictor'] = self.forest
+        models.encoders = {'district': DISTRICTS, 'service': SERVICES}
+        row = ('Pune', 'Health', 6, 3, 2.5)
+
+        for rows, flat_calls in ((Config.FLAT_FOREST_MAX_ROWS, 1), (Config.FLAT_FOREST_MAX_ROWS + 1, 0)):
+            with mock.patch.object(FlatForest, 'predict', autospec=True,
+                                   side_effect=lambda flat, X: np.zeros(len(X))) as flat_predict:
+                predictions = models.predict_service_demand_batch([row] * rows)
+            self.assertEqual(flat_predict.call_count, flat_calls, f"{rows} rows")
+            self.assertEqual(len(predictions), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
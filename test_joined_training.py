@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Month-by-month health/infrastructure join and its shared vocabularies
+"""
+
+import unittest
+from datetime import date
+import numpy as np
+import pandas as pd
+from joined_training import COLUMN, JoinedTrainingBuilder, join_month
+
+
+def month_frames(month, districts, seed):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(month, periods=3, freq='D')
+    health = pd.DataFrame([
+        {'date': day, 'district': district, 'service_type': service, 'month': day.month,
+         'day_of_week': day.dayofweek + 1, 'request_count': int(rng.integers(10, 50)),
+         'resolution_time': float(rng.uniform(1, 9)), 'priority_score': float(rng.uniform(10, 90))}
+        for day in days for district in districts for service in ('Clinic', 'Ambulance')
+    ])
+    infra = pd.DataFrame([
+        {'date': day, 'district': district, 'infrastructure_type': kind, 'month': day.month,
+         'day_of_week': day.dayofweek + 1, 'maintenance_requests': int(rng.integers(1, 20)),
+         'budget_allocated': float(rng.uniform(1e5, 1e6)), 'completion_rate': float(rng.uniform(0, 1))}
+        for day in days[:2] for district in districts for kind in ('Roads', 'Water', 'Power')
+    ])
+    return health, infra
+
+
+class FakePipeline:
+    def __init__(self, months):
+        self.months = months
+
+    def get_month_data(self, table, month):
+        health, infra = self.months[month]
+        return health if table == 'health_services' else infra
+
+
+class JoinMonthTest(unittest.TestCase):
+
+    def test_one_row_per_source_row_with_other_table_context(self):
+        health, infra = month_frames('2026-03-01', ['Pune', 'Akola'], seed=1)
+        blocks, districts = join_month(health, infra)
+        X, y, types = blocks['health']
+
+        self.assertEqual(len(X), len(health))
+        self.assertEqual(len(blocks['infrastructure'][0]), len(infra))
+        np.testing.assert_array_equal(y, health['request_count'])
+        self.assertEqual((districts, types), (['Akola', 'Pune'], ['Ambulance', 'Clinic']))
+
+        # Context matches a plain groupby of the other table per district-day
+        expected = health.merge(
+            infra.groupby(['district', 'date']).agg(requests=('maintenance_requests', 'sum'),
+                                                    completion=('completion_rate', 'mean')).reset_index(),
+            on=['district', 'date'], how='left'
+        ).fillna(0)
+        np.testing.assert_allclose(X[:, COLUMN['infra_requests']], expected['requests'])
+        np.testing.assert_allclose(X[:, COLUMN['infra_completion_rate']], expected['completion'], rtol=1e-6)
+        # Health rows leave the infrastructure row measures empty
+        self.assertFalse(X[:, COLUMN['budget_allocated']].any())
+
+
+class JoinedTrainingBuilderTest(unittest.TestCase):
+
+    def test_codes_follow_month_order_and_extend_existing_vocabularies(self):
+        months = {
+            date(2026, 1, 1): month_frames('2026-01-01', ['Pune'], seed=2),
+            date(2026, 2, 1): month_frames('2026-02-01', ['Pune', 'Akola'], seed=3),
+        }
+        vocabularies = {'district': ['Thane', 'Pune']}
+        X, y = JoinedTrainingBuilder(FakePipeline(months), vocabularies, workers=2).build(sorted(months))
+
+        self.assertEqual(vocabularies['district'], ['Thane', 'Pune', 'Akola'])
+        self.assertEqual(vocabularies['service'], ['Ambulance', 'Clinic'])
+        self.assertEqual(vocabularies['infrastructure'], ['Power', 'Roads', 'Water'])
+        self.assertEqual(len(X), len(y))
+        # Family-major: every health row comes before the infrastructure rows
+        families = X[:, COLUMN['family']]
+        self.assertTrue(np.all(np.diff(families) >= 0))
+        self.assertEqual(set(X[:, COLUMN['district_encoded']]), {1.0, 2.0})
+
+    def test_no_months_gives_empty_matrix(self):
+        X, y = JoinedTrainingBuilder(FakePipeline({})).build([])
+        self.assertEqual((X.shape[0], y.shape[0]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker behaviour of the LLM client, against a fake model, streamed
+responses and the shared client registry
+"""
+
+import time
+import unittest
+from unittest import mock
+import llm_client
+from llm_client import CircuitBreaker, LLMClient, LLMUnavailable, shared_client
+
+
+class FakeModel:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return type("Response", (), {"text": "ok"})()
+
+
+def open_breaker_client(model):
+    client = LLMClient(model, rate=1, burst=1, failure_threshold=1, reset_seconds=0.1, wait_timeout=0.01,
+                       max_retries=0)
+    client.breaker.record_failure()
+    time.sleep(0.15)
+    return client
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_probe_timing_out_on_rate_limit_reopens_breaker(self):
+        model = FakeModel()
+        client = open_breaker_client(model)
+        client.bucket.tokens = 0.0
+        client.bucket.rate = 0.001
+
+        with self.assertRaises(LLMUnavailable):
+            client.generate("hello")
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(model.calls, 0)
+
+        # The timer was not restarted, so the next call probes straight away
+        client.bucket.tokens = 1.0
+        self.assertEqual(client.generate("hello").text, "ok")
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_interrupted_stream_probe_reopens_breaker(self):
+        client = open_breaker_client(FakeModel())
+        client.model.generate_content = lambda prompt, stream=False, **kwargs: iter(
+            [type("Chunk", (), {"text": "a"})(), type("Chunk", (), {"text": "b"})()]
+        )
+
+        chunks = iter(client.stream("hello"))
+        self.assertEqual(next(chunks), "a")
+        self.assertEqual(client.breaker.state, CircuitBreaker.HALF_OPEN)
+        chunks.close()
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_failed_probe_restarts_timer(self):
+        client = open_breaker_client(FakeModel(error=ValueError("bad request")))
+        with self.assertRaises(LLMUnavailable):
+            client.generate("hello")
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        self.assertIsNone(client.breaker.allow())
+
+
+class StreamModel:
+    """Streams the given chunks, then raises ``error`` if set"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        for text in self.chunks:
+            yield type("Chunk", (), {"text": text})()
+        if self.error:
+            raise self.error
+
+
+class TextStreamTest(unittest.TestCase):
+
+    def client(self, model):
+        return LLMClient(model, rate=100, burst=10, max_retries=2, retry_base_seconds=0)
+
+    def test_complete_stream_reports_timing_and_completes_once(self):
+        completed = []
+        stream = self.client(StreamModel(["", "Water ", "supply"])).stream("hello", on_complete=completed.append)
+
+        self.assertEqual(list(stream), ["Water ", "supply"])
+        self.assertEqual(completed, ["Water supply"])
+        self.assertFalse(stream.interrupted)
+        self.assertLessEqual(stream.first_token_seconds, stream.total_seconds)
+
+    def test_failure_after_text_keeps_partial_without_retry(self):
+        completed = []
+        model = StreamModel(["partial "], error=ConnectionError("reset"))
+        stream = self.client(model).stream("hello", on_complete=completed.append)
+
+        self.assertEqual(list(stream), ["partial "])
+        self.assertTrue(stream.interrupted)
+        self.assertIsInstance(stream.error, ConnectionError)
+        self.assertEqual((model.calls, completed), (1, []))
+
+    def test_failure_before_text_raises(self):
+        stream = self.client(StreamModel([], error=ValueError("blocked"))).stream("hello")
+        with self.assertRaises(LLMUnavailable):
+            list(stream)
+        self.assertIsNone(stream.first_token_seconds)
+
+
+class SharedClientTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(llm_client, "_clients", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(llm_client, "create_provider", lambda model_name, api_key: FakeModel())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_key_or_none_reuses_client(self):
+        client = shared_client("model-a", api_key="key-1")
+        self.assertIs(shared_client("model-a", api_key="key-1"), client)
+        self.assertIs(shared_client("model-a"), client)
+        self.assertIsNot(shared_client("model-b", api_key="key-1"), client)
+
+    def test_different_key_raises(self):
+        shared_client("model-a", api_key="key-1")
+        with self.assertRaises(ValueError):
+            shared_client("model-a", api_key="key-2")
+
+
+if __name__ == "__main__":
+    unittest.main()
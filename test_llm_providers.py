@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Offline LLM provider: rule answers, streaming, record and replay
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from config import Config
+from llm_providers import LocalProvider, RecordingProvider, create_provider, prompt_key
+from query_analysis import ANALYSIS_GENERATION_CONFIG, build_analysis_prompt, keyword_analysis
+
+QUERY = "Water pipe leaking near the station"
+
+
+class LocalProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = LocalProvider(latency_ms=0, replay_path="")
+
+    def test_structured_request_gets_keyword_analysis(self):
+        response = self.provider.generate_content(build_analysis_prompt(QUERY, "Pune"),
+                                                  generation_config=ANALYSIS_GENERATION_CONFIG)
+        self.assertEqual(json.loads(response.text), keyword_analysis(QUERY))
+
+    def test_free_text_is_deterministic_and_streams_the_same_text(self):
+        prompt = "Provide:\n- Key trends\n- Top priority areas\n"
+        text = self.provider.generate_content(prompt).text
+        self.assertEqual(self.provider.generate_content(prompt).text, text)
+        self.assertIn("**Key trends**", text)
+        self.assertEqual("".join(chunk.text for chunk in self.provider.generate_content(prompt, stream=True)), text)
+
+    def test_recorded_responses_replay_with_normalized_whitespace(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "replay.jsonl")
+            recorder = RecordingProvider(self.provider, path)
+            recorder.generate_content("Summarize   the\n backlog")
+            list(recorder.generate_content("not recorded", stream=True))
+
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 1)
+            with open(path, "w") as f:
+                f.write(json.dumps({"key": prompt_key("Summarize the backlog"), "response": "recorded"}) + "\n")
+
+            replay = LocalProvider(latency_ms=0, replay_path=path)
+            self.assertEqual(replay.generate_content("  Summarize the backlog ").text, "recorded")
+
+
+class CreateProviderTest(unittest.TestCase):
+
+    def test_selects_backend_by_name(self):
+        with mock.patch.object(Config, "LLM_PROVIDER", "LOCAL"):
+            self.assertIsInstance(create_provider(), LocalProvider)
+        with self.assertRaises(ValueError):
+            create_provider("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Monte-Carlo staffing simulator: priority classes, determinism and load response
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+from config import Config
+from load_simulator import SERVICE_PROFILES, baseline_staff, priority_classes, simulate_load
+
+DEMAND = np.full(30, 80.0)
+
+
+class PriorityClassesTest(unittest.TestCase):
+
+    def test_classes_are_most_urgent_first_and_shares_sum_to_one(self):
+        for service in SERVICE_PROFILES:
+            scores, shares = priority_classes(service)
+            self.assertTrue(np.all(np.diff(scores) < 0), service)
+            self.assertAlmostEqual(shares.sum(), 1.0)
+
+
+class SimulateLoadTest(unittest.TestCase):
+
+    def simulate(self, staff, **kwargs):
+        return simulate_load(DEMAND, staff, 'Health', replications=40, workers=1, seed=3, **kwargs)
+
+    def test_same_seed_same_results_whatever_the_workers(self):
+        with mock.patch.object(Config, 'SIM_CHUNK_SIZE', 10):
+            serial = self.simulate(baseline_staff(DEMAND))
+            parallel = simulate_load(DEMAND, baseline_staff(DEMAND), 'Health', replications=40, workers=2, seed=3)
+        for name in ('mean_days', 'p90_days', 'urgent_mean_days', 'open_share', 'histogram'):
+            np.testing.assert_array_equal(serial[name], parallel[name], name)
+
+    def test_more_staff_resolves_faster_and_urgent_first(self):
+        short = self.simulate(baseline_staff(DEMAND) - 2)
+        ample = self.simulate(baseline_staff(DEMAND) * 2)
+
+        self.assertGreater(short['mean_days'].mean(), ample['mean_days'].mean())
+        self.assertGreater(short['open_share'].mean(), 0.05)
+        self.assertLess(ample['open_share'].mean(), 0.01)
+        self.assertLess(short['urgent_mean_days'].mean(), short['mean_days'].mean())
+        # Ample staff picks requests up within a day of handling time
+        self.assertLess(ample['mean_days'].mean(), SERVICE_PROFILES['Health']['estimated_days'] + 1)
+
+    def test_histogram_matches_per_replication_means(self):
+        result = self.simulate(baseline_staff(DEMAND))
+        histogram = result['histogram']
+        self.assertEqual(len(histogram), len(result['bin_days']))
+        pooled = (histogram * result['bin_days']).sum() / histogram.sum()
+        self.assertAlmostEqual(pooled, result['mean_days'].mean(), delta=0.05 * pooled)
+
+
+if __name__ == "__main__":
+    unittest.main()
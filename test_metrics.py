@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Metrics registry, histogram buckets and the Prometheus text rendering
+"""
+
+import unittest
+from metrics import MetricsRegistry, timed
+
+
+class MetricsRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = self.registry.histogram("latency_seconds", "Latency", labels=("feature",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.labels(feature="summary").observe(value)
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{feature="summary",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{feature="summary",le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{feature="summary",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_sum{feature="summary"} 3.65', lines)
+        self.assertIn('latency_seconds_count{feature="summary"} 4', lines)
+        self.assertEqual(lines[:2], ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"])
+
+    def test_counter_gauge_and_label_escaping(self):
+        errors = self.registry.counter("errors", "Errors", labels=("feature",))
+        errors.labels(feature='say "hi"\n').inc()
+        errors.labels(feature='say "hi"\n').inc(2)
+        limit = self.registry.gauge("limit", "Limit")
+        limit.set(4)
+        limit.dec()
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('errors_total{feature="say \\"hi\\"\\n"} 3', lines)
+        self.assertIn("limit 3", lines)
+
+    def test_shared_name_must_match_type_and_labels(self):
+        first = self.registry.counter("calls", "Calls", labels=("feature",))
+        self.assertIs(self.registry.counter("calls", "Calls", labels=("feature",)), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("calls", "Calls", labels=("feature",))
+        with self.assertRaises(ValueError):
+            self.registry.counter("calls", "Calls", labels=("model",))
+
+    def test_timed_as_context_manager_and_decorator(self):
+        latency = self.registry.histogram("work_seconds", "Work", labels=("step",))
+
+        with timed(latency, step="block"):
+            pass
+
+        @timed(latency, step="call")
+        def work():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            work()
+        self.assertEqual(latency.labels(step="block").count, 1)
+        # Failed calls are timed too
+        self.assertEqual(latency.labels(step="call").count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Capacity-aware officer assignment, backlog and release
+"""
+
+import unittest
+from unittest import mock
+from officer_assignment import OfficerAssignmentEngine
+
+OFFICERS = [
+    {'id': 'water-pune', 'department': 'Water', 'district': 'Pune', 'skills': ['infrastructure'], 'capacity': 2},
+    {'id': 'water-nagpur', 'department': 'Water', 'district': 'Nagpur', 'skills': ['health'], 'capacity': 1},
+    {'id': 'roads-pune', 'department': 'Roads', 'district': 'Pune', 'skills': ['infrastructure'], 'capacity': 1},
+]
+
+
+def request(request_id, priority, district='Pune', category='infrastructure', department='Water'):
+    return {'id': request_id, 'department': department, 'service_category': category,
+            'priority_score': priority, 'district': district}
+
+
+class OfficerAssignmentEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OfficerAssignmentEngine(OFFICERS)
+
+    def test_capacity_is_respected_and_most_urgent_go_first(self):
+        assigned = self.engine.assign_batch([request(f"r{p}", p) for p in (10, 90, 50, 70)])
+
+        self.assertEqual(sorted(a['request_id'] for a in assigned), ['r50', 'r70', 'r90'])
+        self.assertEqual(self.engine.pending('Water'), 1)
+        self.assertEqual(self.engine.officers['water-pune']['active'], 2)
+        self.assertEqual(self.engine.officers['water-nagpur']['active'], 1)
+
+    def test_best_match_goes_to_the_most_urgent_request(self):
+        assigned = self.engine.assign_batch([
+            request('health-nagpur', 95, district='Nagpur', category='health'),
+            request('pipe-pune', 60),
+        ])
+        self.assertEqual({a['request_id']: a['officer_id'] for a in assigned},
+                         {'health-nagpur': 'water-nagpur', 'pipe-pune': 'water-pune'})
+
+    def test_release_assigns_backlog_of_that_department_only(self):
+        self.engine.assign_batch([request(f"w{i}", 50) for i in range(4)]
+                                 + [request(f"r{i}", 50, department='Roads') for i in range(2)])
+        self.assertEqual((self.engine.pending('Water'), self.engine.pending('Roads')), (1, 1))
+
+        finished = next(request_id for request_id, officer in self.engine.assignments.items()
+                        if officer == 'water-nagpur')
+        assigned = self.engine.release(finished)
+        self.assertEqual([(a['request_id'], a['officer_id']) for a in assigned], [('w3', 'water-nagpur')])
+        self.assertEqual(self.engine.pending(), 1)
+        self.assertEqual(self.engine.release('unknown'), [])
+
+    def test_release_older_than_frees_only_old_assignments(self):
+        with mock.patch('officer_assignment.time.monotonic', return_value=100.0):
+            self.engine.assign_batch([request('old', 50, department='Roads')])
+        with mock.patch('officer_assignment.time.monotonic', return_value=200.0):
+            self.engine.assign_batch([request('new', 50), request('queued', 40, department='Roads')])
+            assigned = self.engine.release_older_than(60)
+
+        self.assertEqual([a['request_id'] for a in assigned], ['queued'])
+        self.assertNotIn('old', self.engine.assignments)
+        self.assertIn('new', self.engine.assignments)
+
+
+if __name__ == "__main__":
+    unittest.main()
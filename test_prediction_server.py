@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Request coalescing and the HTTP front end of the prediction service
+"""
+
+import json
+import socket
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from prediction_server import RequestCoalescer, create_server
+
+
+class FakeModels:
+    """Predicts the month for each row and records every batch"""
+
+    def __init__(self, started=None):
+        self.batches = []
+        self.started = started
+
+    def predict_service_demand_batch(self, rows):
+        if self.started is not None:
+            self.started.wait()
+        self.batches.append(len(rows))
+        return [row[2] for row in rows]
+
+    def vocabulary(self, name):
+        return {'district': ['Pune', 'Mumbai'], 'service': ['Health']}[name]
+
+
+def row(month):
+    return ('Pune', 'Health', month, 1, 4.5)
+
+
+class RequestCoalescerTest(unittest.TestCase):
+
+    def test_concurrent_rows_share_batches_up_to_max_size(self):
+        started = threading.Event()
+        models = FakeModels(started)
+        coalescer = RequestCoalescer(models.predict_service_demand_batch, max_batch_size=8, max_wait_ms=50)
+
+        futures = [coalescer.submit(row(month)) for month in range(20)]
+        started.set()
+
+        self.assertEqual([future.result(timeout=5) for future in futures], list(range(20)))
+        self.assertEqual(sum(models.batches), 20)
+        self.assertLessEqual(max(models.batches), 8)
+        self.assertLess(len(models.batches), 20)
+        self.assertEqual(coalescer.stats.snapshot()['requests'], 20)
+
+    def test_failed_batch_fails_every_request(self):
+        coalescer = RequestCoalescer(lambda rows: None, max_wait_ms=20)
+        futures = [coalescer.submit(row(month)) for month in (1, 2)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+
+class PredictionServerTest(unittest.TestCase):
+
+    def setUp(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        self.server = create_server(FakeModels(), port=port, max_wait_ms=5)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{port}"
+
+    def post(self, payload):
+        request = urllib.request.Request(f"{self.url}/predict", data=json.dumps(payload).encode(), method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_single_and_list_payloads(self):
+        item = {'district': 'Pune', 'service_type': 'Health', 'month': 6, 'day_of_week': 2}
+        self.assertEqual(self.post(item), (200, {'prediction': 6}))
+        self.assertEqual(self.post([item, {**item, 'month': 7}]), (200, {'predictions': [6, 7]}))
+
+    def test_unknown_category_is_rejected_before_batching(self):
+        status, body = self.post({'district': 'Atlantis', 'service_type': 'Health', 'month': 6, 'day_of_week': 2})
+        self.assertEqual(status, 400)
+        self.assertIn('Atlantis', body['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Structured analysis parsing: valid, truncated, mistyped and non-JSON responses
+"""
+
+import json
+import unittest
+from query_analysis import ANALYSIS_FIELDS, keyword_analysis, parse_analysis
+
+COMPLETE = {
+    "service_category": "infrastructure", "urgency_level": "high", "department": "Water Supply Department",
+    "estimated_days": 3, "priority_score": 85, "action_required": "Repair the main",
+    "assigned_officer": "Ward engineer", "timeline": "3 days", "required_resources": ["pipe crew", "tanker"],
+    "citizen_message": "A crew is on the way."
+}
+
+
+class ParseAnalysisTest(unittest.TestCase):
+
+    def test_valid_json(self):
+        analysis, missing = parse_analysis(json.dumps(COMPLETE))
+        self.assertEqual(analysis, COMPLETE)
+        self.assertEqual(missing, [])
+
+    def test_fenced_json(self):
+        analysis, missing = parse_analysis("```json\n" + json.dumps(COMPLETE) + "\n```")
+        self.assertEqual(analysis, COMPLETE)
+        self.assertEqual(missing, [])
+
+    def test_truncated_mid_field_keeps_intact_fields(self):
+        text = json.dumps(COMPLETE)
+        cut = text[:text.index('"action_required"') + len('"action_required": "Rep')]
+        analysis, missing = parse_analysis(cut)
+        for name in ("service_category", "urgency_level", "department", "estimated_days", "priority_score"):
+            self.assertEqual(analysis[name], COMPLETE[name])
+        self.assertEqual(missing, ["action_required", "assigned_officer", "timeline", "required_resources",
+                                   "citizen_message"])
+        self.assertEqual(analysis["assigned_officer"], "Unassigned")
+        self.assertEqual(analysis["required_resources"], [])
+
+    def test_wrong_types_are_coerced_or_defaulted(self):
+        analysis, missing = parse_analysis(json.dumps({
+            **COMPLETE,
+            "service_category": "plumbing",       # Not in the enum
+            "urgency_level": 3,                   # Number instead of a level
+            "estimated_days": "about 4 days",     # Number inside text
+            "priority_score": 500,                # Out of range
+            "required_resources": "van, pump",    # Comma list instead of an array
+            "department": ""                      # Empty
+        }))
+        self.assertEqual(analysis["estimated_days"], 4)
+        self.assertEqual(analysis["priority_score"], 100)
+        self.assertEqual(analysis["required_resources"], ["van", "pump"])
+        self.assertEqual(analysis["service_category"], "other")
+        self.assertEqual(analysis["urgency_level"], "medium")
+        self.assertEqual(analysis["department"], "general")
+        self.assertEqual(missing, ["service_category", "urgency_level", "department"])
+
+    def test_non_json_text_gives_all_defaults(self):
+        analysis, missing = parse_analysis("Sorry, I can't help with that request.")
+        self.assertEqual(missing, list(ANALYSIS_FIELDS))
+        self.assertEqual(analysis, {name: spec["default"] for name, spec in ANALYSIS_FIELDS.items()})
+
+    def test_empty_response(self):
+        _, missing = parse_analysis("")
+        self.assertEqual(missing, list(ANALYSIS_FIELDS))
+
+
+class KeywordAnalysisTest(unittest.TestCase):
+
+    def test_keyword_rules(self):
+        self.assertEqual(keyword_analysis("Water pipe leaking")["department"], "Water Supply Department")
+        self.assertEqual(keyword_analysis("need a DOCTOR")["urgency_level"], "critical")
+        self.assertEqual(keyword_analysis("pothole on the highway")["department"], "Public Works Department")
+
+    def test_unmatched_query_uses_default_in_full_shape(self):
+        analysis = keyword_analysis("noise from a wedding hall")
+        self.assertEqual(analysis["department"], "General Administration")
+        self.assertEqual(set(analysis), set(ANALYSIS_FIELDS))
+        self.assertEqual(parse_analysis(json.dumps(analysis)), (analysis, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Fixed-size request digest used for the executive summary prompt and cache key
+"""
+
+import unittest
+from request_digest import RequestDigest
+
+
+def requests(count, district_count=30):
+    return [
+        {
+            'district': f"District {i % district_count}",
+            'service_category': ('health', 'infrastructure', 'safety')[i % 3],
+            'resolution_time': 1 + i % 10,
+            'priority_score': 50 + i % 50,
+            'description': "Water supply pipe leaking near the station" if i % 2 else "Pothole on the main road"
+        }
+        for i in range(count)
+    ]
+
+
+class RequestDigestTest(unittest.TestCase):
+
+    def test_prompt_size_does_not_grow_with_input(self):
+        small = RequestDigest().update(requests(1_000)).to_prompt()
+        large = RequestDigest().update(requests(20_000)).to_prompt()
+        # Only the digits of the counts grow
+        self.assertLess(len(large), len(small) * 1.1)
+
+    def test_other_bucket_keeps_totals(self):
+        digest = RequestDigest().update(requests(3_000)).to_dict()
+        self.assertEqual(digest['total_requests'], 3_000)
+        self.assertEqual(len(digest['by_district']), RequestDigest.MAX_DISTRICTS + 1)
+        self.assertEqual(digest['by_district'][-1][0], 'other')
+        self.assertEqual(sum(count for _, count in digest['by_district']), 3_000)
+        self.assertAlmostEqual(digest['resolution_days']['p50'], 5.0, delta=0.1)
+
+    def test_missing_fields_and_concerns(self):
+        digest = RequestDigest().update([{}, {'district': '  ', 'priority_score': 'n/a'}]).to_dict()
+        self.assertEqual(digest['by_district'], [['unknown', 2]])
+        self.assertEqual(digest['priority_score'], {'p50': None, 'p90': None, 'p99': None})
+
+        concerns = dict(RequestDigest().update(requests(10)).to_dict()['top_concerns'])
+        self.assertEqual(concerns['water'], 5)
+        self.assertNotIn('near', concerns)
+
+    def test_fingerprint_ignores_record_order(self):
+        records = requests(500)
+        self.assertEqual(RequestDigest().update(records).fingerprint(),
+                         RequestDigest().update(reversed(records)).fingerprint())
+        self.assertNotEqual(RequestDigest().update(records).fingerprint(),
+                            RequestDigest().update(records[:-1]).fingerprint())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Varint postings, BM25 ranking and filters of the request search index
+"""
+
+import math
+import unittest
+from collections import Counter
+import numpy as np
+from search_index import SearchIndex, _encode_varint, decode_varints, tokenize
+
+DOCS = [
+    ("R1", "Water pipe leaking near the school", "Pune", "infrastructure"),
+    ("R2", "No water supply for three days, water tanker needed", "Pune", "infrastructure"),
+    ("R3", "Pothole on the main road near the water tank", "Nagpur", "infrastructure"),
+    ("R4", "Hospital has no doctor at night", "Nagpur", "health"),
+    ("R5", "पाणी पुरवठा बंद आहे", "Pune", "infrastructure"),
+    ("R6", "Street light broken on station road", "Pune", "safety"),
+]
+
+
+def bm25(query, docs, k1, b):
+    """Textbook BM25 over tokenized documents, for reference"""
+    tokenized = [tokenize(text) for _, text, _, _ in docs]
+    average = sum(len(terms) for terms in tokenized) / len(tokenized)
+    scores = []
+    for terms in tokenized:
+        counts = Counter(terms)
+        score = 0.0
+        for term in set(tokenize(query)):
+            containing = sum(term in other for other in tokenized)
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(tokenized) - containing + 0.5) / (containing + 0.5))
+            score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * len(terms) / average))
+        scores.append(score)
+    return scores
+
+
+class VarintTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = [0, 1, 127, 128, 300, 16_383, 16_384, 2 ** 31, 2 ** 40] + list(
+            np.random.default_rng(1).integers(0, 2 ** 35, 1000))
+        buffer = bytearray()
+        for value in values:
+            _encode_varint(int(value), buffer)
+        self.assertEqual(decode_varints(bytes(buffer)).tolist(), [int(value) for value in values])
+        self.assertEqual(decode_varints(b"").tolist(), [])
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex(k1=1.2, b=0.75)
+        for doc in DOCS:
+            self.index.add(*doc)
+
+    def test_ranking_matches_reference_bm25(self):
+        query = "water road"
+        expected = bm25(query, DOCS, 1.2, 0.75)
+        results = self.index.search(query, limit=10)
+
+        ranked = sorted((i for i, score in enumerate(expected) if score), key=lambda i: -expected[i])
+        self.assertEqual([r['request_id'] for r in results], [DOCS[i][0] for i in ranked])
+        for result in results:
+            i = [doc[0] for doc in DOCS].index(result['request_id'])
+            self.assertAlmostEqual(result['score'], expected[i], places=4)
+
+    def test_filters_limit_and_unknown_values(self):
+        results = self.index.search("water", district="Pune", limit=1)
+        self.assertEqual([r['request_id'] for r in results], ['R2'])
+        self.assertEqual((results[0]['district'], results[0]['category']), ('Pune', 'infrastructure'))
+        self.assertEqual(self.index.search("doctor", category="health")[0]['request_id'], 'R4')
+        self.assertEqual(self.index.search("water", district="Atlantis"), [])
+        self.assertEqual(self.index.search("the"), [])
+
+    def test_marathi_matches_romanized_spellings(self):
+        self.assertEqual([r['request_id'] for r in self.index.search("paani puravatha")], ['R5'])
+        self.assertEqual(tokenize("rastha rasta"), tokenize("रस्ता रस्ता"))
+
+    def test_new_documents_are_searchable_immediately(self):
+        self.assertEqual(self.index.search("garbage"), [])
+        self.index.add("R7", "Garbage not collected", "Pune", "other")
+        self.assertEqual([r['request_id'] for r in self.index.search("garbage")], ['R7'])
+        self.assertEqual(len(self.index), len(DOCS) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
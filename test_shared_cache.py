@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Versioned shared snapshots: publish, map, version swap and pruning
+"""
+
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+import numpy as np
+import pandas as pd
+from config import Config
+from shared_cache import SharedCache, publish
+
+
+class SharedCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        self.cache = SharedCache(self.root, poll_seconds=0)
+
+    def current(self):
+        with redirect_stdout(StringIO()):
+            return self.cache.current()
+
+    def test_arrays_and_tables_are_mapped_read_only(self):
+        self.assertIsNone(self.current())
+        publish({'rollup': np.arange(6.0).reshape(2, 3)},
+                {'districts': pd.DataFrame({'name': ['Pune', 'Nagpur'], 'population': [7, 5]})},
+                {'rows': 2}, root=self.root)
+
+        snapshot = self.current()
+        self.assertEqual((snapshot.version, snapshot.metadata), (1, {'rows': 2}))
+        self.assertIsInstance(snapshot['rollup'], np.memmap)
+        np.testing.assert_array_equal(snapshot['rollup'], np.arange(6.0).reshape(2, 3))
+        with self.assertRaises(ValueError):
+            snapshot['rollup'][0, 0] = 1.0
+        self.assertEqual(snapshot['districts'].column('name').to_pylist(), ['Pune', 'Nagpur'])
+        self.assertNotIn('missing', snapshot)
+
+        # A private map is copy-on-write: this process's change never reaches the file
+        private = snapshot.array('rollup', private=True)
+        private[0, 0] = 99.0
+        np.testing.assert_array_equal(snapshot.array('rollup', private=True)[0, 0], 0.0)
+
+    def test_version_swap_keeps_readers_on_their_snapshot(self):
+        publish({'values': np.zeros(3)}, root=self.root)
+        held = self.current()
+        publish({'values': np.ones(3)}, root=self.root)
+
+        newer = self.current()
+        self.assertEqual((held.version, newer.version), (1, 2))
+        np.testing.assert_array_equal(held['values'], np.zeros(3))
+        np.testing.assert_array_equal(newer['values'], np.ones(3))
+
+    def test_poll_interval_and_pruning(self):
+        cache = SharedCache(self.root, poll_seconds=3600)
+        publish({'values': np.zeros(1)}, root=self.root)
+        with redirect_stdout(StringIO()):
+            first = cache.current()
+            publish({'values': np.ones(1)}, root=self.root)
+            # Not polled again within the interval
+            self.assertIs(cache.current(), first)
+
+        for _ in range(Config.SHARED_CACHE_KEEP_VERSIONS + 2):
+            version = publish({'values': np.ones(1)}, root=self.root)
+        directories = sorted(name for name in os.listdir(self.root) if name.startswith('v'))
+        self.assertEqual(len(directories), Config.SHARED_CACHE_KEEP_VERSIONS)
+        self.assertEqual(directories[-1], f"v{version:06d}")
+        # The mapped version stays readable after its files are pruned
+        np.testing.assert_array_equal(first['values'], np.zeros(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
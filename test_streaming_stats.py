@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Accuracy bounds of the bounded-memory sketches behind the request digest, and
+the moments and histograms behind drift detection
+"""
+
+import unittest
+from collections import Counter
+import numpy as np
+from streaming_stats import Histogram, QuantileSketch, RunningMoments, TopK
+
+
+class QuantileSketchTest(unittest.TestCase):
+
+    def test_quantiles_within_relative_accuracy(self):
+        values = np.random.default_rng(7).lognormal(1.5, 1.0, 20_000)
+        sketch = QuantileSketch(relative_accuracy=0.02)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+            exact = np.quantile(values, q, method='lower')
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.02 * exact + 1e-9, q)
+
+    def test_zeros_invalid_values_and_merge(self):
+        left, right = QuantileSketch(), QuantileSketch()
+        for value in (0, 0, 0, None, float('nan'), -1):
+            left.add(value)
+        for value in (10, 20, 30):
+            right.add(value)
+        self.assertEqual(left.count, 3)
+        self.assertEqual(left.quantile(0.5), 0.0)
+
+        left.merge(right)
+        self.assertEqual(left.count, 6)
+        self.assertEqual(left.quantile(1.0), 30)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+    def test_bucket_count_stays_bounded(self):
+        sketch = QuantileSketch(max_buckets=16)
+        for exponent in range(-20, 20):
+            sketch.add(10.0 ** exponent)
+        self.assertLessEqual(len(sketch.buckets), 16)
+        # Collapsing merges the lowest buckets; the high quantiles keep their accuracy
+        self.assertLessEqual(abs(sketch.quantile(1.0) - 1e19), 0.02 * 1e19)
+
+
+class TopKTest(unittest.TestCase):
+
+    def test_space_saving_error_bounds(self):
+        rng = np.random.default_rng(3)
+        stream = [f"item{n}" for n in rng.zipf(1.3, 10_000) if n < 500]
+        exact = Counter(stream)
+        top = TopK(capacity=32)
+        for item in stream:
+            top.add(item)
+
+        # Each tracked count overestimates by at most its recorded error
+        for item, count in top.counts.items():
+            self.assertGreaterEqual(count, exact[item])
+            self.assertLessEqual(count - top.errors[item], exact[item])
+        # Any item above N / capacity is guaranteed to be tracked
+        for item, count in exact.items():
+            if count > len(stream) / top.capacity:
+                self.assertIn(item, top.counts)
+
+        self.assertEqual([item for item, _ in top.top(3)], [item for item, _ in exact.most_common(3)])
+
+    def test_ties_sort_with_mixed_items(self):
+        top = TopK(capacity=4)
+        for item in ("b", None, "a", 3):
+            top.add(item)
+        self.assertEqual(top.top(4), [(3, 1), ("a", 1), ("b", 1), (None, 1)])
+
+
+class RunningMomentsTest(unittest.TestCase):
+
+    def test_single_batch_and_merged_moments_agree_with_numpy(self):
+        values = np.random.default_rng(5).normal(1e6, 3.0, 10_001)
+        one_by_one = RunningMoments()
+        for value in values[:1000]:
+            one_by_one.add(value)
+        one_by_one.add(float('nan'))
+        batched = RunningMoments()
+        batched.update(np.append(values[1000:], np.nan))
+        one_by_one.merge(RunningMoments.from_dict(batched.to_dict()))
+
+        self.assertEqual(one_by_one.count, len(values))
+        self.assertAlmostEqual(one_by_one.mean, values.mean(), places=6)
+        self.assertAlmostEqual(one_by_one.variance, values.var(ddof=1), places=6)
+        self.assertEqual(RunningMoments().variance, 0.0)
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_quantile_edges_and_open_ended_bins(self):
+        values = np.random.default_rng(9).gamma(2.0, 2.0, 10_000)
+        histogram = Histogram.from_quantiles(values, bins=10)
+        np.testing.assert_allclose(histogram.proportions(), 0.1, atol=0.005)
+
+        later = Histogram(histogram.edges)
+        later.update([-1e9, 1e9, np.nan])
+        self.assertEqual((later.counts[0], later.counts[-1], later.count), (1, 1, 2))
+
+        histogram.merge(Histogram.from_dict(later.to_dict()))
+        self.assertEqual(histogram.count, 10_002)
+        self.assertEqual(Histogram.from_quantiles([]).count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
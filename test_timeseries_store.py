@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tiered ring-buffer time-series store: aggregates, ring overwrite and reads
+"""
+
+import unittest
+import numpy as np
+from timeseries_store import TimeSeriesStore
+
+# A 4-slot tier of 10-second buckets and a 3-slot tier of 60-second buckets
+TIERS = {'short': (10, 4), 'long': (60, 3)}
+
+
+class TimeSeriesStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TimeSeriesStore(TIERS)
+
+    def test_bucket_aggregates_in_every_tier(self):
+        self.store.record_many('latency', [3.0, 1.0, 2.0, 8.0], [12, 15, 11, 25])
+
+        self.assertEqual(self.store.value('latency', 'count', 'short', ago=1), 3)
+        self.assertEqual(self.store.value('latency', 'min', 'short', ago=1), 1.0)
+        self.assertEqual(self.store.value('latency', 'max', 'short', ago=1), 3.0)
+        # "last" is the latest timestamp, not the last written
+        self.assertEqual(self.store.value('latency', 'last', 'short', ago=1), 1.0)
+        self.assertEqual(self.store.value('latency', 'mean', 'long'), 3.5)
+        self.assertEqual(self.store.card('latency', 'sum', 'short'), (8.0, 6.0))
+
+    def test_ring_overwrite_drops_buckets_from_the_previous_lap(self):
+        self.store.record_many('requests', [1, 1], [0, 5])
+        self.store.record('requests', 1, 40)  # Bucket 4 takes bucket 0's slot
+
+        self.assertEqual(self.store.value('requests', 'count', 'short', periods=4), 1)
+        self.assertIsNone(self.store.value('requests', 'count', 'short', ago=4 - 1))
+        # Late data older than one lap is ignored rather than overwriting newer buckets
+        self.store.record('requests', 1, 1)
+        self.assertEqual(self.store.value('requests', 'count', 'short', periods=4), 1)
+        self.assertEqual(self.store.value('requests', 'count', 'long'), 4)
+
+    def test_series_marks_empty_buckets_nan(self):
+        self.store.record_many('queue', [5.0, 7.0], [0, 20])
+        times, values = self.store.series('queue', 0, 40, stat='mean', tier='short')
+
+        self.assertEqual(times.astype(np.int64).tolist(), [0, 10, 20, 30])
+        np.testing.assert_array_equal(values, [5.0, np.nan, 7.0, np.nan])
+        self.assertEqual(len(self.store.series('unknown', 0, 40, tier='short')[0]), 0)
+
+    def test_snapshot_arrays_round_trip_and_bad_reads(self):
+        self.store.record_many('latency', [1.0, 2.0], [0, 61])
+        arrays, metadata = self.store.to_arrays()
+        copy = TimeSeriesStore.from_arrays({name: array.copy() for name, array in arrays.items()}, metadata)
+
+        self.assertEqual(copy.card('latency', 'sum', 'long'), self.store.card('latency', 'sum', 'long'))
+        self.assertIsNone(copy.value('missing'))
+        with self.assertRaises(ValueError):
+            copy.value('latency', 'median')
+        with self.assertRaises(ValueError):
+            copy.value('latency', tier='long', periods=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
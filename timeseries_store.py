@@ -0,0 +1,205 @@
+import threading
+import time
+import numpy as np
+from config import Config
+
+STATS = ('mean', 'sum', 'count', 'min', 'max', 'last')
+FIELDS = ('buckets', 'count', 'sum', 'min', 'max', 'last', 'last_at')  # Per-tier arrays
+
+
+class Tier:
+    """Fixed-size rings of per-bucket aggregates for every metric
+
+    Each (metric, slot) holds the count, sum, min, max and last value of
+    the observations in one time bucket, plus the absolute bucket number
+    it holds, so a slot left over from an earlier lap of the ring reads
+    as empty instead of as stale data.
+    """
+
+    def __init__(self, seconds, slots, rows):
+        self.seconds = seconds
+        self.slots = slots
+        self.buckets = np.full((rows, slots), -1, dtype=np.int64)
+        self.count = np.zeros((rows, slots), dtype=np.int64)
+        self.sum = np.zeros((rows, slots), dtype=np.float64)
+        self.min = np.full((rows, slots), np.inf)
+        self.max = np.full((rows, slots), -np.inf)
+        self.last = np.full((rows, slots), np.nan)
+        self.last_at = np.full((rows, slots), -np.inf)
+        self.head = -1  # Newest bucket written
+
+    def grow(self, rows):
+        extra = rows - len(self.count)
+        if extra <= 0:
+            return
+        for name, fill in (('buckets', -1), ('count', 0), ('sum', 0.0), ('min', np.inf), ('max', -np.inf),
+                           ('last', np.nan), ('last_at', -np.inf)):
+            current = getattr(self, name)
+            setattr(self, name, np.vstack([current, np.full((extra, self.slots), fill, dtype=current.dtype)]))
+
+    def add(self, row, values, timestamps):
+        """Fold observations of one metric into their buckets, vectorized"""
+        buckets = (timestamps // self.seconds).astype(np.int64)
+        self.head = max(self.head, int(buckets.max()))
+        # Beyond one lap of the ring the bucket is already overwritten
+        keep = buckets > self.head - self.slots
+        buckets, values, timestamps = buckets[keep], values[keep], timestamps[keep]
+        slots = buckets % self.slots
+
+        # Per slot only the newest bucket survives, whether already stored or in this batch
+        newest = self.buckets[row].copy()
+        np.maximum.at(newest, slots, buckets)
+        keep = buckets == newest[slots]
+        buckets, values, timestamps, slots = buckets[keep], values[keep], timestamps[keep], slots[keep]
+        stale = newest != self.buckets[row]
+        self.buckets[row, stale] = newest[stale]
+        self.count[row, stale] = 0
+        self.sum[row, stale] = 0.0
+        self.min[row, stale] = np.inf
+        self.max[row, stale] = -np.inf
+        self.last[row, stale] = np.nan
+        self.last_at[row, stale] = -np.inf
+
+        np.add.at(self.count[row], slots, 1)
+        np.add.at(self.sum[row], slots, values)
+        np.minimum.at(self.min[row], slots, values)
+        np.maximum.at(self.max[row], slots, values)
+        # Latest observation per slot: sort by time, then the final write to a slot wins
+        order = np.argsort(timestamps, kind='stable')
+        later = timestamps[order] >= self.last_at[row, slots[order]]
+        self.last[row, slots[order][later]] = values[order][later]
+        self.last_at[row, slots[order][later]] = timestamps[order][later]
+
+    def read(self, row, first, last, stat):
+        """One stat over the buckets first..last (inclusive) as a single aggregate"""
+        span = np.arange(first, last + 1)
+        slots = span % self.slots
+        present = self.buckets[row, slots] == span
+        if not present.any():
+            return None
+        slots = slots[present]
+        if stat == 'count':
+            return int(self.count[row, slots].sum())
+        if stat == 'sum':
+            return float(self.sum[row, slots].sum())
+        if stat == 'mean':
+            return float(self.sum[row, slots].sum() / self.count[row, slots].sum())
+        if stat == 'min':
+            return float(self.min[row, slots].min())
+        if stat == 'max':
+            return float(self.max[row, slots].max())
+        return float(self.last[row, slots[-1]])
+
+    def series(self, row, first, last, stat):
+        """Bucket start times and one stat per bucket, NaN where a bucket is empty"""
+        span = np.arange(first, last + 1)
+        slots = span % self.slots
+        count = self.count[row, slots]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = {
+                'count': count.astype(np.float64),
+                'sum': self.sum[row, slots],
+                'mean': self.sum[row, slots] / count,
+                'min': self.min[row, slots],
+                'max': self.max[row, slots],
+                'last': self.last[row, slots]
+            }[stat].copy()
+        values[self.buckets[row, slots] != span] = np.nan
+        times = (span * self.seconds).astype('datetime64[s]')
+        return times, values
+
+
+class TimeSeriesStore:
+    """Compact in-memory store for dashboard metrics at minute, hour and day tiers
+
+    Every observation is folded into all tiers as it is recorded, so each
+    tier is a downsampled view kept current without a separate rollup job,
+    and memory is fixed by the tier sizes however long the store runs.
+    Reads touch a fixed number of buckets: a metric card costs the same
+    after a billion observations as after ten.
+    """
+
+    def __init__(self, tiers=None):
+        self.metrics = {}
+        self.tiers = {name: Tier(seconds, slots, 0)
+                      for name, (seconds, slots) in (tiers or Config.TIMESERIES_TIERS).items()}
+        self.revision = 0  # Bumped on every write, for cache keys
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_arrays(cls, arrays, metadata):
+        """A store over existing tier arrays, e.g. copy-on-write maps of a shared snapshot"""
+        store = cls({name: (seconds, slots) for name, (seconds, slots, _) in metadata['tiers'].items()})
+        store.metrics = dict(metadata['metrics'])
+        for name, ring in store.tiers.items():
+            for field in FIELDS:
+                setattr(ring, field, arrays[f"{name}.{field}"])
+            ring.head = metadata['tiers'][name][2]
+        return store
+
+    def to_arrays(self):
+        """(arrays, metadata) describing the whole store, for ``from_arrays``"""
+        with self._lock:
+            arrays = {f"{name}.{field}": getattr(ring, field) for name, ring in self.tiers.items() for field in FIELDS}
+            metadata = {
+                'metrics': dict(self.metrics),
+                'tiers': {name: [ring.seconds, ring.slots, ring.head] for name, ring in self.tiers.items()}
+            }
+        return arrays, metadata
+
+    def record(self, metric, value, timestamp=None):
+        self.record_many(metric, [value], [time.time() if timestamp is None else timestamp])
+
+    def record_many(self, metric, values, timestamps):
+        """Record a batch of observations of one metric (Unix-second timestamps)"""
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(values):
+            return
+        with self._lock:
+            if metric not in self.metrics:
+                self.metrics[metric] = len(self.metrics)
+                for tier in self.tiers.values():
+                    tier.grow(len(self.metrics))
+            row = self.metrics[metric]
+            for tier in self.tiers.values():
+                tier.add(row, values, timestamps)
+            self.revision += 1
+
+    def value(self, metric, stat='mean', tier='day', periods=1, ago=0):
+        """One stat over ``periods`` buckets ending ``ago`` buckets before the newest
+
+        None when the metric has no observations in that span.
+        """
+        if stat not in STATS:
+            raise ValueError(f"Unknown stat {stat}; expected one of {', '.join(STATS)}")
+        with self._lock:
+            if metric not in self.metrics:
+                return None
+            ring = self.tiers[tier]
+            if periods > ring.slots:
+                raise ValueError(f"{periods} periods exceed the {ring.slots} kept by the {tier} tier")
+            last = ring.head - ago
+            return ring.read(self.metrics[metric], last - periods + 1, last, stat)
+
+    def card(self, metric, stat='mean', tier='day', periods=1):
+        """(current, previous): a metric over the latest ``periods`` buckets and the ones before"""
+        return (self.value(metric, stat, tier, periods),
+                self.value(metric, stat, tier, periods, ago=periods))
+
+    def series(self, metric, start, end, stat='mean', tier='day'):
+        """Bucket times and values between two timestamps, NaN for empty buckets"""
+        with self._lock:
+            ring = self.tiers[tier]
+            first = int(np.floor(_seconds(start) / ring.seconds))
+            last = int(np.ceil(_seconds(end) / ring.seconds)) - 1
+            first = max(first, last - ring.slots + 1)
+            if metric not in self.metrics or last < first:
+                return np.array([], dtype='datetime64[s]'), np.array([])
+            return ring.series(self.metrics[metric], first, last, stat)
+
+
+def _seconds(moment):
+    if isinstance(moment, (int, float)):
+        return float(moment)
+    return np.datetime64(moment, 's').astype(np.int64).item()